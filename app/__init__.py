@@ -9,8 +9,14 @@ load_dotenv()
 from app.config import config
 from app.database import db
 import app.models
-from app.routes import main_bp
-from flask_migrate import Migrate
+from app.routes import main_bp, api_bp
+from app.assets import init_assets
+from app.commands import register_commands
+from app.compression import init_compression
+from app.filters import register_filters
+from app.instrumentation import init_instrumentation
+from app.pool import init_pool
+from app.replicas import init_replicas
 
 
 def create_app(config_name=None):
@@ -23,13 +29,30 @@ def create_app(config_name=None):
     
     # Initialize extensions
     db.init_app(app)
-    migrate = Migrate(app, db)
     
     # Register blueprints
     app.register_blueprint(main_bp)
+    app.register_blueprint(api_bp)
+
+    # Register CLI commands and template filters
+    register_commands(app)
+    register_filters(app)
     
     # Setup logging
     setup_logging(app)
+
+    # Per-request SQL instrumentation
+    init_instrumentation(app)
+
+    # Read replicas for GET reads, primary for writers
+    init_replicas(app)
+
+    # 503 instead of a hung request when the connection pool is exhausted
+    init_pool(app)
+
+    # Fingerprinted static files and compressed responses
+    init_assets(app)
+    init_compression(app)
     
     return app
 
@@ -0,0 +1,165 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip variants are built
+    brotli = None
+
+MANIFEST = "manifest.json"
+# Text formats worth compressing; images and fonts are already compressed.
+COMPRESSIBLE = {".css", ".js", ".json", ".map", ".svg", ".txt", ".html", ".xml"}
+# Preferred first when the client accepts several.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _build_dir(app):
+    return os.path.join(app.static_folder, app.config.get("ASSET_BUILD_DIR", "dist"))
+
+
+def _digest(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 16), b""):
+            sha.update(block)
+    return sha.hexdigest()[:12]
+
+
+def _write_variants(path):
+    """Write ``.gz`` (and ``.br``) next to ``path`` when they come out smaller"""
+    with open(path, "rb") as handle:
+        data = handle.read()
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    written = []
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(data):
+            with open(path + suffix, "wb") as handle:
+                handle.write(compressed)
+            written.append(suffix)
+    return written
+
+
+def build_assets(app, clean=False):
+    """Copy every static file to a content-hashed name under the build dir.
+
+    Returns ``(manifest, variants)``: the manifest maps each source path
+    (relative to the static folder, ``/``-separated) to its fingerprinted
+    one, ``variants`` lists the compressed suffixes written per source.
+    Files of earlier builds stay, since pages already rendered and
+    processes not yet restarted still point at them; ``clean`` removes
+    those no longer in the manifest.
+    """
+    source_root = app.static_folder
+    build_dir = _build_dir(app)
+    prefix = os.path.relpath(build_dir, source_root).replace(os.sep, "/")
+
+    manifest = {}
+    variants = {}
+    for directory, subdirectories, files in os.walk(source_root):
+        # Never fingerprint a previous build.
+        subdirectories[:] = [name for name in subdirectories if os.path.join(directory, name) != build_dir]
+        for name in sorted(files):
+            source = os.path.join(directory, name)
+            relative = os.path.relpath(source, source_root).replace(os.sep, "/")
+            stem, extension = os.path.splitext(relative)
+            fingerprinted = f"{stem}.{_digest(source)}{extension}"
+            target = os.path.join(build_dir, *fingerprinted.split("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+            if extension.lower() in COMPRESSIBLE:
+                variants[relative] = _write_variants(target)
+            manifest[relative] = f"{prefix}/{fingerprinted}"
+
+    # Written last and swapped in whole, so readers never see a partial manifest.
+    partial = os.path.join(build_dir, MANIFEST + ".tmp")
+    os.makedirs(build_dir, exist_ok=True)
+    with open(partial, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    os.replace(partial, os.path.join(build_dir, MANIFEST))
+
+    if clean:
+        current = {MANIFEST} | {
+            os.path.relpath(path, prefix).replace(os.sep, "/") + suffix
+            for path in manifest.values()
+            for suffix in ("", ".gz", ".br")
+        }
+        for directory, _, files in os.walk(build_dir):
+            for name in files:
+                path = os.path.join(directory, name)
+                if os.path.relpath(path, build_dir).replace(os.sep, "/") not in current:
+                    os.remove(path)
+    app.extensions.pop("asset_manifest", None)
+    return manifest, variants
+
+
+def _manifest():
+    app = current_app
+    path = os.path.join(_build_dir(app), MANIFEST)
+    cached = app.extensions.get("asset_manifest")
+    # In debug the manifest is re-read after every build; otherwise once per process.
+    if cached is not None and not app.debug:
+        return cached[1]
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    if cached is None or cached[0] != mtime:
+        with open(path, encoding="utf-8") as handle:
+            cached = (mtime, json.load(handle))
+        app.extensions["asset_manifest"] = cached
+    return cached[1]
+
+
+def asset_url(filename, **values):
+    """``url_for('static', ...)`` that points at the fingerprinted build when there is one"""
+    return url_for("static", filename=_manifest().get(filename, filename), **values)
+
+
+def _accepted(encoding):
+    return request.accept_encodings[encoding] > 0
+
+
+def serve_static(filename):
+    """Flask's static view, plus long caching and precompressed variants for built files"""
+    app = current_app
+    build_prefix = app.config.get("ASSET_BUILD_DIR", "dist") + "/"
+    if not filename.startswith(build_prefix):
+        return app.send_static_file(filename)
+
+    sent = filename
+    encoding = None
+    for candidate, suffix in ENCODINGS:
+        if _accepted(candidate) and os.path.isfile(os.path.join(app.static_folder, filename + suffix)):
+            sent, encoding = filename + suffix, candidate
+            break
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    max_age = app.config.get("ASSET_MAX_AGE", 31536000)
+    response = send_from_directory(app.static_folder, sent, mimetype=mimetype, max_age=max_age)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    # The name changes with the content, so the file never needs revalidating.
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_assets(app):
+    """Serve fingerprinted static files and expose ``asset_url`` to templates.
+
+    ``flask assets-build`` writes content-hashed copies of ``app/static``
+    under ``ASSET_BUILD_DIR`` with a manifest and precompressed variants.
+    Without a build, ``asset_url`` falls back to the plain static URL.
+    """
+    app.add_template_global(asset_url)
+    if "static" in app.view_functions:
+        app.view_functions["static"] = serve_static
@@ -0,0 +1,61 @@
+import threading
+import time
+
+caches = {}
+
+
+class VersionedTTLCache:
+    """Process-local cache whose entries expire after a TTL or on ``invalidate``.
+
+    Each entry remembers the cache version it was loaded under; bumping the
+    version makes every entry stale at once without walking the store. The
+    version is captured before the loader runs, so a value loaded while an
+    invalidation happens is never served as fresh.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        caches[name] = self
+
+    def get(self, key, loader, ttl):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == self.version and entry[1] > now:
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            version = self.version
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (version, now + ttl, value)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations,
+            }
+
+
+def cache_stats():
+    return {name: cache.stats() for name, cache in caches.items()}
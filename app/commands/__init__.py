@@ -0,0 +1,28 @@
+from app.lazy import LazyCommand
+
+# name -> command object; modules are imported only when their command runs.
+COMMANDS = {
+    "assets-build": "app.commands.assets_build:assets_build",
+    "balance-reconcile": "app.commands.balance_reconcile:balance_reconcile",
+    "balance-snapshot": "app.commands.balance_snapshot:balance_snapshot",
+    "db": "app.commands.migrate:migrate",
+    "db-index-report": "app.commands.db_index_report:db_index_report",
+    "import-products": "app.commands.import_products:import_products",
+    "jobs-worker": "app.commands.jobs_worker:jobs_worker",
+    "reprice-orders": "app.commands.reprice_orders:reprice_orders",
+    "sales-rollup": "app.commands.sales_rollup:sales_rollup",
+    "seed": "app.commands.seed:seed",
+    "startup-profile": "app.commands.startup_profile:startup_profile",
+    "stock-summary": "app.commands.stock_summary:stock_summary",
+    "taxonomy-paths": "app.commands.taxonomy_paths:taxonomy_paths",
+    "uuid-backfill": "app.commands.uuid_backfill:uuid_backfill",
+}
+
+
+def register_commands(app):
+    """Attach the project's Flask CLI commands to ``app``"""
+    for name, path in COMMANDS.items():
+        app.cli.add_command(LazyCommand(name, path))
+
+
+__all__ = ['register_commands']
@@ -0,0 +1,19 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.assets import brotli, build_assets
+
+
+@click.command("assets-build")
+@click.option("--clean", is_flag=True, help="Delete built files no longer in the manifest.")
+@with_appcontext
+def assets_build(clean):
+    """Fingerprint static files and precompress them for far-future caching."""
+    manifest, variants = build_assets(current_app, clean=clean)
+    for source, built in sorted(manifest.items()):
+        suffixes = variants.get(source)
+        click.echo(f"{source} -> {built}" + (f" [{', '.join(suffixes)}]" if suffixes else ""))
+    click.echo(f"{len(manifest)} assets built")
+    if brotli is None:
+        click.echo("Brotli is not installed; only gzip variants were written.")
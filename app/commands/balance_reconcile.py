@@ -0,0 +1,26 @@
+import click
+from flask.cli import with_appcontext
+
+from app.view_model.order.ledger import LedgerViewModel
+
+
+@click.command("balance-reconcile")
+@click.option("--batch-size", default=100, show_default=True, help="Bill accounts per chunk.")
+@with_appcontext
+def balance_reconcile(batch_size):
+    """Verify bill account snapshots and balances against the movement ledger."""
+    report = LedgerViewModel.reconcile(batch_size=batch_size)
+    for issue in report["issues"]:
+        sequence = f" #{issue['sequence']}" if issue["sequence"] is not None else ""
+        click.echo(
+            f"  {issue['bill_account_id']}{sequence}: {issue['problem']} "
+            f"expected {issue['expected']}, found {issue['found']}",
+            err=True,
+        )
+    click.echo(
+        f"{report['accounts']} accounts, {report['snapshots']} snapshots, "
+        f"{report['movements']} snapshotted movements, {report['pending']} pending, "
+        f"{len(report['issues'])} issues"
+    )
+    if report["issues"]:
+        raise SystemExit(1)
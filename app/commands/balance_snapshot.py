@@ -0,0 +1,26 @@
+import click
+from flask.cli import with_appcontext
+
+from app.view_model.order.ledger import LedgerViewModel
+
+
+@click.command("balance-snapshot")
+@click.option("--account", "account_id", default=None, help="Only snapshot this bill account.")
+@click.option("--min-movements", default=1, show_default=True, help="Skip accounts with fewer pending movements.")
+@with_appcontext
+def balance_snapshot(account_id, min_movements):
+    """Fold pending ledger movements into new bill account balance snapshots."""
+    if account_id:
+        try:
+            snapshot = LedgerViewModel.snapshot(account_id)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+        snapshots = [snapshot] if snapshot else []
+    else:
+        snapshots = LedgerViewModel.snapshot_all(min_movements=min_movements)
+    for snapshot in snapshots:
+        click.echo(
+            f"{snapshot['bill_account_id']} #{snapshot['sequence']}: "
+            f"{snapshot['movements']} movements, {snapshot['delta']:+.2f} -> {snapshot['balance']:.2f}"
+        )
+    click.echo(f"{len(snapshots)} snapshots taken")
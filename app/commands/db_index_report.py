@@ -0,0 +1,130 @@
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import event, select
+
+from app.database import db
+from app.models.pos import BillAccount
+from app.view_model.contact.main import ContactViewModel, contact_paginator
+from app.view_model.job.main import JobViewModel
+from app.view_model.order.ledger import LedgerViewModel
+from app.view_model.order.main import OrderViewModel, order_paginator
+from app.view_model.order.rollup import SalesRollupViewModel
+from app.view_model.product.main import ProductViewModel, product_paginator
+from app.view_model.product.stock import StockViewModel
+from app.view_model.product.taxonomy import TaxonomyViewModel
+
+
+def _probe_cursor(paginator, sort):
+    """Build a cursor that forces the seek branch of a keyset query"""
+    return paginator._encode_cursor(datetime.utcnow() if sort == "created_at" else "0", "", "next")
+
+
+def _category_probe(loader):
+    """Run ``loader`` with a real category id; subtree filters reject unknown ones"""
+    def probe():
+        category = next(iter(TaxonomyViewModel.get_category_tree()["index"]), None)
+        if category:
+            loader(category)
+    return probe
+
+
+def _bill_account_probe():
+    bill_account_id = db.session.scalar(select(BillAccount.id).limit(1))
+    if bill_account_id:
+        LedgerViewModel.get_balance(bill_account_id)
+
+
+def _view_model_probes():
+    """The read queries each view model issues, keyed by a readable label"""
+    return [
+        ("ProductViewModel.get_products_page", lambda: ProductViewModel.get_products_page()),
+        ("ProductViewModel.get_products_page[cursor]", lambda: ProductViewModel.get_products_page(
+            cursor=_probe_cursor(product_paginator, "created_at"))),
+        ("ProductViewModel.get_products_page[sort=name]", lambda: ProductViewModel.get_products_page(
+            sort="name", direction="asc", cursor=_probe_cursor(product_paginator, "name"))),
+        ("ProductViewModel.list_products[cursor]", lambda: ProductViewModel.list_products(
+            cursor=_probe_cursor(product_paginator, "created_at"))),
+        ("ProductViewModel.list_products[category]", _category_probe(
+            lambda category: ProductViewModel.list_products(category=category))),
+        ("ProductViewModel.count_products_in_category", _category_probe(ProductViewModel.count_products_in_category)),
+        ("TaxonomyViewModel.get_category_tree", TaxonomyViewModel._load_category_tree),
+        ("ProductViewModel.get_taxonomy_label", lambda: ProductViewModel._load_taxonomy_label("probe")),
+        ("ProductViewModel.get_product_by_id", lambda: ProductViewModel.get_product_by_id("probe")),
+        ("StockViewModel.low_stock", lambda: StockViewModel.low_stock()),
+        ("StockViewModel.get_stock", lambda: StockViewModel.get_stock("probe")),
+        ("ContactViewModel.get_contacts_page", lambda: ContactViewModel.get_contacts_page()),
+        ("ContactViewModel.get_contacts_page[cursor]", lambda: ContactViewModel.get_contacts_page(
+            cursor=_probe_cursor(contact_paginator, "created_at"))),
+        ("LedgerViewModel.get_balance", _bill_account_probe),
+        ("SalesRollupViewModel.dashboard", lambda: SalesRollupViewModel.dashboard()),
+        ("JobViewModel.due", lambda: JobViewModel.due()),
+        ("OrderViewModel.get_orders_page", lambda: OrderViewModel.get_orders_page()),
+        ("OrderViewModel.get_orders_page[cursor]", lambda: OrderViewModel.get_orders_page(
+            cursor=_probe_cursor(order_paginator, "created_at"))),
+        ("OrderViewModel.get_orders_page[sort=total]", lambda: OrderViewModel.get_orders_page(
+            sort="total", cursor=_probe_cursor(order_paginator, "total"))),
+        ("OrderViewModel.get_orders_page[channel]", lambda: OrderViewModel.get_orders_page(
+            filters={"channel": "web"}, cursor=_probe_cursor(order_paginator, "created_at"))),
+    ]
+
+
+def _capture_statements(probe):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        probe()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+        db.session.rollback()
+    return statements
+
+
+def _explain(connection, statement, parameters):
+    """Return ``(plan lines, full scan tables)`` for one statement"""
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        lines = [row[-1] for row in rows]
+        scans = [
+            line.split()[1]
+            for line in lines
+            if line.startswith("SCAN ") and " USING " not in line and line != "SCAN CONSTANT ROW"
+        ]
+        return lines, scans
+
+    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+    lines = [
+        f"table={row.get('table')} type={row.get('type')} key={row.get('key')} rows={row.get('rows')}"
+        for row in rows
+    ]
+    scans = [row.get("table") for row in rows if row.get("type") == "ALL"]
+    return lines, scans
+
+
+@click.command("db-index-report")
+@click.option("--fail-on-scan", is_flag=True, help="Exit with status 1 when a full table scan is found.")
+@with_appcontext
+def db_index_report(fail_on_scan):
+    """EXPLAIN the queries issued by the view models and flag full table scans."""
+    flagged = 0
+    with db.engine.connect() as connection:
+        for label, probe in _view_model_probes():
+            for statement, parameters in _capture_statements(probe):
+                lines, scans = _explain(connection, statement, parameters)
+                status = click.style("FULL SCAN", fg="red") if scans else click.style("ok", fg="green")
+                click.echo(f"[{status}] {label}")
+                click.echo(f"    {' '.join(statement.split())}")
+                for line in lines:
+                    click.echo(f"      {line}")
+                if scans:
+                    flagged += 1
+                    click.echo(f"    full scan on: {', '.join(sorted(set(scans)))}")
+
+    click.echo(f"{flagged} statement(s) with full table scans")
+    if fail_on_scan and flagged:
+        raise SystemExit(1)
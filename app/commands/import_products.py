@@ -0,0 +1,39 @@
+import csv
+
+import click
+from flask.cli import with_appcontext
+
+from app.view_model.product.importer import IMPORT_FORMATS, ProductImportViewModel
+
+
+@click.command("import-products")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "file_format", type=click.Choice(IMPORT_FORMATS), help="Defaults to the file extension.")
+@click.option("--batch-size", type=click.IntRange(min=1), help="Rows per INSERT batch (IMPORT_BATCH_SIZE by default).")
+@with_appcontext
+def import_products(path, file_format, batch_size):
+    """Bulk import products from a CSV or JSON lines file."""
+    try:
+        file_format = ProductImportViewModel.detect_format(path, file_format)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    reached = {"row": 0}
+
+    def tracked(rows):
+        for line_number, row in rows:
+            reached["row"] = line_number
+            yield line_number, row
+
+    with open(path, "rb") as stream:
+        rows = tracked(ProductImportViewModel.read_rows(stream, file_format))
+        try:
+            report = ProductImportViewModel.import_rows(rows, batch_size)
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise click.ClickException(f"Could not read {path} after row {reached['row']}: {e}")
+
+    for error in report["errors"]:
+        click.echo(f"row {error['row']}: {error['error']}", err=True)
+    click.echo(f"{report['imported']} imported, {report['failed']} failed, {report['total']} rows read")
+    if report["failed"]:
+        raise SystemExit(1)
@@ -0,0 +1,30 @@
+import signal
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.view_model.job.worker import JobWorker
+
+
+@click.command("jobs-worker")
+@click.option("--threads", type=int, default=None, help="Jobs run at once. [default: JOB_WORKER_THREADS]")
+@click.option("--poll", type=float, default=None, help="Seconds between polls of an empty queue. [default: JOB_POLL_INTERVAL]")
+@click.option("--burst", is_flag=True, help="Exit once no job is due instead of waiting for more.")
+@with_appcontext
+def jobs_worker(threads, poll, burst):
+    """Run queued background jobs (imports, exports, rebuilds)."""
+    config = current_app.config
+    threads = threads or config.get("JOB_WORKER_THREADS", 2)
+    if threads < 1:
+        raise click.UsageError("--threads must be at least 1")
+    worker = JobWorker(
+        current_app._get_current_object(),
+        threads=threads,
+        poll_interval=poll or config.get("JOB_POLL_INTERVAL", 1.0),
+    )
+    # On SIGTERM, as on Ctrl-C, the jobs in hand finish before the worker exits.
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    click.echo(f"Worker {worker.name} running {threads} threads" + (" in burst mode" if burst else ""))
+    processed = worker.run(burst=burst)
+    click.echo(f"{processed} jobs processed")
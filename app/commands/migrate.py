@@ -0,0 +1,25 @@
+import click
+from flask import current_app, g
+from flask.cli import with_appcontext
+from flask_migrate import Migrate
+from flask_migrate.cli import db as migrate_commands
+
+from app.database import db
+
+
+@click.group("db")
+@click.option("-d", "--directory", default=None, help='Migration script directory (default is "migrations")')
+@click.option("-x", "--x-arg", multiple=True, help="Additional arguments consumed by custom env.py scripts")
+@with_appcontext
+def migrate(directory, x_arg):
+    """Perform database migrations."""
+    # Alembic is only imported when this group runs, not by every app start.
+    if "migrate" not in current_app.extensions:
+        Migrate(current_app._get_current_object(), db)
+    # Read by Migrate.get_config(), as Flask-Migrate's own group does.
+    g.directory = directory
+    g.x_arg = x_arg
+
+
+for name, command in migrate_commands.commands.items():
+    migrate.add_command(command, name)
@@ -0,0 +1,20 @@
+import click
+from flask.cli import with_appcontext
+
+from app.view_model.order.pricing import PricingEngine
+
+
+@click.command("reprice-orders")
+@click.option("--batch-size", default=500, show_default=True, help="Orders per chunk.")
+@click.option("--dry-run", is_flag=True, help="Report what would change without writing.")
+@with_appcontext
+def reprice_orders(batch_size, dry_run):
+    """Recompute subtotal, tax, discount and total of stored orders from their items."""
+    report = PricingEngine.reprice_orders(batch_size=batch_size, dry_run=dry_run)
+    for error in report["errors"]:
+        click.echo(f"order {error['order_id']}: {error['error']}", err=True)
+    click.echo(
+        f"{report['orders']} orders read, {report['repriced']} repriced "
+        f"({report['changed']} changed), {report['skipped']} without items, "
+        f"{len(report['errors'])} failed" + (" [dry run]" if dry_run else "")
+    )
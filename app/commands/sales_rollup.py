@@ -0,0 +1,21 @@
+import click
+from flask.cli import with_appcontext
+
+from app.view_model.order.rollup import SalesRollupViewModel
+
+
+@click.command("sales-rollup")
+@click.option("--rebuild", is_flag=True, help="Rewrite the days that differ instead of only reporting them.")
+@click.option("--batch-size", default=5000, show_default=True, help="Orders per chunk.")
+@with_appcontext
+def sales_rollup(rebuild, batch_size):
+    """Verify the daily sales rollups against orders, or backfill them."""
+    report = SalesRollupViewModel.rebuild(batch_size=batch_size, fix=rebuild)
+    drift = report["mismatched"] + report["stale"]
+    click.echo(
+        f"{report['orders']} orders in {report['days']} days checked, "
+        f"{report['mismatched']} days mismatched, {report['stale']} stale"
+        + (" [repaired]" if rebuild and drift else "")
+    )
+    if drift and not rebuild:
+        raise SystemExit(1)
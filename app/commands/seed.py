@@ -0,0 +1,478 @@
+import math
+import random
+import time
+import uuid
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import insert, update
+
+from app.database import db
+from app.models import (
+    BillAccount,
+    BillAccountSnapshot,
+    Contact,
+    Inventory,
+    Order,
+    OrderBillAccount,
+    OrderItem,
+    Product,
+    ProductComponent,
+    ProductStock,
+    ProductTaxonomy,
+    Taxonomy,
+    Warehouse,
+)
+from app.models.types import uuid7
+from app.view_model.order.rollup import SalesRollupViewModel
+from app.view_model.product.taxonomy import child_path
+
+# Odd multiplier: index -> id stays a bijection but ids do not look sequential.
+_ID_MIX = 0x9E3779B97F4A7C15
+_ID_MASK = (1 << 62) - 1
+_NAMESPACES = {
+    "taxonomy": 1,
+    "product": 2,
+    "product_taxonomy": 3,
+    "component": 4,
+    "warehouse": 5,
+    "inventory": 6,
+    "contact": 7,
+    "order": 8,
+    "order_item": 9,
+    "bill_account": 10,
+    "movement": 11,
+    "snapshot": 12,
+}
+STATUSES = (("paid", 0.85), ("open", 0.10), ("cancelled", 0.05))
+PAYMENT_METHODS = (("cash", 0.55), ("card", 0.40), ("transfer", 0.05))
+CHANNELS = (("store", 0.60), ("web", 0.25), ("delivery", 0.10), ("phone", 0.05))
+TAX_RATES = (16, 16, 16, 8, 0)
+
+
+def seed_id(kind, index):
+    """Deterministic UUID for the ``index``-th row of ``kind``, no bookkeeping needed"""
+    low = (index * _ID_MIX) & _ID_MASK
+    return str(uuid.UUID(int=(_NAMESPACES[kind] << 64) | low, version=4))
+
+
+def ordered_seed_id(kind, index, at):
+    """``seed_id`` for rows keyed by creation time: a UUIDv7 on ``at``, so inserts stay in key order"""
+    low = (index * _ID_MIX) & _ID_MASK
+    return uuid7(at, (_NAMESPACES[kind] << 64) | low)
+
+
+def _money(cents):
+    return Decimal(cents).scaleb(-2)
+
+
+def _extra_fields(rng, created_at):
+    channel = _weighted(rng, CHANNELS)
+    fields = {"channel": channel}
+    if channel == "store" and rng.random() < 0.5:
+        fields["table_number"] = rng.randint(1, 40)
+    elif channel == "delivery":
+        hour = 12 + rng.randrange(10)
+        fields["delivery_slot"] = f"{created_at:%Y-%m-%d} {hour:02d}:00-{hour + 1:02d}:00"
+    return fields
+
+
+def _weighted(rng, options):
+    point = rng.random()
+    for value, weight in options:
+        point -= weight
+        if point < 0:
+            return value
+    return options[-1][0]
+
+
+class DatasetSeeder:
+    """Generates a realistic POS dataset with Core executemany batches.
+
+    Rows are produced lazily and written in ``batch_size`` chunks, one
+    commit per chunk, so memory stays flat for millions of orders. Ids are
+    derived from (table, index), which keeps foreign keys consistent without
+    holding id lists. Order sizes are geometric around ``items_mean`` and
+    product popularity follows a Zipf law with exponent ``popularity_skew``.
+    Everything is driven by ``seed``, so the same options give the same data.
+    """
+
+    def __init__(
+        self,
+        contacts=10_000,
+        products=10_000,
+        orders=100_000,
+        warehouses=2,
+        categories=20,
+        bill_accounts=3,
+        kit_ratio=0.02,
+        items_mean=2.5,
+        items_max=20,
+        popularity_skew=1.1,
+        start=datetime(2025, 1, 1),
+        days=365,
+        seed=42,
+        stock=(0, 500),
+        batch_size=5000,
+        echo=None,
+    ):
+        if products < 1:
+            raise ValueError("At least one product is required")
+        if items_mean < 1:
+            raise ValueError("items_mean must be at least 1")
+        self.contacts = contacts
+        self.products = products
+        self.orders = orders
+        self.warehouses = warehouses
+        self.categories = categories
+        self.bill_accounts = bill_accounts
+        self.kit_ratio = kit_ratio
+        self.items_mean = items_mean
+        self.items_max = items_max
+        self.popularity_skew = popularity_skew
+        self.start = start
+        self.days = days
+        self.stock = stock
+        self.seed = seed
+        self.batch_size = batch_size
+        self.echo = echo or (lambda message: None)
+        self.rng = random.Random(seed)
+        self.prices = array("q")
+        self.tax_rates = array("b")
+        self.on_hand = array("q")
+        self.taxonomy_names = []
+
+    def run(self, reset=False):
+        if reset:
+            db.drop_all()
+            db.create_all()
+        self._write(Taxonomy, self._taxonomies())
+        self._write(Product, self._products())
+        self._write(ProductTaxonomy, self._product_taxonomies())
+        self._write(ProductComponent, self._components())
+        self._write(Warehouse, self._warehouses())
+        self._write(Inventory, self._inventories())
+        self._write(ProductStock, self._product_stock())
+        self._write(Contact, self._contacts())
+        self._write(BillAccount, self._bill_accounts())
+        self._write(BillAccountSnapshot, self._snapshots())
+        balances = [0] * self.bill_accounts
+        movement_counts = [0] * self.bill_accounts
+        self._write_orders(balances, movement_counts)
+        self._write_balances(balances, movement_counts)
+        self._write_rollups()
+
+    def _write(self, model, rows):
+        started = time.perf_counter()
+        count = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                count += self._flush(model.__table__, batch)
+                batch = []
+        if batch:
+            count += self._flush(model.__table__, batch)
+        self._report(model.__tablename__, count, started)
+
+    def _flush(self, table, batch):
+        db.session.execute(insert(table), batch)
+        db.session.commit()
+        return len(batch)
+
+    def _report(self, name, count, started):
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        self.echo(f"{name:<22} {count:>12,} rows  {elapsed:>7.1f}s  {rate:>10,.0f} rows/s")
+
+    def _taxonomies(self):
+        index = 0
+        for category in range(self.categories):
+            parent_index = index
+            parent_path = child_path(None, seed_id("taxonomy", parent_index))
+            self.taxonomy_names.append(f"Categoria {category}")
+            yield {
+                "id": seed_id("taxonomy", parent_index),
+                "path": parent_path,
+                "depth": 0,
+                "name": f"Categoria {category}",
+                "slug": f"categoria-{category}",
+                "kind": "category",
+                "ordering": category,
+                "parent_id": None,
+            }
+            index += 1
+            for child in range(self.rng.randint(0, 4)):
+                self.taxonomy_names.append(f"Categoria {category}.{child}")
+                yield {
+                    "id": seed_id("taxonomy", index),
+                    "path": child_path(parent_path, seed_id("taxonomy", index)),
+                    "depth": 1,
+                    "name": f"Categoria {category}.{child}",
+                    "slug": f"categoria-{category}-{child}",
+                    "kind": "category",
+                    "ordering": child,
+                    "parent_id": seed_id("taxonomy", parent_index),
+                }
+                index += 1
+
+    def _products(self):
+        created_step = self.days * 86400 / self.products
+        for index in range(self.products):
+            price = self.rng.randint(500, 200_000)
+            tax_rate = self.rng.choice(TAX_RATES)
+            self.prices.append(price)
+            self.tax_rates.append(tax_rate)
+            taxonomy_index = self.rng.randrange(len(self.taxonomy_names)) if self.taxonomy_names else None
+            yield {
+                "id": seed_id("product", index),
+                "name": f"Producto {index}",
+                "sku": f"75{index:010d}",
+                "price": _money(price),
+                "cost": _money(price * 6 // 10),
+                "tax_rate": tax_rate,
+                "category": None if taxonomy_index is None else self.taxonomy_names[taxonomy_index],
+                "taxonomy_id": None if taxonomy_index is None else seed_id("taxonomy", taxonomy_index),
+                "created_at": self.start + timedelta(seconds=index * created_step),
+            }
+
+    def _product_taxonomies(self):
+        if not self.taxonomy_names:
+            return
+        rng = random.Random(self.seed + 1)
+        for index in range(self.products):
+            yield {
+                "id": seed_id("product_taxonomy", index),
+                "product_id": seed_id("product", index),
+                "taxonomy_id": seed_id("taxonomy", rng.randrange(len(self.taxonomy_names))),
+            }
+
+    def _components(self):
+        kits = int(self.products * self.kit_ratio)
+        if self.products - kits < 2:
+            return
+        index = 0
+        # The first ``kits`` products are kits built from the remaining ones.
+        for kit in range(kits):
+            for component in self.rng.sample(range(kits, self.products), self.rng.randint(2, 5)):
+                yield {
+                    "id": seed_id("component", index),
+                    "parent_product_id": seed_id("product", kit),
+                    "component_product_id": seed_id("product", component),
+                    "quantity": self.rng.randint(1, 3),
+                }
+                index += 1
+
+    def _warehouses(self):
+        for index in range(self.warehouses):
+            yield {"id": seed_id("warehouse", index), "name": f"Almacen {index}"}
+
+    def _inventories(self):
+        self.on_hand = array("q", bytes(8 * self.products))
+        for warehouse in range(self.warehouses):
+            for product in range(self.products):
+                quantity = self.rng.randint(*self.stock)
+                self.on_hand[product] += quantity
+                yield {
+                    "id": seed_id("inventory", warehouse * self.products + product),
+                    "warehouse_id": seed_id("warehouse", warehouse),
+                    "product_id": seed_id("product", product),
+                    "quantity": quantity,
+                }
+
+    def _product_stock(self):
+        reorder_level = current_app.config.get("LOW_STOCK_THRESHOLD", 5)
+        for product in range(self.products):
+            yield {
+                "product_id": seed_id("product", product),
+                "on_hand": self.on_hand[product],
+                "reorder_level": reorder_level,
+                "low_stock": self.on_hand[product] <= reorder_level,
+            }
+
+    def _contacts(self):
+        step = self.days * 86400 / max(self.contacts, 1)
+        for index in range(self.contacts):
+            yield {
+                "id": seed_id("contact", index),
+                "name": f"Cliente {index}",
+                "email": f"cliente{index}@example.com",
+                "phone": f"55{index:08d}",
+                "created_at": self.start + timedelta(seconds=index * step),
+            }
+
+    def _bill_accounts(self):
+        for index in range(self.bill_accounts):
+            yield {
+                "id": seed_id("bill_account", index),
+                "name": f"Cuenta {index}",
+                "type": "cash" if index == 0 else "bank",
+                "balance": 0,
+            }
+
+    def _snapshots(self):
+        # One opening snapshot per account folds in every seeded movement;
+        # its totals are filled in by _write_balances.
+        for index in range(self.bill_accounts):
+            yield {
+                "id": seed_id("snapshot", index),
+                "bill_account_id": seed_id("bill_account", index),
+                "sequence": 1,
+                "balance": 0,
+                "delta": 0,
+                "movements": 0,
+            }
+
+    def _popularity(self):
+        """Cumulative Zipf weights over popularity ranks"""
+        weights = (1 / (rank ** self.popularity_skew) for rank in range(1, self.products + 1))
+        return list(accumulate(weights))
+
+    def _write_orders(self, balances, movement_counts):
+        cumulative = self._popularity()
+        total_weight = cumulative[-1]
+        # Spread popularity ranks over the catalog instead of favouring low indexes.
+        stride = 7919
+        while math.gcd(stride, self.products) != 1:
+            stride += 2
+        geometric = math.log(1 - 1 / self.items_mean) if self.items_mean > 1 else None
+        step = self.days * 86400 / max(self.orders, 1)
+        rng = random.Random(self.seed + 2)
+        # Own stream, so the other columns stay what earlier seeds produced.
+        extra_rng = random.Random(self.seed + 3)
+
+        started = time.perf_counter()
+        counts = {"orders": 0, "order_items": 0, "order_bill_accounts": 0}
+        orders, items, movements = [], [], []
+        item_index = 0
+        for index in range(self.orders):
+            created_at = self.start + timedelta(seconds=index * step)
+            order_id = ordered_seed_id("order", index, created_at)
+            size = 1
+            if geometric:
+                size = min(self.items_max, 1 + int(math.log(1 - rng.random()) / geometric))
+            subtotal = tax = 0
+            for _ in range(size):
+                rank = bisect_left(cumulative, rng.random() * total_weight)
+                product = (rank * stride) % self.products
+                quantity = 1 + int(rng.expovariate(1.5))
+                line = self.prices[product] * quantity
+                subtotal += line
+                tax += line * self.tax_rates[product] // 100
+                items.append({
+                    "id": ordered_seed_id("order_item", item_index, created_at),
+                    "order_id": order_id,
+                    "product_id": seed_id("product", product),
+                    "quantity": quantity,
+                    "price": _money(self.prices[product]),
+                    "total": _money(line),
+                })
+                item_index += 1
+
+            status = _weighted(rng, STATUSES)
+            total = subtotal + tax
+            payment_method = _weighted(rng, PAYMENT_METHODS)
+            orders.append({
+                "id": order_id,
+                "contact_id": seed_id("contact", rng.randrange(self.contacts)) if self.contacts and rng.random() < 0.7 else None,
+                "subtotal": _money(subtotal),
+                "tax": _money(tax),
+                "discount": 0,
+                "total": _money(total),
+                "status": status,
+                "payment_status": "paid" if status == "paid" else "pending",
+                "payment_method": payment_method,
+                "type": "sale",
+                "extra_fields": _extra_fields(extra_rng, created_at),
+                "created_at": created_at,
+            })
+            if status == "paid" and self.bill_accounts:
+                account = 0 if payment_method == "cash" else 1 + index % max(self.bill_accounts - 1, 1)
+                account = min(account, self.bill_accounts - 1)
+                balances[account] += total
+                movement_counts[account] += 1
+                movements.append({
+                    "id": ordered_seed_id("movement", index, created_at),
+                    "order_id": order_id,
+                    "bill_account_id": seed_id("bill_account", account),
+                    "amount": _money(total),
+                    "movement_type": "in",
+                    "snapshot_id": seed_id("snapshot", account),
+                    "created_at": created_at,
+                })
+
+            if len(orders) >= self.batch_size:
+                self._flush_orders(orders, items, movements, counts)
+                orders, items, movements = [], [], []
+        if orders:
+            self._flush_orders(orders, items, movements, counts)
+        for name, count in counts.items():
+            self._report(name, count, started)
+
+    def _flush_orders(self, orders, items, movements, counts):
+        db.session.execute(insert(Order.__table__), orders)
+        for start in range(0, len(items), self.batch_size):
+            db.session.execute(insert(OrderItem.__table__), items[start:start + self.batch_size])
+        if movements:
+            db.session.execute(insert(OrderBillAccount.__table__), movements)
+        db.session.commit()
+        counts["orders"] += len(orders)
+        counts["order_items"] += len(items)
+        counts["order_bill_accounts"] += len(movements)
+
+    def _write_rollups(self):
+        started = time.perf_counter()
+        report = SalesRollupViewModel.rebuild(batch_size=max(self.batch_size, 5000), fix=True)
+        self._report("daily_sales (days)", report["days"], started)
+
+    def _write_balances(self, balances, movement_counts):
+        accounts = BillAccount.__table__
+        snapshots = BillAccountSnapshot.__table__
+        for index, cents in enumerate(balances):
+            db.session.execute(
+                update(accounts).where(accounts.c.id == seed_id("bill_account", index)).values(balance=_money(cents))
+            )
+            db.session.execute(
+                update(snapshots)
+                .where(snapshots.c.id == seed_id("snapshot", index))
+                .values(balance=_money(cents), delta=_money(cents), movements=movement_counts[index])
+            )
+        db.session.commit()
+
+
+@click.command("seed")
+@click.option("--contacts", default=10_000, show_default=True)
+@click.option("--products", default=10_000, show_default=True)
+@click.option("--orders", default=100_000, show_default=True)
+@click.option("--warehouses", default=2, show_default=True, help="Every product gets a stock row per warehouse.")
+@click.option("--categories", default=20, show_default=True, help="Top-level categories, each with 0-4 subcategories.")
+@click.option("--bill-accounts", default=3, show_default=True)
+@click.option("--kit-ratio", default=0.02, show_default=True, help="Share of products that are kits of other products.")
+@click.option("--items-mean", default=2.5, show_default=True, help="Mean items per order (geometric).")
+@click.option("--items-max", default=20, show_default=True)
+@click.option("--popularity-skew", default=1.1, show_default=True, help="Zipf exponent; 0 makes products equally popular.")
+@click.option("--start", "start", default="2025-01-01", show_default=True, help="Date of the first order.")
+@click.option("--days", default=365, show_default=True, help="Days the orders are spread over.")
+@click.option("--seed", "seed_value", default=42, show_default=True)
+@click.option("--batch-size", default=5000, show_default=True)
+@click.option("--reset", is_flag=True, help="Drop and recreate all tables first.")
+@with_appcontext
+def seed(start, seed_value, reset, **options):
+    """Generate a large, deterministic dataset for load testing."""
+    try:
+        seeder = DatasetSeeder(
+            start=datetime.fromisoformat(start), seed=seed_value, echo=click.echo, **options
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    if reset:
+        click.confirm("This drops every table in the configured database. Continue?", abort=True)
+    started = time.perf_counter()
+    seeder.run(reset=reset)
+    click.echo(f"Done in {time.perf_counter() - started:.1f}s")
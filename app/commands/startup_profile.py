@@ -0,0 +1,104 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+# Runs in a fresh interpreter, so nothing is imported or cached yet.
+_PROBE = r"""
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app(sys.argv[1])
+created = time.perf_counter()
+status = app.test_client().get(sys.argv[2]).status_code
+served = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_ms": (created - imported) * 1000,
+    "request_ms": (served - created) * 1000,
+    "status": status,
+    "modules": len(sys.modules),
+}))
+"""
+_IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def _run(config_name, path, importtime=False):
+    root = os.path.dirname(current_app.root_path)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", _PROBE, config_name, path]
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=root, env=env, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise click.ClickException(f"Start-up probe failed:\n{completed.stderr.strip()}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = elapsed
+    result["total_ms"] = result["import_ms"] + result["create_ms"] + result["request_ms"]
+    return result, completed.stderr
+
+
+def _group(module):
+    parts = module.split(".")
+    # Our own code is worth seeing per layer (app.models, app.view_model, ...).
+    return ".".join(parts[:2]) if parts[0] == "app" else parts[0]
+
+
+@click.command("startup-profile")
+@click.option("--config", "config_name", default=lambda: os.getenv("FLASK_ENV", "development"),
+              show_default="FLASK_ENV", help="Configuration to create the app with.")
+@click.option("--path", default="/health", show_default=True, help="First request to serve.")
+@click.option("--runs", default=5, show_default=True, help="Cold starts to time; the median is reported.")
+@click.option("--top", default=15, show_default=True, help="Packages and modules to list.")
+@click.option("--budget", "budget_ms", type=float, default=None,
+              help="Fail when the median exceeds this many ms. [default: STARTUP_BUDGET_MS]")
+@with_appcontext
+def startup_profile(config_name, path, runs, top, budget_ms):
+    """Measure cold start: import time per module and time to the first request."""
+    if runs < 1:
+        raise click.UsageError("--runs must be at least 1")
+    budget_ms = budget_ms if budget_ms is not None else current_app.config.get("STARTUP_BUDGET_MS")
+
+    timings = [_run(config_name, path)[0] for _ in range(runs)]
+    # One extra run under -X importtime for the breakdown; it inflates the totals, so they are not used.
+    _, trace = _run(config_name, path, importtime=True)
+
+    modules = []
+    for line in trace.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match:
+            modules.append((match.group(4), int(match.group(1)) / 1000, int(match.group(2)) / 1000))
+    groups = {}
+    for module, self_ms, _ in modules:
+        groups[_group(module)] = groups.get(_group(module), 0) + self_ms
+
+    def median(key):
+        return statistics.median(timing[key] for timing in timings)
+
+    total = median("total_ms")
+    click.echo(f"Cold start, median of {runs} ({config_name}, GET {path} -> {timings[-1]['status']}):")
+    click.echo(f"  import app        {median('import_ms'):8.1f} ms")
+    click.echo(f"  create_app        {median('create_ms'):8.1f} ms")
+    click.echo(f"  first request     {median('request_ms'):8.1f} ms")
+    click.echo(f"  total             {total:8.1f} ms   ({median('process_ms'):.1f} ms with interpreter start)")
+    click.echo(f"  modules loaded    {timings[-1]['modules']:8d}")
+
+    click.echo("\nImport time by package (self time, -X importtime):")
+    for group, self_ms in sorted(groups.items(), key=lambda item: -item[1])[:top]:
+        click.echo(f"  {self_ms:8.1f} ms  {group}")
+    click.echo("\nSlowest modules (self time):")
+    for module, self_ms, cumulative_ms in sorted(modules, key=lambda item: -item[1])[:top]:
+        click.echo(f"  {self_ms:8.1f} ms  {module} ({cumulative_ms:.1f} ms with its imports)")
+
+    if budget_ms:
+        click.echo(f"\nBudget {budget_ms:.0f} ms: " + ("over" if total > budget_ms else "ok"))
+        if total > budget_ms:
+            raise SystemExit(1)
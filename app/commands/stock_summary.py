@@ -0,0 +1,21 @@
+import click
+from flask.cli import with_appcontext
+
+from app.view_model.product.stock import StockViewModel
+
+
+@click.command("stock-summary")
+@click.option("--rebuild", is_flag=True, help="Repair the summaries that differ instead of only reporting them.")
+@click.option("--batch-size", default=1000, show_default=True, help="Products per chunk.")
+@with_appcontext
+def stock_summary(rebuild, batch_size):
+    """Verify the per-product stock summary against inventories, or rebuild it."""
+    report = StockViewModel.rebuild(batch_size=batch_size, fix=rebuild)
+    drift = report["missing"] + report["mismatched"] + report["orphaned"]
+    click.echo(
+        f"{report['products']} products checked, {report['missing']} missing, "
+        f"{report['mismatched']} mismatched, {report['orphaned']} orphaned"
+        + (" [repaired]" if rebuild and drift else "")
+    )
+    if drift and not rebuild:
+        raise SystemExit(1)
@@ -0,0 +1,21 @@
+import click
+from flask.cli import with_appcontext
+
+from app.view_model.product.taxonomy import TaxonomyViewModel
+
+
+@click.command("taxonomy-paths")
+@click.option("--rebuild", is_flag=True, help="Rewrite the paths that differ instead of only reporting them.")
+@with_appcontext
+def taxonomy_paths(rebuild):
+    """Verify taxonomy materialized paths against parent_id, or rebuild them."""
+    report = TaxonomyViewModel.rebuild_paths(fix=rebuild)
+    click.echo(
+        f"{report['taxonomies']} taxonomies checked, {report['mismatched']} mismatched, "
+        f"{len(report['cycles'])} in parent cycles"
+        + (" [repaired]" if rebuild and report["mismatched"] else "")
+    )
+    for taxonomy_id in report["cycles"]:
+        click.echo(f"  cycle: {taxonomy_id}", err=True)
+    if (report["mismatched"] and not rebuild) or report["cycles"]:
+        raise SystemExit(1)
@@ -0,0 +1,66 @@
+import time
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import inspect, text
+
+from app.database import db
+
+# Must match the shadow columns added by migration c8e4f2a6b9d3.
+CONVERTED = (
+    ("orders", ("id",)),
+    ("order_items", ("id", "order_id")),
+    ("order_bill_accounts", ("id", "order_id")),
+)
+
+
+def _pending(columns):
+    return " OR ".join(f"({column} IS NOT NULL AND {column}_bin IS NULL)" for column in columns)
+
+
+@click.command("uuid-backfill")
+@click.option("--batch-size", default=5000, show_default=True, help="Rows per transaction.")
+@click.option("--pause", default=0.0, show_default=True, help="Seconds to sleep between batches, to spare replicas.")
+@click.option("--check", is_flag=True, help="Only count the rows still missing their binary keys.")
+@with_appcontext
+def uuid_backfill(batch_size, pause, check):
+    """Fill the binary shadow columns of the order keys before switching to them."""
+    if batch_size < 1:
+        raise click.BadParameter("must be at least 1", param_hint="--batch-size")
+    inspector = inspect(db.engine)
+    if not any(c["name"] == "id_bin" for c in inspector.get_columns("orders")):
+        click.echo("No binary shadow columns to fill (not MySQL, or already switched); nothing to do.")
+        return
+
+    remaining = 0
+    for table, columns in CONVERTED:
+        updated = 0
+        last = ""
+        while not check:
+            # Walk the primary key in ranges so each batch is a short
+            # transaction that locks only the rows it fills.
+            upto = db.session.execute(
+                text(f"SELECT id FROM {table} WHERE id > :last ORDER BY id LIMIT 1 OFFSET :skip"),
+                {"last": last, "skip": batch_size - 1},
+            ).scalar()
+            bound = "" if upto is None else " AND id <= :upto"
+            result = db.session.execute(
+                text(
+                    f"UPDATE {table} SET "
+                    + ", ".join(f"{column}_bin = UUID_TO_BIN({column})" for column in columns)
+                    + f" WHERE id > :last{bound} AND ({_pending(columns)})"
+                ),
+                {"last": last, "upto": upto},
+            )
+            db.session.commit()
+            updated += result.rowcount
+            if upto is None:
+                break
+            last = upto
+            if pause:
+                time.sleep(pause)
+        missing = db.session.execute(text(f"SELECT COUNT(*) FROM {table} WHERE {_pending(columns)}")).scalar()
+        remaining += missing
+        click.echo(f"{table}: {updated} rows filled, {missing} remaining")
+    if check and remaining:
+        raise SystemExit(1)
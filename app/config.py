@@ -2,13 +2,68 @@ import os
 from datetime import timedelta
 from urllib.parse import quote_plus
 
+from app.pool import pool_options
+
+
+def replica_binds(uris, engine_options=None):
+    """``SQLALCHEMY_BINDS`` entries (``replica_1``, ...) for comma-separated replica URIs.
+
+    Flask-SQLAlchemy only applies ``SQLALCHEMY_ENGINE_OPTIONS`` to the
+    primary, so replicas get their pool settings here.
+    """
+    uris = [uri.strip() for uri in (uris or '').split(',') if uri.strip()]
+    return {f'replica_{number}': dict(engine_options or {}, url=uri) for number, uri in enumerate(uris, 1)}
+
+
 class Config:
     """Base configuration"""
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SQLALCHEMY_BINDS = replica_binds(os.getenv('DB_REPLICA_URIS'))
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 5))
+    REPLICA_CHECK_INTERVAL = float(os.getenv('REPLICA_CHECK_INTERVAL', 5))
+    REPLICA_LAG_QUERY = os.getenv('REPLICA_LAG_QUERY')
+    REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 10))
+    REPLICA_STICKY_COOKIE = 'db_primary_until'
+    READY_TIMEOUT = float(os.getenv('READY_TIMEOUT', 2))
     SESSION_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
+    LIST_PAGE_SIZE = int(os.getenv('LIST_PAGE_SIZE', 50))
+    LIST_MAX_PAGE_SIZE = int(os.getenv('LIST_MAX_PAGE_SIZE', 200))
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 1000))
+    ORDER_EXTRA_FIELDS_MAX_BYTES = int(os.getenv('ORDER_EXTRA_FIELDS_MAX_BYTES', 4096))
+    CATEGORY_CACHE_TTL = int(os.getenv('CATEGORY_CACHE_TTL', 300))
+    LOW_STOCK_THRESHOLD = int(os.getenv('LOW_STOCK_THRESHOLD', 5))
+    LOW_STOCK_RESULTS = 100
+    BOM_RESOLVER_BACKEND = os.getenv('BOM_RESOLVER_BACKEND', 'auto')
+    BOM_CACHE_TTL = int(os.getenv('BOM_CACHE_TTL', 300))
+    SALES_DASHBOARD_DAYS = int(os.getenv('SALES_DASHBOARD_DAYS', 30))
+    JOB_OUTPUT_DIR = os.getenv('JOB_OUTPUT_DIR')
+    JOB_WORKER_THREADS = int(os.getenv('JOB_WORKER_THREADS', 2))
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1.0))
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 900))
+    JOB_RETRY_DELAY = int(os.getenv('JOB_RETRY_DELAY', 30))
+    JOB_PROGRESS_INTERVAL = float(os.getenv('JOB_PROGRESS_INTERVAL', 1.0))
+    JOB_RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', 7))
+    PRODUCT_SEARCH_BACKEND = os.getenv('PRODUCT_SEARCH_BACKEND', 'auto')
+    PRODUCT_SEARCH_RESULTS = 20
+    PRODUCT_SEARCH_MAX_RESULTS = 50
+    # Match the server's innodb_ft_min_token_size; shorter terms bypass FULLTEXT.
+    PRODUCT_SEARCH_FULLTEXT_MIN_TOKEN = int(os.getenv('PRODUCT_SEARCH_FULLTEXT_MIN_TOKEN', 3))
+    SQL_INSTRUMENTATION = os.getenv('SQL_INSTRUMENTATION', 'True') == 'True'
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
+    N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', 10))
+    SERVER_TIMING_HEADER = True
+    STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', 1000))
+    ASSET_BUILD_DIR = 'dist'
+    ASSET_MAX_AGE = 31536000
+    GZIP_RESPONSES = os.getenv('GZIP_RESPONSES', 'True') == 'True'
+    GZIP_MIMETYPES = ('text/html', 'application/json')
+    GZIP_MIN_SIZE = 1024
+    GZIP_LEVEL = 6
 
 
 class DevelopmentConfig(Config):
@@ -25,7 +80,15 @@ class DevelopmentConfig(Config):
         f"mysql+pymysql://{quote_plus(db_user)}:{quote_plus(db_password)}@"
         f"{db_host}:{db_port}/{db_name}"
     )
-    SQLALCHEMY_ECHO = True
+    SQLALCHEMY_ECHO = os.getenv('SQLALCHEMY_ECHO', 'False') == 'True'
+    SQLALCHEMY_ENGINE_OPTIONS = pool_options(
+        pool_size=int(os.getenv('DB_POOL_SIZE', 5)),
+        max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 5)),
+        pool_timeout=int(os.getenv('DB_POOL_TIMEOUT', 10)),
+        pool_recycle=int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        connect_args={'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5))},
+    )
+    SQLALCHEMY_BINDS = replica_binds(os.getenv('DB_REPLICA_URIS'), SQLALCHEMY_ENGINE_OPTIONS)
 
 
 class ProductionConfig(Config):
@@ -39,10 +102,20 @@ class ProductionConfig(Config):
     db_name = os.getenv('DB_NAME')
     
     SQLALCHEMY_DATABASE_URI = (
-        f"mysql+pymysql://{quote_plus(db_user)}:{quote_plus(db_password or '')}@"
+        f"mysql+pymysql://{quote_plus(db_user or '')}:{quote_plus(db_password or '')}@"
         f"{db_host}:{db_port}/{db_name}"
     )
     SQLALCHEMY_ECHO = False
+    # A short pool_timeout turns an exhausted pool into fast 503s rather than
+    # hung workers; recycle below MySQL's wait_timeout, pre-ping for the rest.
+    SQLALCHEMY_ENGINE_OPTIONS = pool_options(
+        pool_size=int(os.getenv('DB_POOL_SIZE', 10)),
+        max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        pool_timeout=int(os.getenv('DB_POOL_TIMEOUT', 3)),
+        pool_recycle=int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        connect_args={'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5))},
+    )
+    SQLALCHEMY_BINDS = replica_binds(os.getenv('DB_REPLICA_URIS'), SQLALCHEMY_ENGINE_OPTIONS)
 
 
 class TestingConfig(Config):
@@ -53,9 +126,20 @@ class TestingConfig(Config):
     WTF_CSRF_ENABLED = False
 
 
+class BenchmarkConfig(TestingConfig):
+    """File-backed SQLite so seeded benchmark datasets survive between runs"""
+    DEBUG = False
+    SQLALCHEMY_DATABASE_URI = os.getenv('BENCHMARK_DATABASE_URI', 'sqlite:///benchmark.db')
+    SQLALCHEMY_ENGINE_OPTIONS = pool_options(pool_size=5, max_overflow=10, pool_timeout=5, pre_ping=False)
+    SQLALCHEMY_BINDS = replica_binds(os.getenv('DB_REPLICA_URIS'), SQLALCHEMY_ENGINE_OPTIONS)
+    SLOW_QUERY_MS = None
+    N_PLUS_ONE_THRESHOLD = 0
+
+
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
     'testing': TestingConfig,
+    'benchmark': BenchmarkConfig,
     'default': DevelopmentConfig
 }
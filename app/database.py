@@ -1,3 +1,26 @@
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 
-db = SQLAlchemy()
\ No newline at end of file
+
+class RoutingSession(Session):
+    """Session that sends plain SELECTs to ``info["replica"]`` when it is set.
+
+    ``app.replicas.read_only`` sets it around view-model reads. Flushes,
+    writes and ``SELECT ... FOR UPDATE`` always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get("replica")
+        if (
+            replica is not None
+            and bind is None
+            and not self._flushing
+            and clause is not None
+            and clause.is_select
+            and getattr(clause, "_for_update_arg", None) is None
+        ):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
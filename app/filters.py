@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+
+def money(value, places=2, empty="-"):
+    """Format a Decimal (or number) amount for display; ``None`` renders as ``empty``"""
+    if value is None:
+        return empty
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return f"{value:.{places}f}"
+
+
+def quantity(value, empty="-"):
+    """Format a stock quantity without the trailing zeros of its column scale"""
+    if value is None:
+        return empty
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    if value == value.to_integral_value():
+        return str(int(value))
+    return f"{value.normalize():f}"
+
+
+def register_filters(app):
+    """Attach the project's Jinja filters to ``app``"""
+    app.add_template_filter(money)
+    app.add_template_filter(quantity)
+
+
+__all__ = ['register_filters']
@@ -0,0 +1,92 @@
+import re
+import time
+from collections import Counter
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement):
+    """Collapse whitespace and expanded IN lists so repeats compare equal"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+
+def _route():
+    rule = request.url_rule
+    return f"{request.method} {rule.rule if rule else request.path}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    if not has_request_context() or "sql_stats" not in g:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    stats = g.sql_stats
+    stats["count"] += 1
+    stats["duration_ms"] += elapsed_ms
+    stats["shapes"][statement_shape(statement)] += 1
+
+    threshold = current_app.config.get("SLOW_QUERY_MS", 200)
+    if threshold is not None and elapsed_ms >= threshold:
+        current_app.logger.warning(
+            "Slow query (%.1f ms) on %s: %s", elapsed_ms, _route(), statement_shape(statement)
+        )
+
+
+def _handle_error(exception_context):
+    started = exception_context.connection and exception_context.connection.info.get("query_started_at")
+    if started:
+        started.pop()
+
+
+def _start_request():
+    g.sql_stats = {"count": 0, "duration_ms": 0.0, "shapes": Counter()}
+    g.request_started_at = time.perf_counter()
+
+
+def _finish_request(response):
+    stats = g.pop("sql_stats", None)
+    started = g.pop("request_started_at", None)
+    if stats is None or started is None:
+        return response
+
+    repeat_threshold = current_app.config.get("N_PLUS_ONE_THRESHOLD", 10)
+    for shape, count in stats["shapes"].items():
+        if repeat_threshold and count > repeat_threshold:
+            current_app.logger.warning(
+                "Possible N+1 on %s: statement ran %d times: %s", _route(), count, shape
+            )
+
+    if current_app.config.get("SERVER_TIMING_HEADER", True):
+        total_ms = (time.perf_counter() - started) * 1000
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={stats["duration_ms"]:.2f};desc="{stats["count"]} queries", app;dur={total_ms:.2f}',
+        )
+    return response
+
+
+def init_instrumentation(app):
+    """Count queries and DB time per request and report them.
+
+    Adds a ``Server-Timing`` header, logs statements slower than
+    ``SLOW_QUERY_MS`` with their route, and warns when a request runs the
+    same statement shape more than ``N_PLUS_ONE_THRESHOLD`` times.
+    """
+    if not app.config.get("SQL_INSTRUMENTATION", True):
+        return
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
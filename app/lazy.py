@@ -0,0 +1,50 @@
+from importlib import import_module
+
+import click
+
+
+def _resolve(path):
+    module, _, attributes = path.partition(":")
+    target = import_module(module)
+    for attribute in attributes.split("."):
+        target = getattr(target, attribute)
+    return target
+
+
+def lazy(path):
+    """Callable stand-in for ``"package.module:Attribute"``, imported on first call.
+
+    Routes use it for view classes, so a worker only imports the views (and
+    their view models) of the pages it actually serves.
+    """
+    target = None
+
+    def call(*args, **kwargs):
+        nonlocal target
+        if target is None:
+            target = _resolve(path)
+        return target(*args, **kwargs)
+
+    call.__name__ = path.rpartition(":")[2].rpartition(".")[2]
+    call.__qualname__ = call.__name__
+    return call
+
+
+class LazyCommand(click.Command):
+    """CLI command listed under ``flask --help`` whose module loads only when it runs.
+
+    Parsing, ``--help`` and invocation are all handed to the real command,
+    so it behaves exactly as if it had been registered directly. The short
+    help in the command listing is the real command's too, so listing the
+    commands imports them all.
+    """
+
+    def __init__(self, name, path):
+        super().__init__(name)
+        self.path = path
+
+    def get_short_help_str(self, limit=45):
+        return _resolve(self.path).get_short_help_str(limit)
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        return _resolve(self.path).make_context(info_name, args, parent=parent, **extra)
@@ -4,11 +4,15 @@ from app.models.pos import (
 	Contact,
 	Warehouse,
 	Inventory,
+	ProductStock,
 	Order,
+	DailySales,
 	OrderItem,
 	BillAccount,
+	BillAccountSnapshot,
 	OrderBillAccount,
 )
+from app.models.job import Job
 
 __all__ = [
 	'User',
@@ -19,8 +23,12 @@ __all__ = [
 	'Contact',
 	'Warehouse',
 	'Inventory',
+	'ProductStock',
 	'Order',
+	'DailySales',
 	'OrderItem',
 	'BillAccount',
+	'BillAccountSnapshot',
 	'OrderBillAccount',
+	'Job',
 ]
@@ -1,11 +1,23 @@
-from uuid import uuid4
+from sqlalchemy import event, select
+from sqlalchemy.orm import object_session
+
 from app.database import db
+from app.models.types import uuid7
+
+
+def child_path(parent_path, taxonomy_id):
+    return f"{parent_path or '/'}{taxonomy_id}/"
 
 
 class Taxonomy(db.Model):
     __tablename__ = "taxonomies"
+    __table_args__ = (
+        db.Index("ix_taxonomies_kind_name", "kind", "name"),
+        db.Index("ix_taxonomies_parent_id", "parent_id"),
+        db.Index("ix_taxonomies_path", "path"),
+    )
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=uuid7)
     name = db.Column(db.String(255), nullable=True)
     value = db.Column("value", db.Text, nullable=True)
     slug = db.Column(db.String(255), nullable=True)
@@ -15,12 +27,51 @@ class Taxonomy(db.Model):
     color = db.Column(db.String(50), nullable=True)
     image = db.Column(db.String(255), nullable=True)
     parent_id = db.Column(db.String(36), db.ForeignKey("taxonomies.id"), nullable=True)
+    # Materialized "/<root id>/.../<id>/" path, maintained by TaxonomyViewModel
+    # and filled in by ``_fill_taxonomy_path`` for rows inserted without one.
+    path = db.Column(db.String(760), nullable=True)
+    depth = db.Column(db.Integer, nullable=True, default=0)
+
+
+@event.listens_for(Taxonomy, "before_insert")
+def _fill_taxonomy_path(mapper, connection, target):
+    """Give ORM inserts that carry no path one under their parent's path.
+
+    A parent added in the same flush is found among the pending objects,
+    otherwise it is read from the database. An unknown parent makes the row
+    a root, as ``rebuild_paths`` treats it; a parent without a path leaves
+    the row without one too, for ``rebuild_paths`` to repair.
+    """
+    if target.path is not None:
+        return
+    if target.id is None:
+        target.id = uuid7()
+    parent = None
+    if target.parent_id:
+        pending = object_session(target).new
+        parent = next(
+            (row for row in pending if isinstance(row, Taxonomy) and row.id == target.parent_id), None
+        ) or connection.execute(
+            select(Taxonomy.path, Taxonomy.depth).where(Taxonomy.id == target.parent_id)
+        ).first()
+        if parent is not None and parent.path is None:
+            return
+    target.path = child_path(parent.path if parent else None, target.id)
+    target.depth = (parent.depth or 0) + 1 if parent else 0
 
 
 class Product(db.Model):
     __tablename__ = "products"
+    __table_args__ = (
+        db.Index("ix_products_created_at_id", "created_at", "id"),
+        db.Index("ix_products_name_id", "name", "id"),
+        db.Index("ix_products_sku", "sku"),
+        db.Index("ix_products_taxonomy_id", "taxonomy_id"),
+        db.Index("ix_products_updated_at", "updated_at"),
+        db.Index("ft_products_name", "name", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=uuid7)
     name = db.Column(db.String(255), nullable=False)
     sku = db.Column(db.String(100), nullable=True)
     price = db.Column(db.Numeric(18, 4), nullable=True)
@@ -33,8 +84,12 @@ class Product(db.Model):
     updated_at = db.Column(
         db.DateTime,
         server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
         server_onupdate=db.func.current_timestamp(),
     )
+    # Bumped by every UPDATE. updated_at has one-second resolution, so the API
+    # validators compare this to catch edits made within the same second.
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1", onupdate=db.text("version + 1"))
 
     def __repr__(self):
         return f"<Product {self.name}>"
@@ -55,16 +110,24 @@ class Product(db.Model):
 
 class ProductTaxonomy(db.Model):
     __tablename__ = "product_taxonomies"
+    __table_args__ = (
+        db.Index("ix_product_taxonomies_product_id", "product_id"),
+        db.Index("ix_product_taxonomies_taxonomy_id", "taxonomy_id"),
+    )
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=uuid7)
     product_id = db.Column(db.String(36), db.ForeignKey("products.id"), nullable=True)
     taxonomy_id = db.Column(db.String(36), db.ForeignKey("taxonomies.id"), nullable=True)
 
 
 class ProductComponent(db.Model):
     __tablename__ = "product_components"
+    __table_args__ = (
+        db.Index("ix_product_components_parent_product_id", "parent_product_id"),
+        db.Index("ix_product_components_component_product_id", "component_product_id"),
+    )
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=uuid7)
     parent_product_id = db.Column(
         db.String(36), db.ForeignKey("products.id"), nullable=True
     )
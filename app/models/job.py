@@ -0,0 +1,37 @@
+from app.database import db
+from app.models.types import uuid7
+
+
+class Job(db.Model):
+    """A unit of slow work queued for ``flask jobs-worker``.
+
+    Workers claim ``queued`` rows whose ``run_at`` has passed and mark them
+    ``running`` with their name in ``locked_by``; ``locked_at`` is the lease,
+    renewed whenever the task reports progress. Payload and result are JSON
+    documents stored as text so the table works the same on SQLite and MySQL.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        db.Index("ix_jobs_status_run_at", "status", "run_at"),
+        db.Index("ix_jobs_status_locked_at", "status", "locked_at"),
+        db.Index("ix_jobs_finished_at", "finished_at"),
+    )
+
+    id = db.Column(db.String(36), primary_key=True, default=uuid7)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    progress = db.Column(db.Integer, nullable=True)
+    progress_total = db.Column(db.Integer, nullable=True)
+    progress_message = db.Column(db.String(255), nullable=True)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    run_at = db.Column(db.DateTime, nullable=False)
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
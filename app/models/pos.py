@@ -1,11 +1,16 @@
-from uuid import uuid4
 from app.database import db
+from app.models.types import BinaryUUID, uuid7
 
 
 class Contact(db.Model):
     __tablename__ = "contacts"
+    __table_args__ = (
+        db.Index("ix_contacts_created_at_id", "created_at", "id"),
+        db.Index("ix_contacts_name_id", "name", "id"),
+        db.Index("ix_contacts_updated_at", "updated_at"),
+    )
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=uuid7)
     name = db.Column(db.String(255), nullable=True)
     email = db.Column(db.String(255), nullable=True)
     phone = db.Column(db.String(50), nullable=True)
@@ -14,8 +19,12 @@ class Contact(db.Model):
     updated_at = db.Column(
         db.DateTime,
         server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
         server_onupdate=db.func.current_timestamp(),
     )
+    # Bumped by every UPDATE. updated_at has one-second resolution, so the API
+    # validators compare this to catch edits made within the same second.
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1", onupdate=db.text("version + 1"))
 
     def __repr__(self):
         return f"<Contact {self.name}>"
@@ -33,35 +42,87 @@ class Contact(db.Model):
 class Warehouse(db.Model):
     __tablename__ = "warehouses"
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=uuid7)
     name = db.Column(db.String(255), nullable=True)
     location = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
     updated_at = db.Column(
         db.DateTime,
         server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
         server_onupdate=db.func.current_timestamp(),
     )
 
 
 class Inventory(db.Model):
     __tablename__ = "inventories"
+    __table_args__ = (
+        db.Index("ix_inventories_warehouse_id_product_id", "warehouse_id", "product_id"),
+        db.Index("ix_inventories_product_id", "product_id"),
+    )
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=uuid7)
     warehouse_id = db.Column(db.String(36), db.ForeignKey("warehouses.id"), nullable=True)
     product_id = db.Column(db.String(36), db.ForeignKey("products.id"), nullable=True)
     quantity = db.Column(db.Numeric(18, 4), nullable=True)
     updated_at = db.Column(
         db.DateTime,
         server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+        server_onupdate=db.func.current_timestamp(),
+    )
+
+
+class ProductStock(db.Model):
+    """Stock on hand per product across all warehouses.
+
+    Denormalized from ``inventories`` and updated in the same transaction as
+    the inventory rows it sums. ``low_stock`` is stored rather than computed
+    so low-stock listings can seek the index instead of scanning.
+    """
+
+    __tablename__ = "product_stock"
+    __table_args__ = (
+        db.Index("ix_product_stock_low_stock_on_hand", "low_stock", "on_hand", "product_id"),
+    )
+
+    product_id = db.Column(db.String(36), db.ForeignKey("products.id"), primary_key=True)
+    on_hand = db.Column(db.Numeric(18, 4), nullable=False, default=0)
+    reorder_level = db.Column(db.Numeric(18, 4), nullable=False, default=0)
+    low_stock = db.Column(db.Boolean, nullable=False, default=True)
+    updated_at = db.Column(
+        db.DateTime,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
         server_onupdate=db.func.current_timestamp(),
     )
 
+    def to_dict(self):
+        return {
+            "product_id": self.product_id,
+            "on_hand": float(self.on_hand) if self.on_hand is not None else None,
+            "reorder_level": float(self.reorder_level) if self.reorder_level is not None else None,
+            "low_stock": self.low_stock,
+        }
+
 
 class Order(db.Model):
     __tablename__ = "orders"
+    __table_args__ = (
+        db.Index("ix_orders_created_at_id", "created_at", "id"),
+        db.Index("ix_orders_total_id", "total", "id"),
+        db.Index("ix_orders_contact_id", "contact_id"),
+        db.Index("ix_orders_updated_at", "updated_at"),
+        db.Index("ix_orders_extra_channel", "extra_channel", "created_at", "id"),
+        db.Index("ix_orders_extra_table_number", "extra_table_number", "created_at", "id"),
+        db.Index("ix_orders_extra_delivery_slot", "extra_delivery_slot", "created_at", "id"),
+    )
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
+    # extra_fields keys extracted by the database into indexed virtual
+    # ``extra_<key>`` columns, so filters on them never parse JSON row by row.
+    DECLARED_EXTRA_FIELDS = ("channel", "table_number", "delivery_slot")
+
+    id = db.Column(BinaryUUID, primary_key=True, default=uuid7)
     contact_id = db.Column(db.String(36), db.ForeignKey("contacts.id"), nullable=True)
     total = db.Column(db.Numeric(18, 4), nullable=True)
     subtotal = db.Column(db.Numeric(18, 4), nullable=True)
@@ -71,13 +132,27 @@ class Order(db.Model):
     payment_status = db.Column(db.String(50), nullable=True)
     payment_method = db.Column(db.String(50), nullable=True)
     type = db.Column(db.String(50), nullable=True)
-    extra_fields = db.Column(db.Text, nullable=True)
+    extra_fields = db.Column(db.JSON, nullable=True)
+    # Deferred: they only serve filters, and loading them would extract the JSON again.
+    extra_channel = db.deferred(
+        db.Column(db.String(50), db.Computed(extra_fields["channel"].as_string(), persisted=False))
+    )
+    extra_table_number = db.deferred(
+        db.Column(db.String(20), db.Computed(extra_fields["table_number"].as_string(), persisted=False))
+    )
+    extra_delivery_slot = db.deferred(
+        db.Column(db.String(50), db.Computed(extra_fields["delivery_slot"].as_string(), persisted=False))
+    )
     created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
     updated_at = db.Column(
         db.DateTime,
         server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
         server_onupdate=db.func.current_timestamp(),
     )
+    # Bumped by every UPDATE. updated_at has one-second resolution, so the API
+    # validators compare this to catch edits made within the same second.
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1", onupdate=db.text("version + 1"))
 
     def __repr__(self):
         return f"<Order {self.id}>"
@@ -98,11 +173,37 @@ class Order(db.Model):
         }
 
 
+class DailySales(db.Model):
+    """Order totals per day, payment method, status and type.
+
+    Maintained incrementally by ``SalesRollupViewModel`` in the same
+    transaction as the orders it sums, so sales summaries never scan
+    ``orders``. Missing dimensions are stored as ``""`` to keep them in the
+    primary key.
+    """
+
+    __tablename__ = "daily_sales"
+
+    day = db.Column(db.Date, primary_key=True)
+    payment_method = db.Column(db.String(50), primary_key=True, default="")
+    status = db.Column(db.String(50), primary_key=True, default="")
+    type = db.Column(db.String(50), primary_key=True, default="")
+    orders = db.Column(db.Integer, nullable=False, default=0)
+    subtotal = db.Column(db.Numeric(18, 4), nullable=False, default=0)
+    tax = db.Column(db.Numeric(18, 4), nullable=False, default=0)
+    discount = db.Column(db.Numeric(18, 4), nullable=False, default=0)
+    total = db.Column(db.Numeric(18, 4), nullable=False, default=0)
+
+
 class OrderItem(db.Model):
     __tablename__ = "order_items"
+    __table_args__ = (
+        db.Index("ix_order_items_order_id", "order_id"),
+        db.Index("ix_order_items_product_id", "product_id"),
+    )
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
-    order_id = db.Column(db.String(36), db.ForeignKey("orders.id"), nullable=True)
+    id = db.Column(BinaryUUID, primary_key=True, default=uuid7)
+    order_id = db.Column(BinaryUUID, db.ForeignKey("orders.id"), nullable=True)
     product_id = db.Column(db.String(36), db.ForeignKey("products.id"), nullable=True)
     quantity = db.Column(db.Integer, nullable=True)
     price = db.Column(db.Numeric(18, 4), nullable=True)
@@ -112,26 +213,64 @@ class OrderItem(db.Model):
 class BillAccount(db.Model):
     __tablename__ = "bill_accounts"
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=uuid7)
     name = db.Column(db.String(255), nullable=True)
     type = db.Column(db.String(50), nullable=True)
+    # Balance as of the latest snapshot; add the unsnapshotted movements for
+    # the current balance (see LedgerViewModel).
     balance = db.Column(db.Numeric(18, 4), nullable=True)
     created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
     updated_at = db.Column(
         db.DateTime,
         server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
         server_onupdate=db.func.current_timestamp(),
     )
 
 
+class BillAccountSnapshot(db.Model):
+    """A bill account's balance after folding in a run of ledger movements.
+
+    Snapshots are numbered per account; ``delta`` and ``movements`` describe
+    the ``order_bill_accounts`` rows stamped with the snapshot's id.
+    """
+
+    __tablename__ = "bill_account_snapshots"
+    __table_args__ = (
+        db.Index("ux_bill_account_snapshots_account_sequence", "bill_account_id", "sequence", unique=True),
+    )
+
+    id = db.Column(db.String(36), primary_key=True, default=uuid7)
+    bill_account_id = db.Column(db.String(36), db.ForeignKey("bill_accounts.id"), nullable=False)
+    sequence = db.Column(db.Integer, nullable=False)
+    balance = db.Column(db.Numeric(18, 4), nullable=False)
+    delta = db.Column(db.Numeric(18, 4), nullable=False)
+    movements = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+
+
 class OrderBillAccount(db.Model):
+    """Append-only ledger of signed bill account movements.
+
+    Rows are never updated once posted, except to stamp ``snapshot_id`` when
+    a snapshot folds them into the account balance.
+    """
+
     __tablename__ = "order_bill_accounts"
+    __table_args__ = (
+        db.Index("ix_order_bill_accounts_order_id", "order_id"),
+        db.Index("ix_order_bill_accounts_account_snapshot", "bill_account_id", "snapshot_id", "amount"),
+        db.Index("ix_order_bill_accounts_snapshot_id", "snapshot_id"),
+    )
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
-    order_id = db.Column(db.String(36), db.ForeignKey("orders.id"), nullable=True)
+    id = db.Column(BinaryUUID, primary_key=True, default=uuid7)
+    order_id = db.Column(BinaryUUID, db.ForeignKey("orders.id"), nullable=True)
     bill_account_id = db.Column(
         db.String(36), db.ForeignKey("bill_accounts.id"), nullable=True
     )
     amount = db.Column(db.Numeric(18, 4), nullable=True)
     movement_type = db.Column(db.String(20), nullable=True)
+    snapshot_id = db.Column(
+        db.String(36), db.ForeignKey("bill_account_snapshots.id"), nullable=True
+    )
     created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
@@ -0,0 +1,150 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from flask import current_app, jsonify, request
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+from app.database import db
+from app.replicas import replica_keys, replica_monitor
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how long checkouts take and how often they time out.
+
+    The time covers waiting for a free connection, opening a new one and the
+    pre-ping, i.e. everything a request spends before its first query.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeout:
+            with self._metrics_lock:
+                self.timeouts += 1
+            raise
+        waited_ms = (time.perf_counter() - started) * 1000
+        with self._metrics_lock:
+            self.checkouts += 1
+            self.wait_ms_total += waited_ms
+            self.wait_ms_max = max(self.wait_ms_max, waited_ms)
+        return connection
+
+
+def pool_options(pool_size, max_overflow, pool_timeout, pool_recycle=-1, pre_ping=True, connect_args=None):
+    """``SQLALCHEMY_ENGINE_OPTIONS`` for a metered queue pool"""
+    options = {
+        "poolclass": MeteredQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pre_ping,
+    }
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def pool_stats(engine):
+    pool = engine.pool
+    stats = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # Negative while the pool has not opened all of its pool_size connections yet.
+            overflow=max(pool.overflow(), 0),
+            timeout_seconds=pool.timeout(),
+        )
+    if isinstance(pool, MeteredQueuePool):
+        with pool._metrics_lock:
+            stats.update(
+                checkouts=pool.checkouts,
+                timeouts=pool.timeouts,
+                wait_ms_avg=round(pool.wait_ms_total / pool.checkouts, 3) if pool.checkouts else None,
+                wait_ms_max=round(pool.wait_ms_max, 3),
+            )
+    return stats
+
+
+# Pings run in their own threads so /ready answers within READY_TIMEOUT even
+# when the pool or the server hangs. A ping still running is waited on again
+# rather than joined by a new one, so a stuck database cannot pile them up.
+_ping_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ready-ping")
+_pings = {}
+_pings_lock = threading.Lock()
+
+
+def _ping(engine):
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return (time.perf_counter() - started) * 1000
+
+
+def check_connection(engine, timeout):
+    """Check out a pooled connection and run ``SELECT 1``, waiting at most ``timeout`` seconds"""
+    with _pings_lock:
+        future = _pings.get(engine)
+        if future is None or future.done():
+            future = _pings[engine] = _ping_executor.submit(_ping, engine)
+    try:
+        latency_ms = future.result(timeout=timeout)
+    except FutureTimeout:
+        return {"ok": False, "error": f"no connection within {timeout:g}s"}
+    except SQLAlchemyError as error:
+        return {"ok": False, "error": str(getattr(error, "orig", None) or error)}
+    return {"ok": True, "latency_ms": round(latency_ms, 2)}
+
+
+def readiness():
+    """Connection check and pool stats of every engine, and whether to take traffic.
+
+    Only the primary decides readiness: reads fall back to it when a
+    replica is down, so a failing replica is reported but not fatal.
+    """
+    timeout = current_app.config.get("READY_TIMEOUT", 2)
+    databases = {"primary": dict(check_connection(db.engine, timeout), pool=pool_stats(db.engine))}
+    for key in replica_keys(current_app):
+        engine = db.engines[key]
+        databases[key] = dict(
+            check_connection(engine, timeout), pool=pool_stats(engine), replication=replica_monitor.state(engine)
+        )
+    ready = databases["primary"]["ok"]
+    return {"status": "ready" if ready else "unavailable", "databases": databases}, ready
+
+
+def _pool_exhausted(error):
+    rule = request.url_rule
+    current_app.logger.warning(
+        "Connection pool exhausted on %s %s: %s", request.method, rule.rule if rule else request.path, error
+    )
+    response = jsonify({"error": "The database is busy, please retry shortly"})
+    response.status_code = 503
+    response.headers["Retry-After"] = "1"
+    return response
+
+
+def init_pool(app):
+    """Answer requests that time out waiting for a pooled connection with ``503``.
+
+    ``pool_timeout`` bounds the wait, so an exhausted pool sheds load with a
+    ``Retry-After`` instead of hanging workers. The timeouts are counted in
+    the pool stats reported by ``/ready``.
+    """
+    app.register_error_handler(PoolTimeout, _pool_exhausted)
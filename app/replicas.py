@@ -0,0 +1,203 @@
+import functools
+import random
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, OperationalError, ProgrammingError
+
+from app.database import db
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+REPLICA_BIND_PREFIX = "replica"
+# MySQL 8.0.22+ first, then the name older servers know.
+_MYSQL_LAG = (
+    ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+    ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+)
+
+
+def replica_keys(app):
+    """``SQLALCHEMY_BINDS`` keys that name read replicas of the primary"""
+    binds = app.config.get("SQLALCHEMY_BINDS") or {}
+    return sorted(key for key in binds if key and key.startswith(REPLICA_BIND_PREFIX))
+
+
+class ReplicaMonitor:
+    """Replication lag of each replica engine, probed at most once per interval.
+
+    One thread probes while the others keep using the last reading, so a
+    slow replica never stalls every request at once. Unreachable replicas
+    count as infinitely behind until a later probe succeeds.
+    """
+
+    def __init__(self):
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def lag(self, engine, interval, query=None):
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.setdefault(engine, [float("-inf"), None])
+            if now - state[0] < interval:
+                return state[1]
+            state[0] = now
+        lag = _probe(engine, query)
+        with self._lock:
+            state[1] = lag
+        return lag
+
+    def mark_down(self, engine):
+        with self._lock:
+            self._state[engine] = [time.monotonic(), float("inf")]
+
+    def state(self, engine):
+        """Last probe of ``engine``: whether it was usable, its lag and how long ago it ran"""
+        with self._lock:
+            checked_at, lag = self._state.get(engine, (None, None))
+        return {
+            "available": lag is not None and lag != float("inf"),
+            "lag_seconds": lag if lag != float("inf") else None,
+            "checked_seconds_ago": round(time.monotonic() - checked_at, 1) if lag is not None else None,
+        }
+
+
+replica_monitor = ReplicaMonitor()
+
+
+def _probe(engine, query=None):
+    try:
+        with engine.connect() as connection:
+            if query:
+                lag = connection.execute(text(query)).scalar()
+                return float(lag) if lag is not None else float("inf")
+            if engine.dialect.name == "mysql":
+                return _mysql_lag(connection)
+            connection.execute(text("SELECT 1"))
+            return 0.0
+    except DBAPIError as error:
+        current_app.logger.warning("Replica %s unavailable: %s", engine.url, error.orig)
+        return float("inf")
+
+
+def _mysql_lag(connection):
+    for statement, column in _MYSQL_LAG:
+        try:
+            row = connection.execute(text(statement)).mappings().first()
+        except ProgrammingError:
+            continue
+        if row is None:
+            # Not replicating from anything, so it cannot fall behind.
+            return 0.0
+        # NULL means the replication threads are stopped.
+        return float(row[column]) if row[column] is not None else float("inf")
+    return float("inf")
+
+
+def _sticky():
+    """Whether this client wrote recently enough that it must read from the primary"""
+    try:
+        until = float(request.cookies.get(current_app.config["REPLICA_STICKY_COOKIE"], 0))
+    except ValueError:
+        return False
+    return until > time.time()
+
+
+def _choose_replica():
+    config = current_app.config
+    if request.method not in SAFE_METHODS or _sticky():
+        return None
+    max_lag = config.get("REPLICA_MAX_LAG_SECONDS", 5)
+    healthy = []
+    for key in replica_keys(current_app):
+        engine = db.engines[key]
+        lag = replica_monitor.lag(
+            engine, config.get("REPLICA_CHECK_INTERVAL", 5), config.get("REPLICA_LAG_QUERY")
+        )
+        if lag is not None and lag <= max_lag:
+            healthy.append(engine)
+    return random.choice(healthy) if healthy else None
+
+
+def read_only(func):
+    """Run a view-model read on a replica when the current request may use one.
+
+    Only safe requests from clients without a recent write are routed, and
+    the replica is picked once per request so every read in it sees the
+    same snapshot. When no replica is within ``REPLICA_MAX_LAG_SECONDS``,
+    or a replica query fails, the read runs on the primary. Outside a
+    request (CLI, jobs) it always runs on the primary.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not has_request_context():
+            return func(*args, **kwargs)
+        if "db_replica" not in g:
+            g.db_replica = _choose_replica()
+        session = db.session()
+        if g.db_replica is None or session.info.get("replica") is not None:
+            return func(*args, **kwargs)
+
+        session.info["replica"] = g.db_replica
+        try:
+            return func(*args, **kwargs)
+        except OperationalError as error:
+            current_app.logger.warning("Replica read failed, retrying on the primary: %s", error.orig)
+            replica_monitor.mark_down(g.db_replica)
+            g.db_replica = None
+        finally:
+            session.info.pop("replica", None)
+        session.rollback()
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def on_primary(func):
+    """Always run ``func`` on the primary, even inside a ``read_only`` call.
+
+    For loaders of process-wide caches: a lagging read would be served to
+    every client for the cache TTL, long after the replica caught up.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        session = db.session()
+        replica = session.info.pop("replica", None)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if replica is not None:
+                session.info["replica"] = replica
+
+    return wrapper
+
+
+def _stick_to_primary(response):
+    config = current_app.config
+    window = config.get("REPLICA_STICKY_SECONDS", 10)
+    if request.method in SAFE_METHODS or response.status_code >= 400 or not window:
+        return response
+    response.set_cookie(
+        config["REPLICA_STICKY_COOKIE"],
+        f"{time.time() + window:.3f}",
+        max_age=window,
+        httponly=True,
+        samesite="Lax",
+        secure=request.is_secure,
+    )
+    return response
+
+
+def init_replicas(app):
+    """Route ``read_only`` view-model reads of GET requests to read replicas.
+
+    Every ``SQLALCHEMY_BINDS`` key starting with ``replica`` is a replica of
+    the primary. A successful write request marks its client with a cookie
+    so its reads stay on the primary for ``REPLICA_STICKY_SECONDS`` and it
+    sees its own writes. Without replica binds nothing is registered.
+    """
+    if replica_keys(app):
+        app.after_request(_stick_to_primary)
@@ -0,0 +1,48 @@
+from flask import Blueprint
+from app.lazy import lazy
+from app.models.inventory.product import Product
+from app.models.pos import Contact, Order
+
+# View and view model code loads on the first API request, not at app start-up.
+ApiView = lazy("app.views.api.main:ApiView")
+get_products_page = lazy("app.view_model.product.main:ProductViewModel.get_products_page")
+get_products_page_state = lazy("app.view_model.product.main:ProductViewModel.get_products_page_state")
+get_product_by_id = lazy("app.view_model.product.main:ProductViewModel.get_product_by_id")
+get_contacts_page = lazy("app.view_model.contact.main:ContactViewModel.get_contacts_page")
+get_contacts_page_state = lazy("app.view_model.contact.main:ContactViewModel.get_contacts_page_state")
+get_contact_by_id = lazy("app.view_model.contact.main:ContactViewModel.get_contact_by_id")
+get_orders_page = lazy("app.view_model.order.main:OrderViewModel.get_orders_page")
+get_orders_page_state = lazy("app.view_model.order.main:OrderViewModel.get_orders_page_state")
+get_order_by_id = lazy("app.view_model.order.main:OrderViewModel.get_order_by_id")
+
+api_bp = Blueprint("api", __name__, url_prefix="/api/v1")
+
+
+@api_bp.route("/products", methods=["GET"])
+def products():
+    return ApiView().render_list(Product, get_products_page, get_products_page_state)
+
+
+@api_bp.route("/products/<string:product_id>", methods=["GET"])
+def product(product_id):
+    return ApiView().render_detail(Product, product_id, get_product_by_id)
+
+
+@api_bp.route("/contacts", methods=["GET"])
+def contacts():
+    return ApiView().render_list(Contact, get_contacts_page, get_contacts_page_state)
+
+
+@api_bp.route("/contacts/<string:contact_id>", methods=["GET"])
+def contact(contact_id):
+    return ApiView().render_detail(Contact, contact_id, get_contact_by_id)
+
+
+@api_bp.route("/orders", methods=["GET"])
+def orders():
+    return ApiView().render_list(Order, get_orders_page, get_orders_page_state, filters=Order.DECLARED_EXTRA_FIELDS)
+
+
+@api_bp.route("/orders/<string:order_id>", methods=["GET"])
+def order(order_id):
+    return ApiView().render_detail(Order, order_id, get_order_by_id)
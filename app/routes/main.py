@@ -1,11 +1,24 @@
-from flask import Blueprint, jsonify, render_template, request, redirect, url_for
-from app.views.main import MainView
-from app.views.inventory.main import InventoryView
-from app.views.inventory.product_detail import ProductDetailView
-from app.views.inventory.product_list import ProductListView
-from app.views.pos.main import PosView
-from app.views.pos.contact_list import ContactListView
-from app.views.pos.order_list import OrderListView
+from flask import Blueprint, current_app, jsonify, render_template, request, redirect, url_for
+from app.cache import cache_stats
+from app.pool import readiness
+from app.lazy import lazy
+
+# Views load on first use, keeping them out of app start-up.
+MainView = lazy("app.views.main:MainView")
+InventoryView = lazy("app.views.inventory.main:InventoryView")
+ProductDetailView = lazy("app.views.inventory.product_detail:ProductDetailView")
+ProductBomView = lazy("app.views.inventory.product_bom:ProductBomView")
+ProductListView = lazy("app.views.inventory.product_list:ProductListView")
+ProductImportView = lazy("app.views.inventory.product_import:ProductImportView")
+ProductSearchView = lazy("app.views.inventory.product_search:ProductSearchView")
+LowStockView = lazy("app.views.inventory.low_stock:LowStockView")
+PosView = lazy("app.views.pos.main:PosView")
+ContactListView = lazy("app.views.pos.contact_list:ContactListView")
+OrderListView = lazy("app.views.pos.order_list:OrderListView")
+OrderExportView = lazy("app.views.pos.order_export:OrderExportView")
+CheckoutView = lazy("app.views.pos.checkout:CheckoutView")
+BillAccountBalanceView = lazy("app.views.pos.bill_account_balance:BillAccountBalanceView")
+JobView = lazy("app.views.jobs.main:JobView")
 
 main_bp = Blueprint("main", __name__)
 
@@ -20,6 +33,24 @@ def products_list():
     return ProductListView().render()
 
 
+@main_bp.route("/products/search", methods=["GET"])
+def products_search():
+    return ProductSearchView().render()
+
+
+@main_bp.route("/categories/tree", methods=["GET"])
+def category_tree():
+    """Nested category tree, served pre-serialized from the taxonomy cache"""
+    return current_app.response_class(
+        InventoryView().get_category_tree_json(), mimetype="application/json"
+    )
+
+
+@main_bp.route("/products/low-stock", methods=["GET"])
+def products_low_stock():
+    return LowStockView().render()
+
+
 @main_bp.route("/contacts", methods=["GET"])
 def contacts_list():
     return ContactListView().render()
@@ -30,18 +61,61 @@ def orders_list():
     return OrderListView().render()
 
 
+@main_bp.route("/orders/export.csv", methods=["GET"])
+def orders_export_csv():
+    return OrderExportView().render_csv()
+
+
+@main_bp.route("/orders/export.ndjson", methods=["GET"])
+def orders_export_ndjson():
+    return OrderExportView().render_ndjson()
+
+
+@main_bp.route("/jobs", methods=["POST"])
+def job_create():
+    return JobView().create()
+
+
+@main_bp.route("/jobs/<string:job_id>", methods=["GET"])
+def job_status(job_id):
+    return JobView().render(job_id)
+
+
+@main_bp.route("/jobs/<string:job_id>/download", methods=["GET"])
+def job_download(job_id):
+    return JobView().render_download(job_id)
+
+
 @main_bp.route("/health", methods=["GET"])
 def health():
     """Health check for load balancers"""
     return jsonify({"status": "healthy"}), 200
 
 
+@main_bp.route("/ready", methods=["GET"])
+def ready():
+    """Readiness: a pooled connection to the primary answers within READY_TIMEOUT"""
+    report, is_ready = readiness()
+    return jsonify(report), 200 if is_ready else 503
+
+
+@main_bp.route("/metrics/cache", methods=["GET"])
+def cache_metrics():
+    """Hit/miss counters of the process-local caches"""
+    return jsonify(cache_stats()), 200
+
+
 # Ruta detalle de producto
 @main_bp.route("/product/<string:product_id>")
 def product_detail(product_id):
     return ProductDetailView().render(product_id)
 
 
+@main_bp.route("/product/<string:product_id>/bom", methods=["GET"])
+def product_bom(product_id):
+    return ProductBomView().render(product_id)
+
+
 @main_bp.route("/product/new/product", methods=["GET", "POST"])
 def new_product():
     inventory_view = InventoryView()
@@ -64,6 +138,11 @@ def new_product():
     return render_template("products/new-product.html", categories=categories)
 
 
+@main_bp.route("/products/import", methods=["GET", "POST"])
+def import_products():
+    return ProductImportView().render()
+
+
 @main_bp.route("/contact/new", methods=["GET", "POST"])
 def new_contact():
     if request.method == "POST":
@@ -88,6 +167,16 @@ def new_order():
     return render_template("orders/new-order.html")
 
 
+@main_bp.route("/orders/checkout", methods=["POST"])
+def checkout():
+    return CheckoutView().render()
+
+
+@main_bp.route("/bill-account/<string:bill_account_id>/balance", methods=["GET"])
+def bill_account_balance(bill_account_id):
+    return BillAccountBalanceView().render(bill_account_id)
+
+
 @main_bp.route("/product/<string:product_id>/edit", methods=["GET", "POST"])
 def edit_product(product_id):
     inventory_view = InventoryView()
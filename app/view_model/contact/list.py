@@ -5,5 +5,5 @@ class ContactListViewModel:
     def __init__(self):
         self.contact_service = ContactViewModel()
 
-    def get_contacts_table_data(self):
-        return self.contact_service.list_contacts()
+    def get_contacts_table_data(self, cursor=None, limit=None, sort=None, direction=None):
+        return self.contact_service.list_contacts(cursor, limit, sort, direction)
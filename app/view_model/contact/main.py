@@ -1,17 +1,54 @@
 from app.database import db
 from app.models.pos import Contact
+from app.replicas import read_only
+from app.view_model.freshness import FreshnessViewModel
+from app.view_model.pagination import KeysetPaginator
+from app.view_model.read_model import ReadModel
+
+contact_paginator = KeysetPaginator(Contact, sortable=("created_at", "name"))
+contact_list_rows = ReadModel(
+    "ContactListRow",
+    Contact.id,
+    Contact.name,
+    Contact.email,
+    Contact.phone,
+    Contact.address,
+    Contact.created_at,
+)
 
 
 class ContactViewModel:
     @staticmethod
-    def list_contacts():
-        return ContactViewModel.get_all_contacts()
+    @read_only
+    def list_contacts(cursor=None, limit=None, sort=None, direction=None):
+        page = contact_paginator.paginate(contact_list_rows.query(), cursor, limit, sort, direction)
+        page["items"] = contact_list_rows.rows(page["items"])
+        return page
 
     @staticmethod
+    @read_only
     def get_all_contacts():
         contacts = Contact.query.all()
         return [contact.to_dict() for contact in contacts]
 
+    @staticmethod
+    @read_only
+    def get_contacts_page(cursor=None, limit=None, sort=None, direction=None):
+        page = contact_paginator.paginate(Contact.query, cursor, limit, sort, direction)
+        page["items"] = [contact.to_dict() for contact in page["items"]]
+        return page
+
+    @staticmethod
+    def get_contacts_page_state(cursor=None, limit=None, sort=None, direction=None):
+        """Validator state of the page ``get_contacts_page`` returns for the same arguments"""
+        return FreshnessViewModel.page_state(contact_paginator, Contact.query, cursor, limit, sort, direction)
+
+    @staticmethod
+    @read_only
+    def get_contact_by_id(contact_id):
+        contact = Contact.query.get(contact_id)
+        return contact.to_dict() if contact else None
+
     @staticmethod
     def create_contact(form_data):
         name = form_data.get("name", "").strip()
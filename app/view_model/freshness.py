@@ -0,0 +1,40 @@
+import hashlib
+
+from app.database import db
+from app.replicas import read_only
+
+
+class FreshnessViewModel:
+    """Cheap validators (ETag, Last-Modified) for API resources.
+
+    A list page's state is the ``(id, version)`` of the rows it would show,
+    read with the page's own keyset seek, so a poll that ends in 304 reads a
+    page of keys and never serializes anything. ``version`` is bumped by
+    every UPDATE, which ``updated_at`` (one-second resolution) is not, and a
+    delete or insert changes the ids the page holds.
+    """
+
+    @staticmethod
+    @read_only
+    def page_state(paginator, query, cursor=None, limit=None, sort=None, direction=None):
+        """Return ``(state, last_modified)`` for the page ``paginator`` would cut from ``query``"""
+        model = paginator.model
+        page = paginator.paginate(
+            query.with_entities(model.id, model.version, model.updated_at), cursor, limit, sort, direction
+        )
+        state = [(object_id, version) for object_id, version, _ in page["items"]]
+        state += [page["next_cursor"], page["prev_cursor"]]
+        last_modified = max((updated_at for _, _, updated_at in page["items"] if updated_at), default=None)
+        return state, last_modified
+
+    @staticmethod
+    @read_only
+    def row_state(model, object_id):
+        """Return ``(exists, version, updated_at)`` for a single row"""
+        row = db.session.query(model.version, model.updated_at).filter(model.id == object_id).first()
+        return (row is not None), (row.version if row else None), (row.updated_at if row else None)
+
+    @staticmethod
+    def etag(*parts):
+        raw = "|".join("" if part is None else str(part) for part in parts)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
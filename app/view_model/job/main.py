@@ -0,0 +1,315 @@
+import glob
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import bindparam, delete, select, update
+
+from app.database import db
+from app.models.job import Job
+from app.models.types import uuid7
+from app.view_model.job.tasks import TASKS
+
+FINISHED = ("succeeded", "failed")
+# Retries back off exponentially from JOB_RETRY_DELAY, but never wait longer than this.
+MAX_RETRY_DELAY = 3600
+
+_jobs = Job.__table__
+# Built once: statements rebuilt per call miss SQLAlchemy's compiled cache.
+_CLAIM = (
+    update(_jobs)
+    .where(_jobs.c.id == bindparam("job_id"), _jobs.c.status == "queued")
+    .values(
+        status="running",
+        attempts=_jobs.c.attempts + 1,
+        locked_by=bindparam("worker"),
+        locked_at=bindparam("now"),
+        started_at=bindparam("now"),
+    )
+)
+
+
+def _owned(job_id, worker):
+    # Every write by a worker is fenced on its lease, so a worker whose job
+    # was requeued after its lease expired cannot overwrite the new run.
+    return update(_jobs).where(
+        _jobs.c.id == job_id, _jobs.c.status == "running", _jobs.c.locked_by == worker
+    )
+
+
+def _now():
+    # Job timestamps come from the application clock on both sides of every
+    # comparison, so workers and the database may sit in different time zones.
+    return datetime.utcnow()
+
+
+def _isoformat(value):
+    return value.isoformat(sep=" ") if value else None
+
+
+class JobLeaseLost(RuntimeError):
+    """The job was requeued or finished by someone else while this worker ran it"""
+
+
+class JobNotReadyError(ValueError):
+    pass
+
+
+class JobContext:
+    """What a running task sees of its job: id, output files and progress.
+
+    ``progress`` is throttled to one write per ``JOB_PROGRESS_INTERVAL``
+    seconds and renews the worker's lease; the last value reported is
+    always stored with the result. Writes commit on their own connection,
+    so pollers see them while the task's transaction is still open. SQLite
+    allows a single writer, and a progress write there would hold the
+    database for the rest of the task, so on SQLite progress is only
+    stored with the result.
+    """
+
+    def __init__(self, job_id, worker, attempt):
+        self.id = job_id
+        self.worker = worker
+        self.attempt = attempt
+        self._interval = current_app.config.get("JOB_PROGRESS_INTERVAL", 1.0)
+        self._reported = 0.0
+        self.latest = None
+
+    def path(self, name):
+        """Absolute path of a file this job owns in the job output directory"""
+        if not name or os.path.basename(name) != name or not name.startswith(self.id):
+            raise ValueError("Invalid job file name")
+        return os.path.join(JobViewModel.output_dir(), name)
+
+    def progress(self, done, total=None, message=None, force=False):
+        self.latest = {
+            "progress": done,
+            "progress_total": total,
+            "progress_message": (message or "")[:255] or None,
+        }
+        now = time.monotonic()
+        if db.engine.dialect.name == "sqlite" or (not force and now - self._reported < self._interval):
+            return
+        self._reported = now
+        with db.engine.begin() as connection:
+            updated = connection.execute(
+                _owned(self.id, self.worker).values(locked_at=_now(), **self.latest)
+            ).rowcount
+        if not updated:
+            raise JobLeaseLost(f"Job {self.id} is no longer held by {self.worker}")
+
+
+class JobViewModel:
+    """Background jobs kept in the ``jobs`` table; no broker involved.
+
+    ``enqueue`` inserts a ``queued`` row and returns at once. Workers
+    (``flask jobs-worker``) claim rows with a conditional UPDATE that only
+    one of them can win, which behaves the same on SQLite and MySQL, run
+    the registered task and record its result. Failed attempts are retried
+    with exponential backoff; a worker that dies mid-job loses its lease
+    after ``JOB_LEASE_SECONDS`` and the job is queued again.
+    """
+
+    @staticmethod
+    def enqueue(kind, payload=None, upload=None, public=False):
+        """Queue a job; ``upload`` is a binary stream saved for the task to read"""
+        task = TASKS.get(kind)
+        if task is None or (public and not task["public"]):
+            raise ValueError(f"Unknown job kind: {kind}")
+        payload = dict(payload or {})
+        job_id = uuid7()
+        if upload is not None:
+            payload["upload"] = f"{job_id}.upload"
+            with open(os.path.join(JobViewModel.output_dir(), payload["upload"]), "wb") as handle:
+                while True:
+                    block = upload.read(1024 * 1024)
+                    if not block:
+                        break
+                    handle.write(block)
+
+        now = _now()
+        job = Job(
+            id=job_id,
+            kind=kind,
+            payload=json.dumps(payload),
+            status="queued",
+            attempts=0,
+            max_attempts=task["max_attempts"],
+            run_at=now,
+            created_at=now,
+        )
+        db.session.add(job)
+        db.session.commit()
+        return JobViewModel._to_dict(job)
+
+    @staticmethod
+    def get_job(job_id):
+        job = db.session.get(Job, job_id)
+        if job is None:
+            raise ValueError("Job not found")
+        return JobViewModel._to_dict(job)
+
+    @staticmethod
+    def get_download(job_id):
+        """``(path, filename, mimetype)`` of a finished job's output file"""
+        job = JobViewModel.get_job(job_id)
+        result = job["result"] if isinstance(job["result"], dict) else {}
+        if "file" not in result:
+            if job["status"] in FINISHED:
+                raise ValueError("Job has no output file")
+            raise JobNotReadyError("Job has not finished yet")
+        path = os.path.join(JobViewModel.output_dir(), os.path.basename(result["file"]))
+        if not os.path.exists(path):
+            raise ValueError("Job output file has expired")
+        return path, result.get("filename") or result["file"], result.get("mimetype")
+
+    @staticmethod
+    def _to_dict(job):
+        total = job.progress_total
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "payload": json.loads(job.payload) if job.payload else {},
+            "attempts": job.attempts,
+            "max_attempts": job.max_attempts,
+            "progress": {
+                "done": job.progress,
+                "total": total,
+                "percent": round(100 * (job.progress or 0) / total, 1) if total else None,
+                "message": job.progress_message,
+            },
+            "result": json.loads(job.result) if job.result else None,
+            "error": job.error,
+            "created_at": _isoformat(job.created_at),
+            "run_at": _isoformat(job.run_at),
+            "started_at": _isoformat(job.started_at),
+            "finished_at": _isoformat(job.finished_at),
+        }
+
+    @staticmethod
+    def output_dir():
+        path = current_app.config.get("JOB_OUTPUT_DIR") or os.path.join(current_app.instance_path, "jobs")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @staticmethod
+    def due(now=None, limit=10):
+        """Ids of queued jobs whose ``run_at`` has passed, oldest first"""
+        return db.session.scalars(
+            select(Job.id)
+            .where(Job.status == "queued", Job.run_at <= (now or _now()))
+            .order_by(Job.run_at)
+            .limit(limit)
+        ).all()
+
+    @staticmethod
+    def claim(worker, candidates=10):
+        """Take the oldest due job for ``worker``; returns the ``Job`` or ``None``"""
+        now = _now()
+        # Several workers may read the same candidates; the status check in
+        # the UPDATE lets exactly one of them win each row.
+        for job_id in JobViewModel.due(now, candidates):
+            claimed = db.session.execute(_CLAIM, {"job_id": job_id, "worker": worker, "now": now}).rowcount
+            db.session.commit()
+            if claimed:
+                return db.session.get(Job, job_id, populate_existing=True)
+        return None
+
+    @staticmethod
+    def run_next(worker):
+        """Claim and run one job; returns ``False`` when none was due"""
+        job = JobViewModel.claim(worker)
+        if job is None:
+            return False
+        job_id, kind, attempts, max_attempts = job.id, job.kind, job.attempts, job.max_attempts
+        payload = json.loads(job.payload) if job.payload else {}
+        context = JobContext(job_id, worker, attempts)
+        try:
+            task = TASKS.get(kind)
+            if task is None:
+                raise ValueError(f"Unknown job kind: {kind}")
+            result = task["run"](payload, context)
+        except JobLeaseLost:
+            db.session.rollback()
+            current_app.logger.warning("Job %s lost its lease while running on %s", job_id, worker)
+            return True
+        except Exception as e:
+            db.session.rollback()
+            permanent = isinstance(e, ValueError) or attempts >= max_attempts
+            if not permanent:
+                current_app.logger.exception("Job %s (%s) attempt %s failed", job_id, kind, attempts)
+            JobViewModel._fail(job_id, worker, attempts, str(e) or type(e).__name__, permanent)
+            return True
+
+        db.session.execute(
+            _owned(job_id, worker).values(
+                status="succeeded",
+                result=json.dumps(result, default=str),
+                error=None,
+                finished_at=_now(),
+                **(context.latest or {}),
+            )
+        )
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def _fail(job_id, worker, attempts, error, permanent):
+        now = _now()
+        if permanent:
+            values = {"status": "failed", "finished_at": now}
+        else:
+            delay = current_app.config.get("JOB_RETRY_DELAY", 30) * 2 ** (attempts - 1)
+            values = {
+                "status": "queued",
+                "run_at": now + timedelta(seconds=min(delay, MAX_RETRY_DELAY)),
+                "locked_by": None,
+                "locked_at": None,
+            }
+        db.session.execute(_owned(job_id, worker).values(error=error, **values))
+        db.session.commit()
+
+    @staticmethod
+    def requeue_expired(alive=()):
+        """Queue again (or fail, when out of attempts) jobs whose worker stopped renewing its lease.
+
+        ``alive`` names workers known to be running, whose jobs are left alone.
+        """
+        now = _now()
+        cutoff = now - timedelta(seconds=current_app.config.get("JOB_LEASE_SECONDS", 900))
+        expired = (_jobs.c.status == "running", _jobs.c.locked_at < cutoff, _jobs.c.locked_by.not_in(alive))
+        failed = db.session.execute(
+            update(_jobs)
+            .where(*expired, _jobs.c.attempts >= _jobs.c.max_attempts)
+            .values(status="failed", error="Worker lease expired", finished_at=now)
+        ).rowcount
+        requeued = db.session.execute(
+            update(_jobs)
+            .where(*expired)
+            .values(status="queued", error="Worker lease expired", run_at=now, locked_by=None, locked_at=None)
+        ).rowcount
+        db.session.commit()
+        return {"requeued": requeued, "failed": failed}
+
+    @staticmethod
+    def purge(days=None, batch_size=1000):
+        """Delete jobs finished more than ``days`` ago, with their files"""
+        days = days if days is not None else current_app.config.get("JOB_RETENTION_DAYS", 7)
+        cutoff = _now() - timedelta(days=days)
+        directory = JobViewModel.output_dir()
+        purged = 0
+        while True:
+            job_ids = db.session.scalars(
+                select(Job.id).where(Job.finished_at < cutoff, Job.status.in_(FINISHED)).limit(batch_size)
+            ).all()
+            if not job_ids:
+                return purged
+            db.session.execute(delete(_jobs).where(_jobs.c.id.in_(job_ids)))
+            db.session.commit()
+            purged += len(job_ids)
+            for job_id in job_ids:
+                for path in glob.glob(os.path.join(directory, glob.escape(job_id) + ".*")):
+                    os.remove(path)
@@ -0,0 +1,122 @@
+import os
+
+from app.view_model.order.export import OrderExportViewModel
+from app.view_model.order.ledger import LedgerViewModel
+from app.view_model.order.pricing import PricingEngine
+from app.view_model.order.rollup import SalesRollupViewModel
+from app.view_model.product.importer import ProductImportViewModel
+from app.view_model.product.stock import StockViewModel
+from app.view_model.product.taxonomy import TaxonomyViewModel
+
+# kind -> {"run": callable(payload, job), "max_attempts": int, "public": bool}
+TASKS = {}
+
+EXPORT_FORMATS = {
+    "csv": (OrderExportViewModel.iter_csv, "text/csv"),
+    "ndjson": (OrderExportViewModel.iter_ndjson, "application/x-ndjson"),
+}
+# Import reports keep the first errors only; the job row is not a log.
+MAX_REPORTED_ERRORS = 100
+
+
+def task(kind, max_attempts=3, public=False):
+    """Register a job kind.
+
+    The function receives the job payload and a ``JobContext`` and returns
+    a JSON-serializable result. Raising ``ValueError`` fails the job for
+    good; any other exception is retried up to ``max_attempts`` times, so
+    tasks that commit partial work must be safe to run again. ``public``
+    kinds may be queued over HTTP with a client-supplied payload.
+    """
+    def register(function):
+        TASKS[kind] = {"run": function, "max_attempts": max_attempts, "public": public}
+        return function
+    return register
+
+
+def _int(payload, key, default):
+    try:
+        return int(payload.get(key) or default)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a whole number")
+
+
+@task("import-products", max_attempts=1)
+def import_products(payload, job):
+    """Import an uploaded file; never retried, as committed batches would be imported twice"""
+    path = job.path(payload.get("upload"))
+    size = os.path.getsize(path) or 1
+    with open(path, "rb") as stream:
+        rows = ProductImportViewModel.read_rows(stream, payload.get("format"))
+
+        def counted():
+            for count, row in enumerate(rows, start=1):
+                yield row
+                # Bytes consumed track progress even though the row count is unknown.
+                job.progress(min(stream.tell(), size), size, f"{count} rows read")
+
+        report = ProductImportViewModel.import_rows(counted(), payload.get("batch_size"))
+    os.remove(path)
+    report["errors"] = report["errors"][:MAX_REPORTED_ERRORS]
+    return report
+
+
+@task("export-orders")
+def export_orders(payload, job):
+    file_format = payload.get("format") or "csv"
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError("Export format must be 'csv' or 'ndjson'")
+    generator, mimetype = EXPORT_FORMATS[file_format]
+    filters = OrderExportViewModel.parse_filters(payload)
+
+    name = f"{job.id}.{file_format}"
+    partial = job.path(name + ".part")
+    written = 0
+    with open(partial, "w", encoding="utf-8", newline="") as handle:
+        for chunk in generator(**filters):
+            handle.write(chunk)
+            written += len(chunk)
+            job.progress(written, message="bytes written")
+    # A retried or half-written export never shows up under the final name.
+    os.replace(partial, job.path(name))
+    return {"file": name, "filename": f"orders.{file_format}", "mimetype": mimetype, "bytes": written}
+
+
+@task("stock-summary", public=True)
+def stock_summary(payload, job):
+    return StockViewModel.rebuild(
+        batch_size=_int(payload, "batch_size", 1000),
+        fix=bool(payload.get("rebuild")),
+        progress=lambda done: job.progress(done, message="products checked"),
+    )
+
+
+@task("sales-rollup", public=True)
+def sales_rollup(payload, job):
+    return SalesRollupViewModel.rebuild(
+        batch_size=_int(payload, "batch_size", 5000),
+        fix=bool(payload.get("rebuild")),
+        progress=lambda done: job.progress(done, message="orders read"),
+    )
+
+
+@task("reprice-orders", public=True)
+def reprice_orders(payload, job):
+    report = PricingEngine.reprice_orders(
+        batch_size=_int(payload, "batch_size", 500),
+        dry_run=bool(payload.get("dry_run")),
+        progress=lambda done: job.progress(done, message="orders read"),
+    )
+    report["errors"] = report["errors"][:MAX_REPORTED_ERRORS]
+    return report
+
+
+@task("taxonomy-paths", public=True)
+def taxonomy_paths(payload, job):
+    return TaxonomyViewModel.rebuild_paths(fix=bool(payload.get("rebuild")))
+
+
+@task("balance-snapshot", public=True)
+def balance_snapshot(payload, job):
+    snapshots = LedgerViewModel.snapshot_all(_int(payload, "min_movements", 1))
+    return {"snapshots": len(snapshots), "movements": sum(snapshot["movements"] for snapshot in snapshots)}
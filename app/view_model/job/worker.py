@@ -0,0 +1,93 @@
+import os
+import socket
+import threading
+import time
+
+from app.database import db
+from app.view_model.job.main import JobViewModel
+
+
+class JobWorker:
+    """A pool of threads draining the ``jobs`` table.
+
+    Each thread runs in its own application context, so it has its own
+    session and connection, and claims one job at a time. The calling
+    thread supervises: it requeues jobs whose lease expired and purges old
+    ones every ``maintenance_interval`` seconds, until ``stop`` is called.
+    """
+
+    def __init__(self, app, threads=2, poll_interval=1.0, maintenance_interval=60.0, name=None):
+        self.app = app
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.maintenance_interval = maintenance_interval
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.processed = 0
+        self.worker_names = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, burst=False):
+        """Process jobs until stopped; with ``burst``, until none is due"""
+        self.worker_names = [f"{self.name}/{number}" for number in range(1, self.threads + 1)]
+        with self.app.app_context():
+            self._maintain()
+        workers = [
+            threading.Thread(target=self._loop, args=(worker, burst), daemon=True)
+            for worker in self.worker_names
+        ]
+        for worker in workers:
+            worker.start()
+
+        maintained = time.monotonic()
+        while any(worker.is_alive() for worker in workers):
+            try:
+                for worker in workers:
+                    worker.join(timeout=self.poll_interval)
+            except KeyboardInterrupt:
+                # Let the jobs in hand finish, then exit.
+                self.stop()
+                continue
+            if not burst and not self._stop.is_set() and time.monotonic() - maintained >= self.maintenance_interval:
+                with self.app.app_context():
+                    self._maintain()
+                maintained = time.monotonic()
+        return self.processed
+
+    def _maintain(self):
+        try:
+            # This process's own threads are alive even if their jobs never renewed the lease.
+            expired = JobViewModel.requeue_expired(alive=self.worker_names)
+            purged = JobViewModel.purge()
+        except Exception:
+            db.session.rollback()
+            self.app.logger.exception("Job maintenance failed")
+            return
+        if expired["requeued"] or expired["failed"] or purged:
+            self.app.logger.info(
+                "Jobs: %s requeued and %s failed after lease expiry, %s purged",
+                expired["requeued"], expired["failed"], purged,
+            )
+
+    def _loop(self, worker, burst):
+        with self.app.app_context():
+            while not self._stop.is_set():
+                try:
+                    ran = JobViewModel.run_next(worker)
+                except Exception:
+                    # The database went away or similar; keep the thread alive and retry.
+                    db.session.rollback()
+                    self.app.logger.exception("Job worker %s could not run a job", worker)
+                    ran = False
+                finally:
+                    db.session.remove()
+                if ran:
+                    with self._lock:
+                        self.processed += 1
+                    continue
+                if burst:
+                    return
+                self._stop.wait(self.poll_interval)
@@ -1,5 +1,11 @@
-from app.view_model.product.main import ProductViewModel
+from app.replicas import read_only
+from app.view_model.order.rollup import SalesRollupViewModel
 
 class MainViewModel:
     def __init__(self):
-        pass
\ No newline at end of file
+        pass
+
+    @staticmethod
+    @read_only
+    def get_dashboard(days=None):
+        return SalesRollupViewModel.dashboard(days)
@@ -0,0 +1,196 @@
+from sqlalchemy import bindparam, insert, update
+
+from app.database import db
+from app.models.pos import Inventory, Order, OrderItem
+from app.models.types import uuid7
+from app.view_model.order.extra_fields import parse_extra_fields
+from app.view_model.order.ledger import LedgerViewModel
+from app.view_model.order.pricing import PricingEngine
+from app.view_model.order.rollup import SalesRollupViewModel
+from app.view_model.product.stock import StockViewModel
+
+
+class InsufficientStockError(ValueError):
+    def __init__(self, product_ids):
+        super().__init__("Insufficient stock for: " + ", ".join(product_ids))
+        self.product_ids = product_ids
+
+
+class CheckoutViewModel:
+    """Turns a cart into an order, its items and stock movements atomically.
+
+    Stock is taken with one conditional ``UPDATE ... WHERE quantity >= :q``
+    executemany, ordered by product id so concurrent tills lock inventory
+    rows in the same order. The order and all its items are written with
+    Core inserts in the same transaction, together with the per-product
+    stock summary decrements, the daily sales rollup and, for paid orders
+    charged to a bill account, the ledger movement; nothing is loaded into
+    the ORM.
+    Prices, taxes and totals come from ``PricingEngine``, never the client.
+    Each product is expected to have a single inventory row per warehouse.
+    """
+
+    @staticmethod
+    def parse_cart(payload):
+        if not isinstance(payload, dict):
+            raise ValueError("Cart must be a JSON object")
+
+        warehouse_id = str(payload.get("warehouse_id") or "").strip()
+        if not warehouse_id:
+            raise ValueError("Warehouse is required")
+
+        items = payload.get("items")
+        if not isinstance(items, list) or not items:
+            raise ValueError("Cart must contain at least one item")
+
+        quantities = {}
+        for item in items:
+            if not isinstance(item, dict):
+                raise ValueError("Each cart item must be an object")
+            product_id = str(item.get("product_id") or "").strip()
+            if not product_id:
+                raise ValueError("Product is required for every item")
+            try:
+                quantity = int(item.get("quantity", 1))
+            except (TypeError, ValueError):
+                raise ValueError("Quantity must be a valid integer")
+            if quantity < 1:
+                raise ValueError("Quantity must be greater than zero")
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+        def text(key):
+            return str(payload.get(key) or "").strip() or None
+
+        return {
+            "warehouse_id": warehouse_id,
+            "discount": payload.get("discount") or 0,
+            "contact_id": text("contact_id"),
+            "status": text("status"),
+            "payment_status": text("payment_status"),
+            "payment_method": text("payment_method"),
+            "type": text("type"),
+            "extra_fields": parse_extra_fields(payload.get("extra_fields")),
+            "bill_account_id": text("bill_account_id"),
+            "lines": sorted(quantities.items()),
+        }
+
+    @staticmethod
+    def checkout(payload):
+        cart = CheckoutViewModel.parse_cart(payload)
+        lines = cart.pop("lines")
+        warehouse_id = cart.pop("warehouse_id")
+        bill_account_id = cart.pop("bill_account_id")
+        if bill_account_id and not LedgerViewModel.exists(bill_account_id):
+            raise ValueError("Bill account not found")
+        try:
+            priced = PricingEngine.price_cart(
+                [{"product_id": product_id, "quantity": quantity} for product_id, quantity in lines],
+                cart.pop("discount"),
+            )
+        except ArithmeticError:
+            raise ValueError("Discount must be a valid number")
+
+        order_id = uuid7()
+        items = [
+            {
+                "id": uuid7(),
+                "order_id": order_id,
+                "product_id": line["product_id"],
+                "quantity": line["quantity"],
+                "price": line["price"],
+                "total": line["total"],
+            }
+            for line in priced["lines"]
+        ]
+        order = dict(
+            cart,
+            id=order_id,
+            subtotal=priced["subtotal"],
+            tax=priced["tax"],
+            discount=priced["discount"],
+            total=priced["total"],
+        )
+
+        payments = []
+        if bill_account_id and order["payment_status"] == "paid":
+            payments.append({"bill_account_id": bill_account_id, "order_id": order_id, "amount": order["total"]})
+
+        CheckoutViewModel._commit(order, items, warehouse_id, payments)
+        return CheckoutViewModel._to_dict(order, items)
+
+    @staticmethod
+    def _commit(order, items, warehouse_id, payments=()):
+        inventories = Inventory.__table__
+        take_stock = (
+            update(inventories)
+            .where(inventories.c.warehouse_id == bindparam("w_id"))
+            .where(inventories.c.product_id == bindparam("p_id"))
+            .where(inventories.c.quantity >= bindparam("qty"))
+            .values(quantity=inventories.c.quantity - bindparam("qty"))
+        )
+        movements = [
+            {"w_id": warehouse_id, "p_id": item["product_id"], "qty": item["quantity"]}
+            for item in items
+        ]
+        try:
+            result = db.session.execute(take_stock, movements)
+            if result.rowcount != len(movements):
+                db.session.rollback()
+                raise InsufficientStockError(
+                    CheckoutViewModel._short_products(warehouse_id, movements)
+                )
+            totals = {}
+            for movement in movements:
+                totals[movement["p_id"]] = totals.get(movement["p_id"], 0) - movement["qty"]
+            StockViewModel.apply_movements(totals)
+            db.session.execute(insert(Order.__table__).values(**order))
+            db.session.execute(insert(OrderItem.__table__), items)
+            LedgerViewModel.post_movements(payments)
+            SalesRollupViewModel.add_orders([order["id"]])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def _short_products(warehouse_id, movements):
+        available = dict(
+            Inventory.query.with_entities(Inventory.product_id, Inventory.quantity)
+            .filter(Inventory.warehouse_id == warehouse_id)
+            .filter(Inventory.product_id.in_([movement["p_id"] for movement in movements]))
+            .all()
+        )
+        return [
+            movement["p_id"]
+            for movement in movements
+            if available.get(movement["p_id"]) is None or available[movement["p_id"]] < movement["qty"]
+        ]
+
+    @staticmethod
+    def _to_dict(order, items):
+        def money(value):
+            return float(value) if value is not None else None
+
+        return {
+            "id": order["id"],
+            "contact_id": order["contact_id"],
+            "total": money(order["total"]),
+            "subtotal": money(order["subtotal"]),
+            "tax": money(order["tax"]),
+            "discount": money(order["discount"]),
+            "status": order["status"],
+            "payment_status": order["payment_status"],
+            "payment_method": order["payment_method"],
+            "type": order["type"],
+            "extra_fields": order["extra_fields"],
+            "items": [
+                {
+                    "id": item["id"],
+                    "product_id": item["product_id"],
+                    "quantity": item["quantity"],
+                    "price": money(item["price"]),
+                    "total": money(item["total"]),
+                }
+                for item in items
+            ],
+        }
@@ -0,0 +1,160 @@
+import csv
+import json
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.database import db
+from app.models.pos import Order, OrderItem
+
+ORDER_COLUMNS = (
+    Order.id,
+    Order.created_at,
+    Order.contact_id,
+    Order.status,
+    Order.payment_status,
+    Order.payment_method,
+    Order.type,
+    Order.subtotal,
+    Order.tax,
+    Order.discount,
+    Order.total,
+)
+ITEM_COLUMNS = (
+    OrderItem.id,
+    OrderItem.product_id,
+    OrderItem.quantity,
+    OrderItem.price,
+    OrderItem.total,
+)
+CSV_HEADER = [
+    "order_id",
+    "created_at",
+    "contact_id",
+    "status",
+    "payment_status",
+    "payment_method",
+    "type",
+    "subtotal",
+    "tax",
+    "discount",
+    "total",
+    "item_id",
+    "product_id",
+    "quantity",
+    "price",
+    "item_total",
+]
+
+
+class _Echo:
+    """File-like object that hands back whatever csv.writer writes to it"""
+
+    def write(self, value):
+        return value
+
+
+def _format(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (int, str)):
+        return value
+    return str(value)
+
+
+class OrderExportViewModel:
+    """Streams orders joined with their items without materializing the result.
+
+    Rows come from a server-side cursor (``yield_per``) ordered by
+    ``(created_at, id)``, so items of one order are always adjacent and
+    memory use is bounded by the batch size, not by the number of orders.
+    """
+
+    @staticmethod
+    def parse_filters(args):
+        filters = {
+            "date_from": OrderExportViewModel._parse_date(args.get("date_from"), "date_from"),
+            "date_to": OrderExportViewModel._parse_date(args.get("date_to"), "date_to", end_of_day=True),
+            "status": (args.get("status") or "").strip() or None,
+        }
+        if filters["date_from"] and filters["date_to"] and filters["date_from"] >= filters["date_to"]:
+            raise ValueError("date_from must be before date_to")
+        return filters
+
+    @staticmethod
+    def _parse_date(value, field, end_of_day=False):
+        value = (value or "").strip()
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"{field} must be an ISO date (YYYY-MM-DD)")
+        if end_of_day and len(value) == 10:
+            # A bare date as upper bound includes the whole day.
+            parsed += timedelta(days=1)
+        return parsed
+
+    @staticmethod
+    def _rows(date_from=None, date_to=None, status=None):
+        statement = (
+            select(*ORDER_COLUMNS, *ITEM_COLUMNS)
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .order_by(Order.created_at.asc(), Order.id.asc())
+        )
+        if date_from:
+            statement = statement.where(Order.created_at >= date_from)
+        if date_to:
+            statement = statement.where(Order.created_at < date_to)
+        if status:
+            statement = statement.where(Order.status == status)
+
+        batch_size = current_app.config.get("EXPORT_BATCH_SIZE", 1000)
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+        try:
+            for row in result:
+                yield row
+        finally:
+            result.close()
+
+    @staticmethod
+    def iter_csv(date_from=None, date_to=None, status=None):
+        writer = csv.writer(_Echo())
+        chunk = [writer.writerow(CSV_HEADER)]
+        chunk_size = current_app.config.get("EXPORT_BATCH_SIZE", 1000)
+        for row in OrderExportViewModel._rows(date_from, date_to, status):
+            chunk.append(writer.writerow([_format(value) for value in row]))
+            if len(chunk) >= chunk_size:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+
+    @staticmethod
+    def iter_ndjson(date_from=None, date_to=None, status=None):
+        order_width = len(ORDER_COLUMNS)
+        order_keys = CSV_HEADER[:order_width]
+        item_keys = ["id", "product_id", "quantity", "price", "total"]
+        chunk = []
+        chunk_size = current_app.config.get("EXPORT_BATCH_SIZE", 1000)
+        current = None
+        for row in OrderExportViewModel._rows(date_from, date_to, status):
+            if current is None or current["order_id"] != row[0]:
+                if current is not None:
+                    chunk.append(json.dumps(current, separators=(",", ":")) + "\n")
+                    if len(chunk) >= chunk_size:
+                        yield "".join(chunk)
+                        chunk = []
+                current = {key: _format(value) for key, value in zip(order_keys, row[:order_width])}
+                current["items"] = []
+            if row[order_width] is not None:
+                current["items"].append(
+                    {key: _format(value) for key, value in zip(item_keys, row[order_width:])}
+                )
+        if current is not None:
+            chunk.append(json.dumps(current, separators=(",", ":")) + "\n")
+        if chunk:
+            yield "".join(chunk)
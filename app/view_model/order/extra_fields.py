@@ -0,0 +1,70 @@
+import json
+
+from flask import current_app
+
+from app.models.pos import Order
+
+# Declared keys and their generated columns. Values of declared keys must fit
+# the column; every other key is stored as given.
+DECLARED_KEYS = {key: getattr(Order, f"extra_{key}") for key in Order.DECLARED_EXTRA_FIELDS}
+
+
+def parse_extra_fields(value):
+    """Validate ``extra_fields`` from a form (JSON text) or a JSON payload (object).
+
+    Returns the object to store, or ``None`` when there is nothing to store.
+    Declared keys must be text or whole numbers short enough for their
+    column; text is stripped and ``null`` drops the key.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            value = json.loads(value)
+        except ValueError:
+            raise ValueError("Extra fields must be a JSON object")
+    if not isinstance(value, dict):
+        raise ValueError("Extra fields must be a JSON object")
+
+    fields = dict(value)
+    for key, column in DECLARED_KEYS.items():
+        if key not in fields:
+            continue
+        field = fields[key]
+        if field is None:
+            del fields[key]
+            continue
+        if isinstance(field, bool) or not isinstance(field, (str, int)):
+            raise ValueError(f"Extra field '{key}' must be text or a whole number")
+        if isinstance(field, str):
+            field = fields[key] = field.strip()
+        length = column.type.length
+        if field == "" or len(str(field)) > length:
+            raise ValueError(f"Extra field '{key}' must be 1 to {length} characters long")
+    if not fields:
+        return None
+
+    max_bytes = current_app.config.get("ORDER_EXTRA_FIELDS_MAX_BYTES", 4096)
+    if len(json.dumps(fields, separators=(",", ":")).encode("utf-8")) > max_bytes:
+        raise ValueError(f"Extra fields must be at most {max_bytes} bytes")
+    return fields
+
+
+def filter_by_extra_fields(query, filters):
+    """Restrict ``query`` to orders whose declared keys equal ``filters``.
+
+    Each filter is an equality on the key's generated column, answered from
+    its index. Numbers match their text form, so ``table_number=12`` finds
+    both ``12`` and ``"12"``. Empty values are ignored.
+    """
+    for key, value in (filters or {}).items():
+        if value is None or value == "":
+            continue
+        column = DECLARED_KEYS.get(key)
+        if column is None:
+            raise ValueError(f"Cannot filter by '{key}'")
+        query = query.filter(column == str(value).strip())
+    return query
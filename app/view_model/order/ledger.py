@@ -0,0 +1,273 @@
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import func, insert, select, update
+
+from app.database import db
+from app.models.pos import BillAccount, BillAccountSnapshot, OrderBillAccount
+from app.models.types import uuid7
+
+MONEY = Decimal("0.0001")
+
+
+def _amount(value):
+    # SQLite sums NUMERIC columns as REAL; round back to the column scale.
+    return Decimal(str(value or 0)).quantize(MONEY)
+
+
+class LedgerViewModel:
+    """Bill account balances backed by an append-only movement ledger.
+
+    ``order_bill_accounts`` holds signed movements. ``bill_accounts.balance``
+    is the balance as of the account's latest snapshot, so the current
+    balance is that value plus the movements no snapshot has folded in yet.
+    Posting only inserts ledger rows, so tills never contend on the account
+    row; ``snapshot`` periodically folds pending movements into a numbered
+    ``bill_account_snapshots`` row and increments the account balance
+    atomically. ``reconcile`` replays the ledger against every snapshot.
+    """
+
+    @staticmethod
+    def post_movements(movements):
+        """Append ``{bill_account_id, amount, order_id?, movement_type?}`` rows.
+
+        Joins the caller's transaction and never commits. Amounts are signed;
+        the movement type defaults to ``in`` or ``out`` from the sign.
+        """
+        rows = []
+        for movement in movements:
+            try:
+                amount = _amount(movement["amount"])
+            except (InvalidOperation, TypeError, ValueError):
+                raise ValueError("Amount must be a valid number")
+            if not movement.get("bill_account_id"):
+                raise ValueError("Bill account is required")
+            rows.append({
+                "id": uuid7(),
+                "order_id": movement.get("order_id"),
+                "bill_account_id": movement["bill_account_id"],
+                "amount": amount,
+                "movement_type": movement.get("movement_type") or ("in" if amount >= 0 else "out"),
+                "snapshot_id": None,
+            })
+        if rows:
+            db.session.execute(insert(OrderBillAccount.__table__), rows)
+
+    @staticmethod
+    def exists(bill_account_id):
+        return db.session.scalar(select(BillAccount.id).where(BillAccount.id == bill_account_id)) is not None
+
+    @staticmethod
+    def get_balance(bill_account_id):
+        ledger = OrderBillAccount.__table__
+
+        def pending(column):
+            return (
+                select(column)
+                .where(ledger.c.bill_account_id == BillAccount.id)
+                .where(ledger.c.snapshot_id.is_(None))
+                .scalar_subquery()
+            )
+
+        # One statement, so a snapshot committing in between cannot be counted twice.
+        row = db.session.execute(
+            select(
+                BillAccount.name,
+                BillAccount.balance,
+                pending(func.coalesce(func.sum(ledger.c.amount), 0)),
+                pending(func.count()),
+                select(func.max(BillAccountSnapshot.sequence))
+                .where(BillAccountSnapshot.bill_account_id == BillAccount.id)
+                .scalar_subquery(),
+            ).where(BillAccount.id == bill_account_id)
+        ).first()
+        if row is None:
+            raise ValueError("Bill account not found")
+        name, snapshot_balance, pending_total, pending_count, sequence = row
+        snapshot_balance = _amount(snapshot_balance)
+        pending_total = _amount(pending_total)
+        return {
+            "bill_account_id": bill_account_id,
+            "name": name,
+            "balance": float(snapshot_balance + pending_total),
+            "snapshot_balance": float(snapshot_balance),
+            "snapshot_sequence": sequence,
+            "pending": float(pending_total),
+            "pending_movements": pending_count,
+        }
+
+    @staticmethod
+    def snapshot(bill_account_id):
+        """Fold the account's pending movements into a new snapshot and commit.
+
+        Returns the snapshot as a dict, or ``None`` when nothing was pending.
+        """
+        ledger = OrderBillAccount.__table__
+        snapshots = BillAccountSnapshot.__table__
+        accounts = BillAccount.__table__
+        try:
+            # Serializes snapshots of one account; posting never takes this lock.
+            if db.session.execute(
+                select(accounts.c.id).where(accounts.c.id == bill_account_id).with_for_update()
+            ).first() is None:
+                raise ValueError("Bill account not found")
+            previous = db.session.execute(
+                select(snapshots.c.sequence, snapshots.c.balance)
+                .where(snapshots.c.bill_account_id == bill_account_id)
+                .order_by(snapshots.c.sequence.desc())
+                .limit(1)
+            ).first()
+            sequence, opening = (previous[0], _amount(previous[1])) if previous else (0, Decimal(0))
+
+            # The row exists before movements reference it; totals are filled in below.
+            snapshot_id = uuid7()
+            db.session.execute(
+                insert(snapshots).values(
+                    id=snapshot_id,
+                    bill_account_id=bill_account_id,
+                    sequence=sequence + 1,
+                    balance=opening,
+                    delta=0,
+                    movements=0,
+                )
+            )
+            # Stamp first, then sum what was stamped: rows committed meanwhile stay pending.
+            stamped = db.session.execute(
+                update(ledger)
+                .where(ledger.c.bill_account_id == bill_account_id)
+                .where(ledger.c.snapshot_id.is_(None))
+                .values(snapshot_id=snapshot_id)
+            ).rowcount
+            if not stamped:
+                db.session.rollback()
+                return None
+            delta = _amount(db.session.scalar(
+                select(func.sum(ledger.c.amount)).where(ledger.c.snapshot_id == snapshot_id)
+            ))
+            db.session.execute(
+                update(snapshots)
+                .where(snapshots.c.id == snapshot_id)
+                .values(balance=opening + delta, delta=delta, movements=stamped)
+            )
+            db.session.execute(
+                update(accounts)
+                .where(accounts.c.id == bill_account_id)
+                .values(balance=func.coalesce(accounts.c.balance, 0) + delta)
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return {
+            "id": snapshot_id,
+            "bill_account_id": bill_account_id,
+            "sequence": sequence + 1,
+            "balance": float(opening + delta),
+            "delta": float(delta),
+            "movements": stamped,
+        }
+
+    @staticmethod
+    def snapshot_all(min_movements=1):
+        """Snapshot every account with at least ``min_movements`` pending"""
+        ledger = OrderBillAccount.__table__
+        due = db.session.scalars(
+            select(ledger.c.bill_account_id)
+            .where(ledger.c.snapshot_id.is_(None))
+            .where(ledger.c.bill_account_id.is_not(None))
+            .group_by(ledger.c.bill_account_id)
+            .having(func.count() >= min_movements)
+            .order_by(ledger.c.bill_account_id)
+        ).all()
+        db.session.rollback()
+        taken = [LedgerViewModel.snapshot(bill_account_id) for bill_account_id in due]
+        return [snapshot for snapshot in taken if snapshot]
+
+    @staticmethod
+    def reconcile(batch_size=100):
+        """Replay the ledger against every snapshot and account balance.
+
+        Accounts are walked in id order, ``batch_size`` at a time. Each chunk
+        streams its snapshots in sequence order next to the ledger totals
+        stamped with them, so memory stays flat however long the history is.
+        """
+        ledger = OrderBillAccount.__table__
+        snapshots = BillAccountSnapshot.__table__
+        report = {"accounts": 0, "snapshots": 0, "movements": 0, "pending": 0, "issues": []}
+
+        def issue(bill_account_id, sequence, problem, expected, found):
+            report["issues"].append({
+                "bill_account_id": bill_account_id,
+                "sequence": sequence,
+                "problem": problem,
+                "expected": expected,
+                "found": found,
+            })
+
+        last_id = None
+        while True:
+            query = select(BillAccount.id, BillAccount.balance).order_by(BillAccount.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(BillAccount.id > last_id)
+            accounts = db.session.execute(query).all()
+            if not accounts:
+                break
+            last_id = accounts[-1][0]
+            report["accounts"] += len(accounts)
+            account_ids = [account_id for account_id, _ in accounts]
+
+            stamped = (
+                select(
+                    ledger.c.snapshot_id,
+                    func.sum(ledger.c.amount).label("total"),
+                    func.count().label("count"),
+                )
+                .where(ledger.c.bill_account_id.in_(account_ids))
+                .where(ledger.c.snapshot_id.is_not(None))
+                .group_by(ledger.c.snapshot_id)
+                .subquery()
+            )
+            rows = db.session.execute(
+                select(
+                    snapshots.c.bill_account_id,
+                    snapshots.c.sequence,
+                    snapshots.c.balance,
+                    snapshots.c.delta,
+                    snapshots.c.movements,
+                    stamped.c.total,
+                    stamped.c.count,
+                )
+                .outerjoin(stamped, stamped.c.snapshot_id == snapshots.c.id)
+                .where(snapshots.c.bill_account_id.in_(account_ids))
+                .order_by(snapshots.c.bill_account_id, snapshots.c.sequence),
+                execution_options={"yield_per": 500},
+            )
+            replayed = {}
+            for bill_account_id, sequence, balance, delta, movements, total, count in rows:
+                report["snapshots"] += 1
+                report["movements"] += count or 0
+                previous_sequence, running = replayed.get(bill_account_id, (0, Decimal(0)))
+                total = _amount(total)
+                running += total
+                replayed[bill_account_id] = (sequence, running)
+                if sequence != previous_sequence + 1:
+                    issue(bill_account_id, sequence, "sequence", previous_sequence + 1, sequence)
+                if (count or 0) != movements:
+                    issue(bill_account_id, sequence, "movements", count or 0, movements)
+                if _amount(delta) != total:
+                    issue(bill_account_id, sequence, "delta", float(total), float(delta))
+                if _amount(balance) != running:
+                    issue(bill_account_id, sequence, "balance", float(running), float(balance))
+
+            for bill_account_id, balance in accounts:
+                _, running = replayed.get(bill_account_id, (0, Decimal(0)))
+                if _amount(balance) != running:
+                    issue(bill_account_id, None, "account balance", float(running), float(_amount(balance)))
+
+            report["pending"] += db.session.scalar(
+                select(func.count())
+                .select_from(ledger)
+                .where(ledger.c.bill_account_id.in_(account_ids))
+                .where(ledger.c.snapshot_id.is_(None))
+            )
+            db.session.rollback()
+        return report
@@ -5,5 +5,5 @@ class OrderListViewModel:
     def __init__(self):
         self.order_service = OrderViewModel()
 
-    def get_orders_table_data(self):
-        return self.order_service.list_orders()
+    def get_orders_table_data(self, cursor=None, limit=None, sort=None, direction=None):
+        return self.order_service.list_orders(cursor, limit, sort, direction)
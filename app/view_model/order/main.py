@@ -1,52 +1,101 @@
+from itertools import zip_longest
+
 from app.database import db
-from app.models.pos import Order
+from app.models.pos import Order, OrderItem
+from app.models.types import uuid7
+from app.replicas import read_only
+from app.view_model.freshness import FreshnessViewModel
+from app.view_model.order.extra_fields import filter_by_extra_fields, parse_extra_fields
+from app.view_model.order.pricing import PricingEngine
+from app.view_model.order.rollup import SalesRollupViewModel
+from app.view_model.pagination import KeysetPaginator
+from app.view_model.read_model import ReadModel
+
+order_paginator = KeysetPaginator(Order, sortable=("created_at", "total"))
+order_list_rows = ReadModel(
+    "OrderListRow",
+    Order.id,
+    Order.contact_id,
+    Order.total,
+    Order.status,
+    Order.payment_status,
+    Order.payment_method,
+    Order.type,
+    Order.created_at,
+)
 
 
 class OrderViewModel:
     @staticmethod
-    def list_orders():
-        return OrderViewModel.get_all_orders()
+    @read_only
+    def list_orders(cursor=None, limit=None, sort=None, direction=None, filters=None):
+        query = filter_by_extra_fields(order_list_rows.query(), filters)
+        page = order_paginator.paginate(query, cursor, limit, sort, direction)
+        page["items"] = order_list_rows.rows(page["items"])
+        return page
 
     @staticmethod
+    @read_only
     def get_all_orders():
         orders = Order.query.all()
         return [order.to_dict() for order in orders]
 
+    @staticmethod
+    @read_only
+    def get_orders_page(cursor=None, limit=None, sort=None, direction=None, filters=None):
+        """Page of orders, optionally filtered by declared ``extra_fields`` keys.
+
+        ``filters`` maps keys such as ``channel`` or ``table_number`` to the
+        value to match; see ``filter_by_extra_fields``.
+        """
+        query = filter_by_extra_fields(Order.query, filters)
+        page = order_paginator.paginate(query, cursor, limit, sort, direction)
+        page["items"] = [order.to_dict() for order in page["items"]]
+        return page
+
+    @staticmethod
+    def get_orders_page_state(cursor=None, limit=None, sort=None, direction=None, filters=None):
+        """Validator state of the page ``get_orders_page`` returns for the same arguments"""
+        query = filter_by_extra_fields(Order.query, filters)
+        return FreshnessViewModel.page_state(order_paginator, query, cursor, limit, sort, direction)
+
+    @staticmethod
+    @read_only
+    def get_order_by_id(order_id):
+        # Compared rather than looked up by key, so a non-UUID id finds nothing.
+        order = Order.query.filter(Order.id == order_id).first()
+        return order.to_dict() if order else None
+
     @staticmethod
     def create_order(form_data):
+        """Record an order priced on the server from its product lines.
+
+        ``form_data`` carries parallel ``product_id`` and ``quantity`` lists,
+        one entry per line, plus an optional order ``discount``. Subtotal,
+        tax and total come from ``PricingEngine`` like at checkout, and the
+        lines are stored as the order's items. Stock is not moved; tills
+        sell through checkout.
+        """
         contact_id = form_data.get("contact_id", "").strip() or None
         status = form_data.get("status", "").strip() or None
         payment_status = form_data.get("payment_status", "").strip() or None
         payment_method = form_data.get("payment_method", "").strip() or None
         order_type = form_data.get("type", "").strip() or None
-        extra_fields = form_data.get("extra_fields", "").strip() or None
+        extra_fields = parse_extra_fields(form_data.get("extra_fields"))
+        lines = OrderViewModel._form_lines(form_data)
 
         try:
-            total = float(form_data.get("total", 0.0))
-        except (TypeError, ValueError):
-            raise ValueError("Total must be a valid number")
-
-        try:
-            subtotal = float(form_data.get("subtotal", 0.0))
-        except (TypeError, ValueError):
-            raise ValueError("Subtotal must be a valid number")
-
-        try:
-            tax = float(form_data.get("tax", 0.0))
-        except (TypeError, ValueError):
-            raise ValueError("Tax must be a valid number")
-
-        try:
-            discount = float(form_data.get("discount", 0.0))
-        except (TypeError, ValueError):
+            priced = PricingEngine.price_cart(lines, form_data.get("discount") or 0)
+        except ArithmeticError:
             raise ValueError("Discount must be a valid number")
 
         new_order = Order(
+            id=uuid7(),
             contact_id=contact_id,
-            total=total,
-            subtotal=subtotal,
-            tax=tax,
-            discount=discount,
+            total=priced["total"],
+            subtotal=priced["subtotal"],
+            tax=priced["tax"],
+            discount=priced["discount"],
             status=status,
             payment_status=payment_status,
             payment_method=payment_method,
@@ -54,5 +103,38 @@ class OrderViewModel:
             extra_fields=extra_fields,
         )
         db.session.add(new_order)
+        db.session.add_all(
+            OrderItem(
+                order_id=new_order.id,
+                product_id=line["product_id"],
+                quantity=line["quantity"],
+                price=line["price"],
+                total=line["total"],
+            )
+            for line in priced["lines"]
+        )
+        db.session.flush()
+        SalesRollupViewModel.add_orders([new_order.id])
         db.session.commit()
         return new_order.to_dict()
+
+    @staticmethod
+    def _form_lines(form_data):
+        """Pair the form's ``product_id`` and ``quantity`` lists, skipping blank rows"""
+        lines = []
+        for product_id, quantity in zip_longest(
+            form_data.getlist("product_id"), form_data.getlist("quantity"), fillvalue=""
+        ):
+            product_id, quantity = product_id.strip(), quantity.strip()
+            if not product_id and not quantity:
+                continue
+            if not product_id:
+                raise ValueError("Product is required for every line")
+            try:
+                quantity = int(quantity or 1)
+            except ValueError:
+                raise ValueError("Quantity must be a valid integer")
+            lines.append({"product_id": product_id, "quantity": quantity})
+        if not lines:
+            raise ValueError("Order must contain at least one product")
+        return lines
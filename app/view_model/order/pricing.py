@@ -0,0 +1,222 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import bindparam, update
+
+from app.database import db
+from app.models.inventory.product import Product
+from app.models.pos import Order, OrderItem
+from app.view_model.order.rollup import SalesRollupViewModel
+
+# Money columns are Numeric(18, 4): one minor unit is 0.0001.
+MONEY_SCALE = 10000
+# tax_rate is a percentage with two decimals: 16.00 -> 1600 / RATE_SCALE.
+RATE_SCALE = 10000
+
+
+def to_units(value, scale=MONEY_SCALE):
+    if value is None:
+        return 0
+    return int((Decimal(str(value)) * scale).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_units(units):
+    return Decimal(units).scaleb(-4)
+
+
+def _div_half_up(numerator, denominator):
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder * 2 >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def _allocate(amount, weights):
+    """Split ``amount`` across ``weights`` proportionally, largest remainder first"""
+    total = sum(weights)
+    if not amount or not total:
+        return [0] * len(weights)
+    shares = []
+    remainders = []
+    for index, weight in enumerate(weights):
+        share, remainder = divmod(amount * weight, total)
+        shares.append(share)
+        remainders.append((remainder, index))
+    for _, index in sorted(remainders, reverse=True)[: amount - sum(shares)]:
+        shares[index] += 1
+    return shares
+
+
+class PricingEngine:
+    """Server-side order pricing in integer minor units.
+
+    ``price_lines`` works on whole carts at once: every stage (gross, line
+    discount, order discount allocation, tax) is one pass over parallel
+    lists of ints, so a 10k-line cart costs the same per line as a 1-line
+    one and results are exact. Order-level discounts are spread over the
+    lines before tax so each line is taxed on what was actually charged.
+    """
+
+    @staticmethod
+    def load_catalog(product_ids):
+        """Map product id to ``(price units, tax rate units)`` with one IN query"""
+        rows = (
+            Product.query.with_entities(Product.id, Product.price, Product.tax_rate)
+            .filter(Product.id.in_(set(product_ids)))
+            .all()
+        )
+        return {
+            product_id: (to_units(price), to_units(tax_rate, 100))
+            for product_id, price, tax_rate in rows
+        }
+
+    @staticmethod
+    def price_cart(lines, discount=0):
+        lines = list(lines)
+        catalog = PricingEngine.load_catalog(line["product_id"] for line in lines)
+        return PricingEngine.price_lines(lines, catalog, discount)
+
+    @staticmethod
+    def price_lines(lines, catalog, discount=0):
+        """Price ``lines`` (dicts with product_id, quantity, optional price and discount).
+
+        An explicit line ``price`` overrides the catalog price, which is what
+        re-pricing historical orders needs.
+        """
+        product_ids = [line["product_id"] for line in lines]
+        missing = sorted({product_id for product_id in product_ids if product_id not in catalog})
+        if missing:
+            raise ValueError("Product not found: " + ", ".join(missing))
+
+        quantities = [int(line["quantity"]) for line in lines]
+        unit_prices = [
+            to_units(line["price"]) if line.get("price") is not None else catalog[product_id][0]
+            for line, product_id in zip(lines, product_ids)
+        ]
+        rates = [catalog[product_id][1] for product_id in product_ids]
+        gross = [unit * quantity for unit, quantity in zip(unit_prices, quantities)]
+        line_discounts = [to_units(line.get("discount")) for line in lines]
+        if any(quantity < 1 for quantity in quantities):
+            raise ValueError("Quantity must be greater than zero")
+        if any(d < 0 or d > g for d, g in zip(line_discounts, gross)):
+            raise ValueError("Line discount must be between zero and the line amount")
+
+        net = [g - d for g, d in zip(gross, line_discounts)]
+        order_discount = to_units(discount)
+        if order_discount < 0 or order_discount > sum(net):
+            raise ValueError("Discount must be between zero and the order subtotal")
+        allocated = _allocate(order_discount, net)
+        taxable = [n - a for n, a in zip(net, allocated)]
+        taxes = [_div_half_up(t * r, RATE_SCALE) for t, r in zip(taxable, rates)]
+
+        subtotal = sum(gross)
+        total_discount = sum(line_discounts) + order_discount
+        tax = sum(taxes)
+        return {
+            "subtotal": from_units(subtotal),
+            "discount": from_units(total_discount),
+            "tax": from_units(tax),
+            "total": from_units(subtotal - total_discount + tax),
+            "lines": [
+                {
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "price": from_units(unit),
+                    "discount": from_units(line_discount + share),
+                    "tax": from_units(line_tax),
+                    "total": from_units(line_net),
+                }
+                for product_id, quantity, unit, line_discount, share, line_tax, line_net in zip(
+                    product_ids, quantities, unit_prices, line_discounts, allocated, taxes, net
+                )
+            ],
+        }
+
+    @staticmethod
+    def reprice_orders(batch_size=500, dry_run=False, progress=None):
+        """Recompute stored totals of historical orders from their items.
+
+        Orders are walked in id order in chunks; each chunk costs one query
+        for its items, at most one for product tax rates not seen yet and
+        two executemany UPDATEs. Items keep their recorded unit price, the
+        stored order discount is re-applied and orders without items are
+        left alone. Each chunk moves its orders' totals in the daily sales
+        rollup in the same transaction. ``progress`` is called with the
+        number of orders read so far.
+        """
+        report = {"orders": 0, "repriced": 0, "changed": 0, "skipped": 0, "errors": []}
+        catalog = {}
+        last_id = None
+        while True:
+            query = Order.query.with_entities(Order.id, Order.discount, Order.subtotal, Order.tax, Order.total)
+            if last_id is not None:
+                query = query.filter(Order.id > last_id)
+            orders = query.order_by(Order.id.asc()).limit(batch_size).all()
+            if not orders:
+                break
+            last_id = orders[-1].id
+            report["orders"] += len(orders)
+            if progress:
+                progress(report["orders"])
+
+            items_by_order = {}
+            for item in (
+                OrderItem.query.with_entities(
+                    OrderItem.id, OrderItem.order_id, OrderItem.product_id, OrderItem.quantity, OrderItem.price
+                )
+                .filter(OrderItem.order_id.in_([order.id for order in orders]))
+                .order_by(OrderItem.order_id, OrderItem.id)
+            ):
+                items_by_order.setdefault(item.order_id, []).append(item)
+
+            unseen = {item.product_id for items in items_by_order.values() for item in items} - catalog.keys()
+            if unseen:
+                catalog.update(PricingEngine.load_catalog(unseen))
+
+            order_updates = []
+            item_updates = []
+            for order in orders:
+                items = items_by_order.get(order.id)
+                if not items:
+                    report["skipped"] += 1
+                    continue
+                lines = [
+                    {"product_id": item.product_id, "quantity": item.quantity, "price": item.price}
+                    for item in items
+                ]
+                try:
+                    priced = PricingEngine.price_lines(lines, catalog, order.discount)
+                except (TypeError, ValueError) as e:
+                    report["errors"].append({"order_id": order.id, "error": str(e)})
+                    continue
+
+                report["repriced"] += 1
+                if (priced["subtotal"], priced["tax"], priced["total"]) != (order.subtotal, order.tax, order.total):
+                    report["changed"] += 1
+                order_updates.append({
+                    "o_id": order.id,
+                    "subtotal": priced["subtotal"],
+                    "tax": priced["tax"],
+                    "discount": priced["discount"],
+                    "total": priced["total"],
+                })
+                item_updates.extend(
+                    {"i_id": item.id, "total": line["total"]}
+                    for item, line in zip(items, priced["lines"])
+                )
+
+            if not dry_run and order_updates:
+                orders_table = Order.__table__
+                items_table = OrderItem.__table__
+                repriced_ids = [update_row["o_id"] for update_row in order_updates]
+                SalesRollupViewModel.remove_orders(repriced_ids)
+                db.session.execute(
+                    update(orders_table).where(orders_table.c.id == bindparam("o_id")),
+                    order_updates,
+                )
+                db.session.execute(
+                    update(items_table).where(items_table.c.id == bindparam("i_id")),
+                    item_updates,
+                )
+                SalesRollupViewModel.add_orders(repriced_ids)
+                db.session.commit()
+        return report
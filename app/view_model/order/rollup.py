@@ -0,0 +1,277 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from flask import current_app
+from sqlalchemy import Date, bindparam, delete, func, or_, select, update
+from sqlalchemy.dialects import mysql, sqlite
+
+from app.database import db
+from app.models.pos import DailySales, Order
+from app.view_model.pagination import stored_form, stored_value
+
+DIMENSIONS = ("payment_method", "status", "type")
+MEASURES = ("subtotal", "tax", "discount", "total")
+MONEY = Decimal("0.0001")
+
+
+def _money(value):
+    # SQLite sums NUMERIC columns as REAL; round back to the column scale.
+    return Decimal(str(value or 0)).quantize(MONEY)
+
+
+def _aggregate(*criteria):
+    """Rollup rows for the orders matching ``criteria``, straight from ``orders``"""
+    day = func.date(Order.created_at, type_=Date)
+    dimensions = [func.coalesce(getattr(Order, name), "") for name in DIMENSIONS]
+    return (
+        select(
+            day.label("day"),
+            *(dimension.label(name) for dimension, name in zip(dimensions, DIMENSIONS)),
+            func.count().label("orders"),
+            *(func.coalesce(func.sum(getattr(Order, name)), 0).label(name) for name in MEASURES),
+        )
+        .where(Order.created_at.is_not(None), *criteria)
+        .group_by(day, *dimensions)
+    )
+
+
+# Built once: statements rebuilt per call miss SQLAlchemy's compiled cache.
+_ORDERS_ROLLUP = _aggregate(Order.id.in_(bindparam("order_ids", expanding=True)))
+_table = DailySales.__table__
+_KEY_MATCH = [_table.c.day == bindparam("k_day")] + [_table.c[name] == bindparam(f"k_{name}") for name in DIMENSIONS]
+_INCREMENT = (
+    update(_table)
+    .where(*_KEY_MATCH)
+    .values({name: _table.c[name] + bindparam(f"d_{name}") for name in ("orders", *MEASURES)})
+)
+_DELETE_EMPTY = delete(_table).where(*_KEY_MATCH).where(_table.c.orders <= 0)
+
+
+def _key(row):
+    return (row["day"], *(row[name] for name in DIMENSIONS))
+
+
+def _normalize(row):
+    return dict(
+        {name: row[name] for name in ("day", *DIMENSIONS)},
+        orders=int(row["orders"]),
+        **{name: _money(row[name]) for name in MEASURES},
+    )
+
+
+class SalesRollupViewModel:
+    """Daily sales totals kept in step with ``orders``.
+
+    Every order write re-aggregates just the orders it touched and adds the
+    result to ``daily_sales`` with an upsert that increments in place, in
+    the caller's transaction. The dashboard reads a fixed window of
+    rollup rows, so its cost does not grow with order history. ``rebuild``
+    recomputes the table from ``orders`` in chunks.
+    """
+
+    @staticmethod
+    def add_orders(order_ids):
+        """Count orders that were just written; call after inserting or updating them"""
+        SalesRollupViewModel._apply(order_ids, 1)
+
+    @staticmethod
+    def remove_orders(order_ids):
+        """Uncount orders about to change or disappear; call before writing them"""
+        SalesRollupViewModel._apply(order_ids, -1)
+
+    @staticmethod
+    def _apply(order_ids, sign):
+        order_ids = list(order_ids)
+        if not order_ids:
+            return
+        rows = [
+            _normalize(row._asdict())
+            for row in db.session.execute(_ORDERS_ROLLUP, {"order_ids": order_ids})
+        ]
+        if not rows:
+            return
+        for row in rows:
+            row["orders"] *= sign
+            for name in MEASURES:
+                row[name] *= sign
+        # Sorted so concurrent writers lock rollup rows in the same order.
+        rows.sort(key=_key)
+        SalesRollupViewModel._increment(rows)
+        if sign < 0:
+            db.session.execute(
+                _DELETE_EMPTY, [{f"k_{name}": row[name] for name in ("day", *DIMENSIONS)} for row in rows]
+            )
+
+    @staticmethod
+    def _increment(rows):
+        """Add ``rows`` to their rollup rows as atomic increments.
+
+        Existing rows take one executemany UPDATE. The first order of a new
+        day and combination inserts its row with an upsert instead, so two
+        writers creating the same row both land.
+        """
+        result = db.session.execute(
+            _INCREMENT,
+            [
+                dict(
+                    {f"k_{name}": row[name] for name in ("day", *DIMENSIONS)},
+                    **{f"d_{name}": row[name] for name in ("orders", *MEASURES)},
+                )
+                for row in rows
+            ],
+        )
+        if result.rowcount == len(rows):
+            return
+        existing = {
+            _key(row._asdict())
+            for row in db.session.execute(
+                select(_table.c.day, *(_table.c[name] for name in DIMENSIONS))
+                .where(_table.c.day.in_({row["day"] for row in rows}))
+            )
+        }
+        missing = [row for row in rows if _key(row) not in existing]
+        if missing:
+            SalesRollupViewModel._upsert(missing)
+
+    @staticmethod
+    def _upsert(rows):
+        table = DailySales.__table__
+        counters = ("orders", *MEASURES)
+        if db.session.get_bind().dialect.name == "mysql":
+            statement = mysql.insert(table)
+            statement = statement.on_duplicate_key_update(
+                {name: table.c[name] + statement.inserted[name] for name in counters}
+            )
+        else:
+            statement = sqlite.insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=["day", *DIMENSIONS],
+                set_={name: table.c[name] + statement.excluded[name] for name in counters},
+            )
+        db.session.execute(statement, rows)
+
+    @staticmethod
+    def dashboard(days=None):
+        """Totals for the last ``days`` days, per day and per dimension"""
+        days = days or current_app.config.get("SALES_DASHBOARD_DAYS", 30)
+        # The database clock stamps orders, so it also decides what "today" is.
+        today = db.session.scalar(select(func.current_date(type_=Date)))
+        start = today - timedelta(days=days - 1)
+        rows = db.session.execute(select(DailySales).where(DailySales.day >= start)).scalars().all()
+
+        def empty():
+            return dict(orders=0, **{name: Decimal(0) for name in MEASURES})
+
+        def add(totals, row):
+            totals["orders"] += row.orders
+            for name in MEASURES:
+                totals[name] += _money(getattr(row, name))
+
+        series = {start + timedelta(days=offset): empty() for offset in range(days)}
+        breakdowns = {name: {} for name in DIMENSIONS}
+        summary = empty()
+        for row in rows:
+            if row.day in series:
+                add(series[row.day], row)
+            add(summary, row)
+            for name in DIMENSIONS:
+                add(breakdowns[name].setdefault(getattr(row, name), empty()), row)
+
+        peak = max((totals["total"] for totals in series.values()), default=0) or 1
+        return {
+            "start": start,
+            "today": today,
+            "days": days,
+            "summary": summary,
+            "today_summary": series[today],
+            "series": [
+                dict(totals, day=day, share=float(totals["total"] / peak) if totals["total"] > 0 else 0)
+                for day, totals in series.items()
+            ],
+            "breakdowns": {
+                name: sorted(
+                    (dict(totals, key=key or None) for key, totals in groups.items()),
+                    key=lambda totals: totals["total"],
+                    reverse=True,
+                )
+                for name, groups in breakdowns.items()
+            },
+        }
+
+    @staticmethod
+    def rebuild(batch_size=5000, fix=False, progress=None):
+        """Compare (and with ``fix``, rewrite) every day against ``orders``.
+
+        Orders are read in ``(created_at, id)`` order, ``batch_size`` at a
+        time, with one aggregate query per chunk. A day is checked, and
+        with ``fix`` rewritten whole and committed, as soon as a later day
+        shows up, so only the current day's totals are held in memory.
+        Days being written to while the rebuild runs should be checked again.
+        ``progress`` is called with the number of orders read so far.
+        """
+        table = DailySales.__table__
+        report = {"orders": 0, "days": 0, "mismatched": 0, "stale": 0}
+        seen = set()
+        pending = {}
+
+        def settle(days):
+            if not days:
+                return
+            stored = {}
+            for row in db.session.execute(select(table).where(table.c.day.in_(days))):
+                row = _normalize(row._asdict())
+                if row["orders"]:
+                    stored[_key(row)] = row
+            expected = {_key(row): row for day in days for row in pending.pop(day).values()}
+            mismatched = {
+                key[0] for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key)
+            }
+            report["days"] += len(days)
+            report["mismatched"] += len(mismatched)
+            if fix and mismatched:
+                db.session.execute(delete(table).where(table.c.day.in_(mismatched)))
+                rows = [row for key, row in sorted(expected.items()) if key[0] in mismatched]
+                if rows:
+                    db.session.execute(table.insert(), rows)
+                db.session.commit()
+
+        last = None
+        while True:
+            # Seek on created_at as stored, so orders sharing a second with the
+            # chunk boundary are neither skipped nor read twice on SQLite.
+            query = (
+                select(Order.created_at, Order.id, stored_form(Order.created_at))
+                .where(Order.created_at.is_not(None))
+                .order_by(Order.created_at, Order.id)
+                .limit(batch_size)
+            )
+            if last is not None:
+                bound = stored_value(Order.created_at, last[2])
+                query = query.where(Order.created_at >= bound, or_(Order.created_at > bound, Order.id > last[1]))
+            chunk = db.session.execute(query).all()
+            if not chunk:
+                break
+            last = tuple(chunk[-1])
+            report["orders"] += len(chunk)
+            if progress:
+                progress(report["orders"])
+
+            for row in db.session.execute(_aggregate(Order.id.in_([row.id for row in chunk]))):
+                row = _normalize(row._asdict())
+                seen.add(row["day"])
+                totals = pending.setdefault(row["day"], {}).setdefault(_key(row), dict(row, orders=0, **{
+                    name: Decimal(0) for name in MEASURES
+                }))
+                totals["orders"] += row["orders"]
+                for name in MEASURES:
+                    totals[name] += row[name]
+            settle(sorted(day for day in pending if day < last[0].date()))
+            db.session.rollback()
+        settle(sorted(pending))
+
+        stale = [day for day in db.session.scalars(select(table.c.day).distinct()) if day not in seen]
+        report["stale"] = len(stale)
+        if fix and stale:
+            db.session.execute(delete(table).where(table.c.day.in_(stale)))
+            db.session.commit()
+        return report
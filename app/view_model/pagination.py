@@ -0,0 +1,167 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from flask import current_app
+from sqlalchemy import DateTime, String, and_, or_, type_coerce
+
+from app.database import db
+
+
+def stored_form(column):
+    """``column`` as the database compares it, for seek cursors.
+
+    SQLite keeps DATETIME as text, and rows written by its
+    ``CURRENT_TIMESTAMP`` defaults lack the ``.000000`` that SQLAlchemy adds
+    to bound datetimes, so a seek past a parsed datetime misplaces every row
+    of the same second. There the raw text is used, which is also what the
+    index and ``ORDER BY`` sort on.
+    """
+    stored = type_coerce(column, String) if _stored_as_text(column) else column
+    return stored.label(f"{column.key}_stored")
+
+
+def stored_value(column, value):
+    """Bind ``value``, read through ``stored_form(column)``, for comparing with ``column``"""
+    return type_coerce(value, String) if _stored_as_text(column) else value
+
+
+def _stored_as_text(column):
+    return isinstance(column.type, DateTime) and db.engine.dialect.name == "sqlite"
+
+
+class KeysetPaginator:
+    """Cursor pagination over ``(sort column, id)``.
+
+    Pages are fetched with a ``WHERE (sort, id) > (:last_sort, :last_id)``
+    seek instead of OFFSET, so the cost of a page does not depend on how
+    deep into the table it is. NULL sort values come first in ascending
+    order and last in descending order, as MySQL and SQLite sort them; they
+    are paged by id in their own branch, so the seek stays an index range.
+    """
+
+    DIRECTIONS = ("asc", "desc")
+
+    def __init__(self, model, sortable, default_sort="created_at", default_direction="desc"):
+        self.model = model
+        self.sortable = tuple(sortable)
+        self.default_sort = default_sort
+        self.default_direction = default_direction
+
+    def paginate(self, query, cursor=None, limit=None, sort=None, direction=None):
+        sort = sort or self.default_sort
+        direction = (direction or self.default_direction).lower()
+        if sort not in self.sortable:
+            raise ValueError(f"Cannot sort by '{sort}'")
+        if direction not in self.DIRECTIONS:
+            raise ValueError("Direction must be 'asc' or 'desc'")
+        limit = self._resolve_limit(limit)
+
+        sort_column = getattr(self.model, sort)
+        nullable = sort_column.expression.nullable
+        # Rows carry the sort value as stored, which is what the next cursor holds.
+        single = len(query.column_descriptions) == 1
+        query = query.add_columns(stored_form(sort_column))
+        backwards = False
+        if cursor:
+            value, last_id, backwards = self._decode_cursor(cursor, sort_column, nullable)
+            ascending = (direction == "asc") != backwards
+            rows = self._seek(query, sort_column, value, last_id, ascending, nullable, limit + 1)
+        else:
+            ascending = direction == "asc"
+            rows = self._ordered(query, sort_column, ascending).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, bool(cursor)
+
+        def position(row):
+            return row[-1], (row[0] if single else row).id
+
+        return {
+            "items": [row[0] if single else tuple(row[:-1]) for row in rows],
+            "limit": limit,
+            "sort": sort,
+            "direction": direction,
+            "next_cursor": self._encode_cursor(*position(rows[-1]), "next") if has_next and rows else None,
+            "prev_cursor": self._encode_cursor(*position(rows[0]), "prev") if has_prev and rows else None,
+        }
+
+    def _ordered(self, query, sort_column, ascending):
+        if ascending:
+            return query.order_by(sort_column.asc(), self.model.id.asc())
+        return query.order_by(sort_column.desc(), self.model.id.desc())
+
+    def _seek(self, query, sort_column, value, last_id, ascending, nullable, wanted):
+        id_column = self.model.id
+        if value is None:
+            # Still among the NULLs: page them by id. Ascending, the values follow.
+            after = id_column > last_id if ascending else id_column < last_id
+            nulls = query.filter(sort_column.is_(None), after)
+            rows = self._ordered(nulls, sort_column, ascending).limit(wanted).all()
+            if ascending and len(rows) < wanted:
+                rest = self._ordered(query.filter(sort_column.is_not(None)), sort_column, ascending)
+                rows += rest.limit(wanted - len(rows)).all()
+            return rows
+
+        bound = stored_value(sort_column, value)
+        # The redundant bound on the sort column gives the planner an index range.
+        if ascending:
+            seek = and_(sort_column >= bound, or_(sort_column > bound, id_column > last_id))
+        else:
+            seek = and_(sort_column <= bound, or_(sort_column < bound, id_column < last_id))
+        rows = self._ordered(query.filter(seek), sort_column, ascending).limit(wanted).all()
+        if nullable and not ascending and len(rows) < wanted:
+            nulls = self._ordered(query.filter(sort_column.is_(None)), sort_column, ascending)
+            rows += nulls.limit(wanted - len(rows)).all()
+        return rows
+
+    @staticmethod
+    def _resolve_limit(limit):
+        default = current_app.config.get("LIST_PAGE_SIZE", 50)
+        maximum = current_app.config.get("LIST_MAX_PAGE_SIZE", 200)
+        if limit in (None, ""):
+            return default
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("Limit must be a valid number")
+        if limit < 1:
+            raise ValueError("Limit must be greater than zero")
+        return min(limit, maximum)
+
+    @staticmethod
+    def _encode_cursor(value, last_id, step):
+        if isinstance(value, datetime):
+            value = value.isoformat(sep=" ")
+        elif isinstance(value, Decimal):
+            value = str(value)
+        payload = json.dumps([value, last_id, step], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor, sort_column, nullable=False):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            value, last_id, step = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            python_type = sort_column.type.python_type
+            if value is None:
+                pass
+            elif python_type is datetime:
+                parsed = datetime.fromisoformat(value)
+                # SQLite seeks on the stored text; elsewhere on the datetime.
+                if not _stored_as_text(sort_column):
+                    value = parsed
+            elif python_type is Decimal:
+                value = Decimal(value)
+        except (binascii.Error, UnicodeError, TypeError, ValueError, InvalidOperation):
+            raise ValueError("Invalid cursor")
+        if step not in ("next", "prev") or (value is None and not nullable):
+            raise ValueError("Invalid cursor")
+        return value, last_id, step == "prev"
@@ -0,0 +1,228 @@
+from decimal import ROUND_FLOOR, Decimal
+
+from flask import current_app
+from sqlalchemy import Integer, Numeric, String, and_, cast, exists, false, func, literal, select, true
+
+from app.database import db
+from app.models.inventory.product import Product, ProductComponent
+from app.models.pos import ProductStock
+from app.replicas import on_primary
+from app.view_model.product.cache import bom_cache
+
+ONE = Decimal(1)
+
+
+def _number(value):
+    return float(value) if value is not None else None
+
+
+class BomCycleError(ValueError):
+    def __init__(self, path):
+        super().__init__("Component cycle detected: " + " -> ".join(path))
+        self.path = path
+
+
+class BomViewModel:
+    """Bill-of-materials resolution for kits built from ``ProductComponent``.
+
+    A kit's tree is flattened into the total quantity of every leaf
+    component (a product with no components of its own) needed per kit.
+    The rolled-up cost is the sum of leaf costs and the buildable quantity
+    is limited by the scarcest leaf in ``product_stock``.
+
+    On MySQL one recursive CTE expands and sums every path in the database.
+    On SQLite one recursive query fetches the reachable edges and the tree
+    is flattened in process, memoizing shared subassemblies. Resolved trees
+    and costs are cached until a product or component row is written. Stock
+    is always read live, so sales never flush the cache.
+    """
+
+    @staticmethod
+    def resolve(product_id):
+        tree = bom_cache.get(
+            product_id,
+            lambda: BomViewModel._load_tree(product_id),
+            current_app.config.get("BOM_CACHE_TTL", 300),
+        )
+        requirements = tree["requirements"]
+        stock = BomViewModel._stock([product_id, *requirements])
+        buildable = None
+        if requirements:
+            buildable = min(
+                (stock.get(leaf, Decimal(0)) / quantity).to_integral_value(ROUND_FLOOR)
+                for leaf, quantity in requirements.items()
+            )
+            buildable = max(int(buildable), 0)
+        return {
+            "product_id": product_id,
+            "kit": bool(requirements),
+            "depth": tree["depth"],
+            "cost": _number(tree["cost"]),
+            "missing_cost": tree["missing_cost"],
+            "on_hand": _number(stock.get(product_id)),
+            "buildable": buildable,
+            "components": [
+                {
+                    "product_id": leaf,
+                    "name": tree["names"].get(leaf),
+                    "quantity": _number(quantity),
+                    "cost": _number(tree["costs"].get(leaf)),
+                    "on_hand": _number(stock.get(leaf)),
+                }
+                for leaf, quantity in sorted(requirements.items())
+            ],
+        }
+
+    @staticmethod
+    def _backend():
+        backend = current_app.config.get("BOM_RESOLVER_BACKEND", "auto")
+        if backend == "auto":
+            return "memo" if db.engine.dialect.name == "sqlite" else "cte"
+        return backend
+
+    @staticmethod
+    @on_primary
+    def _load_tree(product_id):
+        if not db.session.scalar(select(exists().where(Product.id == product_id))):
+            raise ValueError("Product not found")
+        if BomViewModel._backend() == "cte":
+            requirements, depth = BomViewModel._expand_cte(product_id)
+        else:
+            requirements, depth = BomViewModel._expand_memo(product_id)
+
+        names, costs = {}, {}
+        if requirements:
+            rows = db.session.execute(
+                select(Product.id, Product.name, Product.cost).where(Product.id.in_(list(requirements)))
+            )
+            for leaf, name, leaf_cost in rows:
+                names[leaf] = name
+                costs[leaf] = leaf_cost
+        missing_cost = sorted(leaf for leaf in requirements if costs.get(leaf) is None)
+        cost = sum(
+            (Decimal(costs[leaf]) * quantity for leaf, quantity in requirements.items() if costs.get(leaf) is not None),
+            Decimal(0),
+        )
+        return {
+            "requirements": requirements,
+            "depth": depth,
+            "names": names,
+            "costs": costs,
+            "cost": cost if requirements else None,
+            "missing_cost": missing_cost,
+        }
+
+    @staticmethod
+    def _stock(product_ids):
+        rows = db.session.execute(
+            select(ProductStock.product_id, ProductStock.on_hand).where(ProductStock.product_id.in_(product_ids))
+        )
+        return {product_id: Decimal(on_hand) for product_id, on_hand in rows}
+
+    @staticmethod
+    def _expand_cte(product_id):
+        """Flatten the tree with one recursive query; returns ``(requirements, depth)``"""
+        edges = ProductComponent.__table__
+        quantity = cast(func.coalesce(edges.c.quantity, 1), Numeric(36, 8))
+
+        def marker(column):
+            return literal("/", String) + column + literal("/", String)
+
+        # MySQL types CTE columns from the anchor, so the path gets room to grow.
+        anchor = select(
+            edges.c.component_product_id.label("product_id"),
+            quantity.label("quantity"),
+            literal(1).label("depth"),
+            cast(literal("/", String) + edges.c.parent_product_id + marker(edges.c.component_product_id), String(4000)).label("path"),
+            (edges.c.component_product_id == edges.c.parent_product_id).label("cycle"),
+        ).where(edges.c.parent_product_id == product_id)
+        bom = anchor.cte("bom", recursive=True)
+        bom = bom.union_all(
+            select(
+                edges.c.component_product_id,
+                cast(bom.c.quantity * func.coalesce(edges.c.quantity, 1), Numeric(36, 8)),
+                bom.c.depth + 1,
+                bom.c.path + edges.c.component_product_id + literal("/", String),
+                func.instr(bom.c.path, marker(edges.c.component_product_id)) > 0,
+            ).where(and_(edges.c.parent_product_id == bom.c.product_id, bom.c.cycle == false()))
+        )
+
+        is_leaf = ~exists().where(edges.c.parent_product_id == bom.c.product_id)
+        rows = db.session.execute(
+            select(
+                bom.c.product_id,
+                is_leaf,
+                func.sum(bom.c.quantity),
+                func.max(bom.c.depth),
+                func.max(cast(bom.c.cycle, Integer)),
+            ).group_by(bom.c.product_id)
+        ).all()
+        if any(cycle for *_, cycle in rows):
+            # Only the error path pays for a second expansion.
+            path = db.session.scalar(select(bom.c.path).where(bom.c.cycle == true()).limit(1))
+            raise BomCycleError([part for part in path.split("/") if part])
+
+        requirements = {product: Decimal(total) for product, leaf, total, _, _ in rows if leaf}
+        depth = max((level for _, _, _, level, _ in rows), default=0)
+        return requirements, depth
+
+    @staticmethod
+    def _expand_memo(product_id):
+        """Flatten the tree in process; returns ``(requirements, depth)``.
+
+        One recursive ``UNION`` query collects the edges of every reachable
+        product. It deduplicates products, so shared subassemblies and
+        cycles cannot multiply rows. The flattening pass then visits every
+        product once and runs without recursion, so deep trees cannot
+        overflow the stack.
+        """
+        edges = ProductComponent.__table__
+        reachable = select(literal(product_id, String).label("product_id")).cte("reachable", recursive=True)
+        reachable = reachable.union(
+            select(edges.c.component_product_id).where(edges.c.parent_product_id == reachable.c.product_id)
+        )
+        rows = db.session.execute(
+            select(edges.c.parent_product_id, edges.c.component_product_id, edges.c.quantity)
+            .where(edges.c.parent_product_id.in_(select(reachable.c.product_id)))
+        )
+        children = {}
+        for parent, component, quantity in rows:
+            children.setdefault(parent, []).append((component, ONE if quantity is None else Decimal(quantity)))
+
+        # Iterative post-order walk; ``flattened`` holds finished products.
+        flattened = {}
+        on_path = {product_id}
+        path = [product_id]
+        stack = [(product_id, iter(children.get(product_id, ())))]
+        while stack:
+            node, pending = stack[-1]
+            advanced = False
+            for component, _ in pending:
+                if component in on_path:
+                    raise BomCycleError(path[path.index(component):] + [component])
+                if component not in flattened:
+                    on_path.add(component)
+                    path.append(component)
+                    stack.append((component, iter(children.get(component, ()))))
+                    advanced = True
+                    break
+            if advanced:
+                continue
+            stack.pop()
+            on_path.discard(node)
+            path.pop()
+            if node not in children:
+                flattened[node] = ({node: ONE}, 0)
+                continue
+            requirements = {}
+            depth = 0
+            for component, quantity in children[node]:
+                sub_requirements, sub_depth = flattened[component]
+                depth = max(depth, sub_depth + 1)
+                for leaf, amount in sub_requirements.items():
+                    requirements[leaf] = requirements.get(leaf, 0) + amount * quantity
+            flattened[node] = (requirements, depth)
+
+        if product_id not in children:
+            return {}, 0
+        return flattened[product_id]
@@ -0,0 +1,55 @@
+from itertools import chain
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.cache import VersionedTTLCache
+from app.models.inventory.product import Product, ProductComponent, Taxonomy
+
+taxonomy_cache = VersionedTTLCache("taxonomies")
+bom_cache = VersionedTTLCache("bom")
+
+# Each cache is invalidated whenever a row of one of its models is written.
+WATCHED_MODELS = (
+    (taxonomy_cache, (Taxonomy,)),
+    (bom_cache, (Product, ProductComponent)),
+)
+
+
+def _invalidate(session, caches):
+    written = session.info.setdefault("caches_written", set())
+    for cache in caches:
+        written.add(cache.name)
+        cache.invalidate()
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_flush(session, flush_context):
+    objects = list(chain(session.new, session.dirty, session.deleted))
+    _invalidate(session, [
+        cache
+        for cache, models in WATCHED_MODELS
+        if any(isinstance(obj, models) for obj in objects)
+    ])
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_write(orm_execute_state):
+    if orm_execute_state.is_select or orm_execute_state.bind_mapper is None:
+        return
+    mapper = orm_execute_state.bind_mapper
+    _invalidate(orm_execute_state.session, [
+        cache
+        for cache, models in WATCHED_MODELS
+        if any(mapper is inspect(model) for model in models)
+    ])
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_on_transaction_end(session):
+    # Another thread may have cached uncommitted rows between flush and commit.
+    for name in session.info.pop("caches_written", ()):
+        for cache, _ in WATCHED_MODELS:
+            if cache.name == name:
+                cache.invalidate()
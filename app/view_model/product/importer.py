@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database import db
+from app.models.inventory.product import Product, Taxonomy
+from app.models.types import uuid7
+from app.view_model.product.main import ProductViewModel
+from app.view_model.product.search import product_search_index
+from app.view_model.product.stock import StockViewModel
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+
+class ProductImportViewModel:
+    """Bulk product import from CSV or JSON lines.
+
+    Every row goes through ``ProductViewModel.parse_product_fields``; the
+    taxonomies referenced by the file are resolved in one query and valid
+    rows are written with one executemany INSERT per batch.
+    """
+
+    @staticmethod
+    def detect_format(filename, requested=None):
+        file_format = (requested or "").strip().lower()
+        if not file_format and filename:
+            extension = filename.rsplit(".", 1)[-1].lower()
+            file_format = {"ndjson": "jsonl", "json": "jsonl"}.get(extension, extension)
+        if file_format not in IMPORT_FORMATS:
+            raise ValueError("Import format must be 'csv' or 'jsonl'")
+        return file_format
+
+    @staticmethod
+    def read_rows(stream, file_format):
+        """Yield ``(line number, row dict or error message)`` from a binary stream"""
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        if file_format == "csv":
+            reader = csv.DictReader(text)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_number, "Invalid JSON"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, "Each line must be a JSON object"
+                continue
+            yield line_number, row
+
+    @staticmethod
+    def _normalize(row):
+        """Present a file row like submitted form data: strings, blanks omitted"""
+        return {
+            key: str(value)
+            for key, value in row.items()
+            if key is not None and value is not None and str(value).strip() != ""
+        }
+
+    @staticmethod
+    def import_rows(rows, batch_size=None):
+        if batch_size is None:
+            batch_size = current_app.config.get("IMPORT_BATCH_SIZE", 1000)
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        report = {"total": 0, "imported": 0, "failed": 0, "errors": []}
+
+        def fail(line_number, message):
+            report["failed"] += 1
+            report["errors"].append({"row": line_number, "error": message})
+
+        valid = []
+        taxonomy_ids = set()
+        for line_number, row in rows:
+            report["total"] += 1
+            if isinstance(row, str):
+                fail(line_number, row)
+                continue
+            try:
+                fields = ProductViewModel.parse_product_fields(ProductImportViewModel._normalize(row))
+            except ValueError as e:
+                fail(line_number, str(e))
+                continue
+            if fields["taxonomy_id"]:
+                taxonomy_ids.add(fields["taxonomy_id"])
+            valid.append((line_number, fields))
+
+        labels = ProductImportViewModel._taxonomy_labels(taxonomy_ids)
+
+        batch = []
+        batch_lines = []
+        for line_number, fields in valid:
+            taxonomy_id = fields["taxonomy_id"]
+            if taxonomy_id:
+                if taxonomy_id not in labels:
+                    fail(line_number, "Taxonomy not found")
+                    continue
+                if not fields["category"]:
+                    fields["category"] = labels[taxonomy_id]
+            fields["id"] = uuid7()
+            batch.append(fields)
+            batch_lines.append(line_number)
+            if len(batch) >= batch_size:
+                ProductImportViewModel._flush(batch, batch_lines, report, fail)
+                batch, batch_lines = [], []
+        if batch:
+            ProductImportViewModel._flush(batch, batch_lines, report, fail)
+
+        if report["imported"]:
+            product_search_index.invalidate()
+        report["errors"].sort(key=lambda error: error["row"])
+        return report
+
+    @staticmethod
+    def _taxonomy_labels(taxonomy_ids):
+        if not taxonomy_ids:
+            return {}
+        rows = (
+            Taxonomy.query.with_entities(Taxonomy.id, Taxonomy.name, Taxonomy.value)
+            .filter(Taxonomy.id.in_(taxonomy_ids))
+            .all()
+        )
+        return {
+            taxonomy_id: ProductViewModel.taxonomy_label(name, value)
+            for taxonomy_id, name, value in rows
+        }
+
+    @staticmethod
+    def _flush(batch, batch_lines, report, fail):
+        try:
+            db.session.execute(insert(Product), batch)
+            StockViewModel.create_rows([row["id"] for row in batch])
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            message = f"Batch insert failed: {e.__class__.__name__}"
+            for line_number in batch_lines:
+                fail(line_number, message)
+            return
+        report["imported"] += len(batch)
@@ -5,8 +5,14 @@ class ProductListViewModel:
     def __init__(self):
         self.product_service = ProductViewModel()
 
-    def get_products_table_data(self):
-        return self.product_service.list_products()
+    def get_products_table_data(self, cursor=None, limit=None, sort=None, direction=None, category=None):
+        page = self.product_service.list_products(cursor, limit, sort, direction, category)
+        page["category"] = category
+        page["category_total"] = self.product_service.count_products_in_category(category) if category else None
+        return page
+
+    def get_categories(self):
+        return self.product_service.get_categories()
 
     def delete_product(self, product_id):
         return self.product_service.delete_product(product_id)
\ No newline at end of file
@@ -1,38 +1,145 @@
+from flask import current_app
+from sqlalchemy import func
+
 from app.database import db
 from app.models.inventory.product import Product, Taxonomy
+from app.models.pos import ProductStock
+from app.replicas import on_primary, read_only
+from app.view_model.freshness import FreshnessViewModel
+from app.view_model.pagination import KeysetPaginator
+from app.view_model.product.cache import taxonomy_cache
+from app.view_model.product.search import product_search_index
+from app.view_model.product.stock import StockViewModel
+from app.view_model.product.taxonomy import TaxonomyViewModel
+from app.view_model.read_model import ReadModel
+
+product_paginator = KeysetPaginator(Product, sortable=("created_at", "name"))
+product_list_rows = ReadModel(
+    "ProductListRow",
+    Product.id,
+    Product.name,
+    Product.sku,
+    Product.price,
+    Product.cost,
+    Product.category,
+    Product.created_at,
+    ProductStock.on_hand,
+    ProductStock.low_stock,
+    outerjoins=[(ProductStock, ProductStock.product_id == Product.id)],
+)
+
 
 class ProductViewModel:
     @staticmethod
-    def list_products():
-        return ProductViewModel.get_all_products()
+    @read_only
+    def list_products(cursor=None, limit=None, sort=None, direction=None, category=None):
+        query = product_list_rows.query()
+        if category:
+            query = ProductViewModel._in_category(query, category)
+        page = product_paginator.paginate(query, cursor, limit, sort, direction)
+        page["items"] = product_list_rows.rows(page["items"])
+        return page
+
+    @staticmethod
+    @read_only
+    def count_products_in_category(category):
+        """Products filed under ``category`` or any of its subcategories"""
+        query = db.session.query(func.count(Product.id)).select_from(Product)
+        return ProductViewModel._in_category(query, category).scalar()
 
     @staticmethod
+    def _in_category(query, category):
+        # The subtree prefix comes from the cached tree, so this stays a single query.
+        return query.join(Taxonomy, Taxonomy.id == Product.taxonomy_id).filter(
+            TaxonomyViewModel.subtree_filter(category)
+        )
+
+    @staticmethod
+    @read_only
     def get_all_products():
         products = Product.query.all()
         return [product.to_dict() for product in products]
 
+    @staticmethod
+    @read_only
+    def get_products_page(cursor=None, limit=None, sort=None, direction=None):
+        page = product_paginator.paginate(Product.query, cursor, limit, sort, direction)
+        page["items"] = [product.to_dict() for product in page["items"]]
+        return page
+
+    @staticmethod
+    def get_products_page_state(cursor=None, limit=None, sort=None, direction=None):
+        """Validator state of the page ``get_products_page`` returns for the same arguments"""
+        return FreshnessViewModel.page_state(product_paginator, Product.query, cursor, limit, sort, direction)
+
     @staticmethod
     def get_categories():
-        rows = (
-            Taxonomy.query.with_entities(Taxonomy.id, Taxonomy.name, Taxonomy.value)
-            .filter(Taxonomy.kind == "category")
-            .order_by(Taxonomy.name.asc())
-            .all()
+        """Category options in tree order, labelled with their full breadcrumb"""
+        return list(TaxonomyViewModel.get_category_tree()["options"])
+
+    @staticmethod
+    def get_category_tree_json():
+        return TaxonomyViewModel.get_category_tree()["json"]
+
+    @staticmethod
+    def get_taxonomy_label(taxonomy_id):
+        return taxonomy_cache.get(
+            ("label", taxonomy_id),
+            lambda: ProductViewModel._load_taxonomy_label(taxonomy_id),
+            current_app.config.get("CATEGORY_CACHE_TTL", 300),
         )
-        categories = []
-        for taxonomy_id, taxonomy_name, taxonomy_value in rows:
-            label = (taxonomy_name or taxonomy_value or "").strip()
-            if label:
-                categories.append({"id": taxonomy_id, "label": label})
-        return categories
-    
+
+    @staticmethod
+    def category_cache_stats():
+        return taxonomy_cache.stats()
+
     @staticmethod
+    @on_primary
+    def _load_taxonomy_label(taxonomy_id):
+        row = (
+            Taxonomy.query.with_entities(Taxonomy.name, Taxonomy.value)
+            .filter(Taxonomy.id == taxonomy_id)
+            .first()
+        )
+        return ProductViewModel.taxonomy_label(*row) if row else None
+
+    @staticmethod
+    @read_only
     def get_product_by_id(product_id):
         product = Product.query.get(product_id)
         return product.to_dict() if product else None
     
     @staticmethod
     def create_product(form_data):
+        fields = ProductViewModel.parse_product_fields(form_data)
+        fields["category"] = ProductViewModel._resolve_category(fields["taxonomy_id"], fields["category"])
+
+        new_product = Product(**fields)
+        db.session.add(new_product)
+        db.session.flush()
+        StockViewModel.create_rows([new_product.id])
+        db.session.commit()
+        product = new_product.to_dict()
+        product_search_index.upsert(product)
+        return product
+
+    @staticmethod
+    def _resolve_category(taxonomy_id, category):
+        """Reject unknown taxonomies, as the importer does, and default ``category`` to the taxonomy label"""
+        if not taxonomy_id:
+            return category
+        taxonomy = Taxonomy.query.get(taxonomy_id)
+        if taxonomy is None:
+            raise ValueError("Taxonomy not found")
+        return category or ProductViewModel.taxonomy_label(taxonomy.name, taxonomy.value)
+
+    @staticmethod
+    def taxonomy_label(name, value):
+        return (name or value or "").strip() or None
+
+    @staticmethod
+    def parse_product_fields(form_data):
+        """Validate new-product input and return the column values to insert"""
         name = form_data.get("name", "").strip()
         sku = form_data.get("sku", "").strip() or None
         taxonomy_id = form_data.get("taxonomy_id", "").strip() or None
@@ -41,11 +148,6 @@ class ProductViewModel:
             form_data.get("attribute_combinations", "").strip() or None
         )
 
-        if taxonomy_id and not category:
-            taxonomy = Taxonomy.query.get(taxonomy_id)
-            if taxonomy:
-                category = (taxonomy.name or taxonomy.value or "").strip() or None
-
         if not name:
             raise ValueError("Name is required")
 
@@ -64,19 +166,16 @@ class ProductViewModel:
         except (TypeError, ValueError):
             raise ValueError("Tax rate must be a valid number")
 
-        new_product = Product(
-            name=name,
-            price=price,
-            cost=cost,
-            sku=sku,
-            category=category,
-            tax_rate=tax_rate,
-            taxonomy_id=taxonomy_id,
-            attribute_combinations=attribute_combinations,
-        )
-        db.session.add(new_product)
-        db.session.commit()
-        return new_product.to_dict()
+        return {
+            "name": name,
+            "price": price,
+            "cost": cost,
+            "sku": sku,
+            "category": category,
+            "tax_rate": tax_rate,
+            "taxonomy_id": taxonomy_id,
+            "attribute_combinations": attribute_combinations,
+        }
 
     @staticmethod
     def update_product(product_id, form_data):
@@ -107,17 +206,15 @@ class ProductViewModel:
         except (TypeError, ValueError):
             raise ValueError("Tax rate must be a valid number")
 
+        taxonomy_id = form_data.get("taxonomy_id", "").strip() or None
+        category = ProductViewModel._resolve_category(
+            taxonomy_id, form_data.get("category", "").strip() or None
+        )
+
         product.name = name
         product.sku = form_data.get("sku", "").strip() or None
         product.price = price
         product.cost = cost
-        taxonomy_id = form_data.get("taxonomy_id", "").strip() or None
-        category = form_data.get("category", "").strip() or None
-        if taxonomy_id and not category:
-            taxonomy = Taxonomy.query.get(taxonomy_id)
-            if taxonomy:
-                category = (taxonomy.name or taxonomy.value or "").strip() or None
-
         product.category = category
         product.tax_rate = tax_rate
         product.taxonomy_id = taxonomy_id
@@ -126,7 +223,9 @@ class ProductViewModel:
         )
 
         db.session.commit()
-        return product.to_dict()
+        updated = product.to_dict()
+        product_search_index.upsert(updated)
+        return updated
 
     @staticmethod
     def delete_product(product_id):
@@ -134,6 +233,8 @@ class ProductViewModel:
         if not product:
             raise ValueError("Product not found")
 
+        StockViewModel.delete_row(product_id)
         db.session.delete(product)
         db.session.commit()
+        product_search_index.remove(product_id)
         return True
\ No newline at end of file
@@ -0,0 +1,312 @@
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+
+from flask import current_app
+from sqlalchemy import or_
+from sqlalchemy.dialects.mysql import match
+
+from app.database import db
+from app.models.inventory.product import Product
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+SCORE_SKU_EXACT = 100
+SCORE_SKU_PREFIX = 90
+SCORE_NAME_EXACT = 40
+SCORE_NAME_PREFIX = 20
+SCORE_WORD_PREFIX = 60
+SCORE_SUBSTRING = 40
+
+
+def _normalize(value):
+    return " ".join((value or "").lower().split())
+
+
+def _trigrams(value):
+    return {value[index:index + 3] for index in range(len(value) - 2)}
+
+
+def _prefix_range(keys, prefix):
+    """Yield ids whose key starts with ``prefix`` from a sorted ``(key, id)`` list"""
+    index = bisect_left(keys, (prefix, ""))
+    while index < len(keys) and keys[index][0].startswith(prefix):
+        yield keys[index]
+        index += 1
+
+
+class ProductSearchIndex:
+    """In-process SKU prefix, word prefix and trigram index over products.
+
+    Used where the database has no FULLTEXT support (SQLite in tests and
+    development). The index is built on first use with one query and then
+    kept current by the product view model on create/update/delete;
+    ``invalidate`` forces a rebuild after bulk writes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._engine = None
+        self._docs = {}
+        self._sku_keys = []
+        self._word_keys = []
+        self._trigrams = {}
+
+    def invalidate(self):
+        with self._lock:
+            self._engine = None
+
+    def _ensure_built(self):
+        engine = db.engine
+        if self._engine is engine:
+            return
+        with self._lock:
+            if self._engine is engine:
+                return
+            self._docs, self._sku_keys, self._word_keys, self._trigrams = {}, [], [], {}
+            rows = Product.query.with_entities(Product.id, Product.name, Product.sku, Product.price)
+            for product_id, name, sku, price in rows:
+                self._add(product_id, name, sku, price)
+            self._sku_keys.sort()
+            self._word_keys.sort()
+            self._engine = engine
+
+    def _add(self, product_id, name, sku, price, keep_sorted=False):
+        add_key = insort if keep_sorted else list.append
+        name_key = _normalize(name)
+        sku_key = _normalize(sku)
+        self._docs[product_id] = (name, sku, price, name_key, sku_key)
+        if sku_key:
+            add_key(self._sku_keys, (sku_key, product_id))
+        for word in set(_TOKEN.findall(name_key)):
+            add_key(self._word_keys, (word, product_id))
+        for trigram in _trigrams(name_key):
+            self._trigrams.setdefault(trigram, set()).add(product_id)
+
+    def _discard(self, product_id):
+        doc = self._docs.pop(product_id, None)
+        if not doc:
+            return
+        name_key, sku_key = doc[3], doc[4]
+        keys = [(self._sku_keys, sku_key)] if sku_key else []
+        keys += [(self._word_keys, word) for word in set(_TOKEN.findall(name_key))]
+        for sorted_keys, key in keys:
+            index = bisect_left(sorted_keys, (key, product_id))
+            if index < len(sorted_keys) and sorted_keys[index] == (key, product_id):
+                del sorted_keys[index]
+        for trigram in _trigrams(name_key):
+            ids = self._trigrams.get(trigram)
+            if ids:
+                ids.discard(product_id)
+                if not ids:
+                    del self._trigrams[trigram]
+
+    def upsert(self, product):
+        with self._lock:
+            if self._engine is not db.engine:
+                return
+            self._discard(product["id"])
+            self._add(product["id"], product["name"], product["sku"], product["price"], keep_sorted=True)
+
+    def remove(self, product_id):
+        with self._lock:
+            if self._engine is db.engine:
+                self._discard(product_id)
+
+    def search(self, query, limit):
+        self._ensure_built()
+        query = _normalize(query)
+        with self._lock:
+            scores = {}
+            for sku_key, product_id in _prefix_range(self._sku_keys, query):
+                scores[product_id] = SCORE_SKU_EXACT if sku_key == query else SCORE_SKU_PREFIX
+
+            term_matches = []
+            for term in _TOKEN.findall(query):
+                prefix_ids = {product_id for _, product_id in _prefix_range(self._word_keys, term)}
+                substring_ids = set()
+                if len(term) >= 3:
+                    postings = sorted((self._trigrams.get(t, set()) for t in _trigrams(term)), key=len)
+                    substring_ids = set.intersection(*postings) - prefix_ids
+                    if len(term) > 3:
+                        # Sharing every trigram does not guarantee a substring match.
+                        substring_ids = {
+                            product_id for product_id in substring_ids if term in self._docs[product_id][3]
+                        }
+                term_matches.append((prefix_ids, substring_ids))
+
+            if term_matches:
+                matches = sorted((prefix | substring for prefix, substring in term_matches), key=len)
+                for product_id in set.intersection(*matches):
+                    name_key = self._docs[product_id][3]
+                    score = sum(
+                        SCORE_WORD_PREFIX if product_id in prefix else SCORE_SUBSTRING
+                        for prefix, _ in term_matches
+                    )
+                    if name_key == query:
+                        score += SCORE_NAME_EXACT
+                    elif name_key.startswith(query):
+                        score += SCORE_NAME_PREFIX
+                    if score > scores.get(product_id, 0):
+                        scores[product_id] = score
+
+            docs = self._docs
+            ranked = heapq.nsmallest(
+                limit,
+                scores.items(),
+                key=lambda item: (-item[1], len(docs[item[0]][3]), docs[item[0]][3], item[0]),
+            )
+            return [
+                _result(product_id, *self._docs[product_id][:3], score)
+                for product_id, score in ranked
+            ]
+
+
+def _like_escape(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _name_bonus(name_key, query):
+    if name_key == query:
+        return SCORE_NAME_EXACT
+    if name_key.startswith(query):
+        return SCORE_NAME_PREFIX
+    return 0
+
+
+def _result(product_id, name, sku, price, score):
+    return {
+        "id": product_id,
+        "name": name,
+        "sku": sku,
+        "price": float(price) if price is not None else None,
+        "score": score,
+    }
+
+
+product_search_index = ProductSearchIndex()
+
+
+class ProductSearchViewModel:
+    """Ranked product lookup by SKU/barcode prefix or partial name.
+
+    On MySQL this is an indexed ``sku`` range scan plus a FULLTEXT
+    ``MATCH ... AGAINST`` on ``name``; elsewhere the in-process
+    ``ProductSearchIndex`` answers. FULLTEXT only finds word prefixes and
+    ignores terms shorter than ``innodb_ft_min_token_size``, so when it
+    returns fewer than ``limit`` rows, or a term is that short, a ``LIKE``
+    pass finds the rest: partial words such as ``presso`` for "Espresso",
+    scored ``SCORE_SUBSTRING`` as in the in-process index. That pass is a
+    scan stopped by its ``LIMIT``, so it is cheap when matches are common
+    and reads the whole table when they are rare.
+    """
+
+    @staticmethod
+    def search(query, limit=None):
+        query = (query or "").strip()
+        if not query:
+            raise ValueError("Search query is required")
+        limit = ProductSearchViewModel._resolve_limit(limit)
+        if ProductSearchViewModel._backend() == "fulltext":
+            return ProductSearchViewModel._fulltext_search(query, limit)
+        return product_search_index.search(query, limit)
+
+    @staticmethod
+    def _resolve_limit(limit):
+        maximum = current_app.config.get("PRODUCT_SEARCH_MAX_RESULTS", 50)
+        if limit in (None, ""):
+            return current_app.config.get("PRODUCT_SEARCH_RESULTS", 20)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("Limit must be a valid number")
+        if limit < 1:
+            raise ValueError("Limit must be greater than zero")
+        return min(limit, maximum)
+
+    @staticmethod
+    def _backend():
+        backend = current_app.config.get("PRODUCT_SEARCH_BACKEND", "auto")
+        if backend == "auto":
+            return "fulltext" if db.engine.dialect.name == "mysql" else "memory"
+        return backend
+
+    @staticmethod
+    def _fulltext_search(query, limit):
+        normalized = _normalize(query)
+        escaped = _like_escape(normalized)
+        columns = (Product.id, Product.name, Product.sku, Product.price)
+
+        scores = {}
+        docs = {}
+        sku_rows = (
+            Product.query.with_entities(*columns)
+            .filter(Product.sku.like(escaped + "%", escape="\\"))
+            .order_by(Product.sku)
+            .limit(limit)
+        )
+        for product_id, name, sku, price in sku_rows:
+            docs[product_id] = (name, sku, price)
+            scores[product_id] = SCORE_SKU_EXACT if _normalize(sku) == normalized else SCORE_SKU_PREFIX
+
+        terms = _TOKEN.findall(normalized)
+        min_token = current_app.config.get("PRODUCT_SEARCH_FULLTEXT_MIN_TOKEN", 3)
+        if terms and all(len(term) >= min_token for term in terms):
+            boolean_query = " ".join(f"+{term}*" for term in terms)
+            relevance = match(Product.name, against=boolean_query).in_boolean_mode()
+            name_rows = (
+                Product.query.with_entities(*columns, relevance.label("relevance"))
+                .filter(relevance > 0)
+                .order_by(relevance.desc())
+                .limit(limit)
+            )
+            for product_id, name, sku, price, score in name_rows:
+                ranked = SCORE_WORD_PREFIX * len(terms) + min(int(score), SCORE_WORD_PREFIX - 1)
+                docs[product_id] = (name, sku, price)
+                scores[product_id] = max(
+                    scores.get(product_id, 0), ranked + _name_bonus(_normalize(name), normalized)
+                )
+
+        if terms and len(scores) < limit:
+            for product_id, name, sku, price, score in ProductSearchViewModel._substring_search(
+                normalized, terms, limit - len(scores), exclude=list(scores)
+            ):
+                docs[product_id] = (name, sku, price)
+                scores[product_id] = score
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (-item[1], len(docs[item[0]][0] or ""), docs[item[0]][0] or "", item[0]),
+        )[:limit]
+        return [_result(product_id, *docs[product_id], score) for product_id, score in ranked]
+
+    @staticmethod
+    def _substring_search(normalized, terms, limit, exclude=()):
+        """Up to ``limit`` products whose name contains every term, scored like ``ProductSearchIndex``.
+
+        As there, a term matches as a word prefix (``SCORE_WORD_PREFIX``) or,
+        from three characters on, anywhere in the name (``SCORE_SUBSTRING``).
+        """
+        query = Product.query.with_entities(Product.id, Product.name, Product.sku, Product.price)
+        for term in terms:
+            if len(term) >= 3:
+                query = query.filter(Product.name.like(f"%{_like_escape(term)}%", escape="\\"))
+            else:
+                query = query.filter(or_(
+                    Product.name.like(f"{_like_escape(term)}%", escape="\\"),
+                    Product.name.like(f"% {_like_escape(term)}%", escape="\\"),
+                ))
+        if exclude:
+            query = query.filter(Product.id.not_in(exclude))
+
+        rows = []
+        for product_id, name, sku, price in query.limit(limit):
+            name_key = _normalize(name)
+            words = _TOKEN.findall(name_key)
+            score = sum(
+                SCORE_WORD_PREFIX if any(word.startswith(term) for word in words) else SCORE_SUBSTRING
+                for term in terms
+            )
+            rows.append((product_id, name, sku, price, score + _name_bonus(name_key, normalized)))
+        return rows
@@ -0,0 +1,212 @@
+from decimal import Decimal
+
+from flask import current_app
+from sqlalchemy import bindparam, delete, func, insert, select, update
+
+from app.database import db
+from app.models.inventory.product import Product
+from app.models.pos import Inventory, ProductStock, Warehouse
+from app.replicas import read_only
+
+QUANTITY = Decimal("0.0001")
+
+
+class StockViewModel:
+    """Per-product stock totals kept in step with ``inventories``.
+
+    Every write joins the caller's transaction and never commits, so the
+    summary changes atomically with the inventory rows it describes.
+    ``rebuild`` recomputes it from scratch when the two have drifted.
+    """
+
+    @staticmethod
+    def default_reorder_level():
+        return Decimal(current_app.config.get("LOW_STOCK_THRESHOLD", 5))
+
+    @staticmethod
+    def create_rows(product_ids, reorder_level=None):
+        """Add empty summaries for new products"""
+        if not product_ids:
+            return
+        level = StockViewModel.default_reorder_level() if reorder_level is None else reorder_level
+        db.session.execute(
+            insert(ProductStock.__table__),
+            [
+                {"product_id": product_id, "on_hand": 0, "reorder_level": level, "low_stock": level >= 0}
+                for product_id in product_ids
+            ],
+        )
+
+    @staticmethod
+    def delete_row(product_id):
+        db.session.execute(delete(ProductStock.__table__).where(ProductStock.product_id == product_id))
+
+    @staticmethod
+    def apply_movements(movements):
+        """Add ``{product_id: delta}`` to the totals as atomic increments.
+
+        Rows are updated in product id order, matching the order inventory
+        rows are locked in. Products without a summary row get one built from
+        ``inventories``, which already includes this transaction's changes.
+        """
+        deltas = sorted((product_id, delta) for product_id, delta in movements.items() if delta)
+        if not deltas:
+            return
+        table = ProductStock.__table__
+        new_on_hand = table.c.on_hand + bindparam("delta")
+        # low_stock is assigned first: MySQL evaluates SET left to right, so
+        # this keeps both dialects reading the pre-update on_hand.
+        increment = (
+            update(table)
+            .where(table.c.product_id == bindparam("p_id"))
+            .ordered_values(
+                (table.c.low_stock, new_on_hand <= table.c.reorder_level),
+                (table.c.on_hand, new_on_hand),
+            )
+        )
+        result = db.session.execute(
+            increment, [{"p_id": product_id, "delta": delta} for product_id, delta in deltas]
+        )
+        if result.rowcount != len(deltas):
+            product_ids = [product_id for product_id, _ in deltas]
+            existing = set(
+                db.session.scalars(select(table.c.product_id).where(table.c.product_id.in_(product_ids)))
+            )
+            StockViewModel._insert_from_inventory([pid for pid in product_ids if pid not in existing])
+
+    @staticmethod
+    def _inventory_totals(product_ids):
+        rows = db.session.execute(
+            select(Inventory.product_id, func.coalesce(func.sum(Inventory.quantity), 0))
+            .where(Inventory.product_id.in_(product_ids))
+            .group_by(Inventory.product_id)
+        )
+        # SQLite sums REAL values; round to the column scale before comparing.
+        return {product_id: Decimal(str(total)).quantize(QUANTITY) for product_id, total in rows}
+
+    @staticmethod
+    def _insert_from_inventory(product_ids):
+        if not product_ids:
+            return
+        totals = StockViewModel._inventory_totals(product_ids)
+        level = StockViewModel.default_reorder_level()
+        db.session.execute(
+            insert(ProductStock.__table__),
+            [
+                {
+                    "product_id": product_id,
+                    "on_hand": totals.get(product_id, 0),
+                    "reorder_level": level,
+                    "low_stock": totals.get(product_id, 0) <= level,
+                }
+                for product_id in product_ids
+            ],
+        )
+
+    @staticmethod
+    @read_only
+    def get_stock(product_id):
+        """Summary plus the per-warehouse breakdown of one product"""
+        summary = db.session.get(ProductStock, product_id)
+        warehouses = db.session.execute(
+            select(Inventory.warehouse_id, Warehouse.name, Inventory.quantity)
+            .outerjoin(Warehouse, Warehouse.id == Inventory.warehouse_id)
+            .where(Inventory.product_id == product_id)
+            .order_by(Warehouse.name, Inventory.warehouse_id)
+        ).all()
+        return {
+            "on_hand": summary.on_hand if summary else None,
+            "reorder_level": summary.reorder_level if summary else None,
+            "low_stock": summary.low_stock if summary else None,
+            "warehouses": [
+                {"warehouse_id": warehouse_id, "name": name, "quantity": quantity}
+                for warehouse_id, name, quantity in warehouses
+            ],
+        }
+
+    @staticmethod
+    @read_only
+    def low_stock(limit=None):
+        """Products at or below their reorder level, emptiest first"""
+        maximum = current_app.config.get("LIST_MAX_PAGE_SIZE", 200)
+        try:
+            limit = current_app.config.get("LOW_STOCK_RESULTS", 100) if limit in (None, "") else int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("Limit must be a valid number")
+        if limit < 1:
+            raise ValueError("Limit must be greater than zero")
+
+        rows = db.session.execute(
+            select(
+                ProductStock.product_id,
+                Product.name,
+                Product.sku,
+                ProductStock.on_hand,
+                ProductStock.reorder_level,
+            )
+            .join(Product, Product.id == ProductStock.product_id)
+            .where(ProductStock.low_stock.is_(True))
+            .order_by(ProductStock.on_hand, ProductStock.product_id)
+            .limit(min(limit, maximum))
+        )
+        return [row._asdict() for row in rows]
+
+    @staticmethod
+    def rebuild(batch_size=1000, fix=False, progress=None):
+        """Compare (and with ``fix``, repair) every summary against ``inventories``.
+
+        Products are walked in id order, ``batch_size`` at a time, with one
+        aggregate query per chunk; each repaired chunk is committed on its own.
+        ``progress`` is called with the number of products checked so far.
+        """
+        table = ProductStock.__table__
+        report = {"products": 0, "missing": 0, "mismatched": 0, "orphaned": 0}
+        last_id = None
+        while True:
+            query = select(Product.id).order_by(Product.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(Product.id > last_id)
+            product_ids = db.session.scalars(query).all()
+            if not product_ids:
+                break
+            last_id = product_ids[-1]
+            report["products"] += len(product_ids)
+            if progress:
+                progress(report["products"])
+
+            totals = StockViewModel._inventory_totals(product_ids)
+            stored = {
+                row.product_id: row
+                for row in db.session.execute(
+                    select(table.c.product_id, table.c.on_hand, table.c.reorder_level, table.c.low_stock)
+                    .where(table.c.product_id.in_(product_ids))
+                )
+            }
+            missing = [product_id for product_id in product_ids if product_id not in stored]
+            changed = []
+            for product_id, row in stored.items():
+                on_hand = totals.get(product_id, Decimal(0))
+                low_stock = on_hand <= row.reorder_level
+                if Decimal(row.on_hand).quantize(QUANTITY) != on_hand or bool(row.low_stock) != low_stock:
+                    changed.append({"p_id": product_id, "total": on_hand, "low": low_stock})
+            report["missing"] += len(missing)
+            report["mismatched"] += len(changed)
+
+            if fix and (missing or changed):
+                if changed:
+                    db.session.execute(
+                        update(table)
+                        .where(table.c.product_id == bindparam("p_id"))
+                        .values(on_hand=bindparam("total"), low_stock=bindparam("low")),
+                        changed,
+                    )
+                StockViewModel._insert_from_inventory(missing)
+                db.session.commit()
+
+        orphaned = table.c.product_id.not_in(select(Product.id))
+        if fix:
+            report["orphaned"] = db.session.execute(delete(table).where(orphaned)).rowcount
+            db.session.commit()
+        else:
+            report["orphaned"] = db.session.scalar(select(func.count()).select_from(table).where(orphaned))
+        return report
@@ -0,0 +1,247 @@
+import json
+
+from flask import current_app
+from sqlalchemy import and_, func, literal, select, update
+
+from app.database import db
+from app.models.inventory.product import Product, ProductTaxonomy, Taxonomy, child_path
+from app.models.types import uuid7
+from app.replicas import on_primary
+from app.view_model.product.cache import taxonomy_cache
+
+# path is "/<root id>/.../<own id>/"; 20 levels of 36-character ids fit the indexed column.
+MAX_DEPTH = 20
+
+
+def _label(name, value):
+    return (name or value or "").strip() or None
+
+
+def _in_subtree(path):
+    # Paths hold only ids and "/", and "0" sorts right after "/", so a subtree
+    # is one half-open range. Unlike LIKE, both SQLite and MySQL seek it on an index.
+    return and_(Taxonomy.path >= path, Taxonomy.path < path[:-1] + "0")
+
+
+class TaxonomyViewModel:
+    """Taxonomy hierarchy kept as a materialized path.
+
+    Every taxonomy stores the ids from its root down to itself in ``path``,
+    so a whole subtree is one indexed range of paths. Writes go through this
+    class, which rewrites the paths of a moved or removed subtree with one
+    UPDATE; ``rebuild_paths`` repairs rows written around it.
+    """
+
+    @staticmethod
+    def create_taxonomy(form_data):
+        name = (form_data.get("name") or "").strip()
+        if not name:
+            raise ValueError("Name is required")
+        parent_id = (form_data.get("parent_id") or "").strip() or None
+        parent = TaxonomyViewModel._get(parent_id) if parent_id else None
+
+        taxonomy = Taxonomy(
+            id=uuid7(),
+            name=name,
+            slug=(form_data.get("slug") or "").strip() or None,
+            kind=(form_data.get("kind") or "category").strip(),
+            parent_id=parent_id,
+        )
+        try:
+            taxonomy.ordering = int(form_data.get("ordering") or 0)
+        except (TypeError, ValueError):
+            raise ValueError("Ordering must be a valid number")
+        taxonomy.depth = parent.depth + 1 if parent else 0
+        if taxonomy.depth >= MAX_DEPTH:
+            raise ValueError(f"Taxonomies cannot be nested more than {MAX_DEPTH} levels")
+
+        taxonomy.path = child_path(parent.path if parent else None, taxonomy.id)
+        db.session.add(taxonomy)
+        db.session.commit()
+        return TaxonomyViewModel._to_dict(taxonomy)
+
+    @staticmethod
+    def move_taxonomy(taxonomy_id, parent_id):
+        """Re-parent a taxonomy; its whole subtree moves with it"""
+        taxonomy = TaxonomyViewModel._get(taxonomy_id)
+        parent = TaxonomyViewModel._get(parent_id) if parent_id else None
+        if parent and parent.path.startswith(taxonomy.path):
+            raise ValueError("A taxonomy cannot be moved under itself or its descendants")
+
+        new_path = child_path(parent.path if parent else None, taxonomy.id)
+        depth_change = (parent.depth + 1 if parent else 0) - taxonomy.depth
+        deepest = db.session.scalar(
+            select(func.max(Taxonomy.depth)).where(_in_subtree(taxonomy.path))
+        )
+        if (deepest or taxonomy.depth) + depth_change >= MAX_DEPTH:
+            raise ValueError(f"Taxonomies cannot be nested more than {MAX_DEPTH} levels")
+
+        TaxonomyViewModel._rewrite_subtree(taxonomy.path, new_path, depth_change)
+        db.session.execute(
+            update(Taxonomy).where(Taxonomy.id == taxonomy.id).values(parent_id=parent.id if parent else None),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.commit()
+        db.session.expire_all()
+        return TaxonomyViewModel._to_dict(TaxonomyViewModel._get(taxonomy_id))
+
+    @staticmethod
+    def delete_taxonomy(taxonomy_id):
+        """Delete a taxonomy, lifting its children and products to its parent"""
+        taxonomy = TaxonomyViewModel._get(taxonomy_id)
+        parent = TaxonomyViewModel._get(taxonomy.parent_id) if taxonomy.parent_id else None
+        parent_id = parent.id if parent else None
+        old_path = taxonomy.path
+
+        children = db.session.scalars(select(Taxonomy.id).where(Taxonomy.parent_id == taxonomy.id)).all()
+        db.session.execute(
+            update(Taxonomy).where(Taxonomy.parent_id == taxonomy.id).values(parent_id=parent_id),
+            execution_options={"synchronize_session": False},
+        )
+        for child_id in children:
+            TaxonomyViewModel._rewrite_subtree(
+                child_path(old_path, child_id), child_path(parent.path if parent else None, child_id), -1
+            )
+        db.session.execute(
+            update(Product)
+            .where(Product.taxonomy_id == taxonomy.id)
+            .values(taxonomy_id=parent_id, category=_label(parent.name, parent.value) if parent else None),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.execute(
+            ProductTaxonomy.__table__.delete().where(ProductTaxonomy.taxonomy_id == taxonomy.id)
+        )
+        db.session.delete(taxonomy)
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def _rewrite_subtree(old_path, new_path, depth_change):
+        db.session.execute(
+            update(Taxonomy)
+            .where(_in_subtree(old_path))
+            .values(
+                path=literal(new_path) + func.substr(Taxonomy.path, len(old_path) + 1),
+                depth=Taxonomy.depth + depth_change,
+            ),
+            execution_options={"synchronize_session": False},
+        )
+
+    @staticmethod
+    def _get(taxonomy_id):
+        taxonomy = db.session.get(Taxonomy, taxonomy_id)
+        if not taxonomy:
+            raise ValueError("Taxonomy not found")
+        return taxonomy
+
+    @staticmethod
+    def _to_dict(taxonomy):
+        return {
+            "id": taxonomy.id,
+            "name": taxonomy.name,
+            "kind": taxonomy.kind,
+            "parent_id": taxonomy.parent_id,
+            "path": taxonomy.path,
+            "depth": taxonomy.depth,
+        }
+
+    @staticmethod
+    def subtree_path(taxonomy_id):
+        """Path prefix shared by a category and all of its descendants"""
+        node = TaxonomyViewModel.get_category_tree()["index"].get(taxonomy_id)
+        if node is None:
+            raise ValueError("Category not found")
+        if node["path"] is None:
+            raise ValueError("Category has no path yet; run `flask taxonomy-paths --rebuild`")
+        return node["path"]
+
+    @staticmethod
+    def subtree_filter(taxonomy_id):
+        """Clause matching taxonomies under ``taxonomy_id``, for queries joined to taxonomies"""
+        return _in_subtree(TaxonomyViewModel.subtree_path(taxonomy_id))
+
+    @staticmethod
+    def get_category_tree():
+        """Cached category forest: ``roots`` (nested), ``index`` by id and its ``json``"""
+        return taxonomy_cache.get(
+            "category_tree",
+            TaxonomyViewModel._load_category_tree,
+            current_app.config.get("CATEGORY_CACHE_TTL", 300),
+        )
+
+    @staticmethod
+    @on_primary
+    def _load_category_tree():
+        rows = db.session.execute(
+            select(Taxonomy.id, Taxonomy.name, Taxonomy.value, Taxonomy.parent_id, Taxonomy.path, Taxonomy.depth)
+            .where(Taxonomy.kind == "category")
+            .order_by(Taxonomy.depth, Taxonomy.ordering, Taxonomy.name)
+        )
+        index = {}
+        roots = []
+        for taxonomy_id, name, value, parent_id, path, depth in rows:
+            node = {
+                "id": taxonomy_id,
+                "label": _label(name, value),
+                "path": path,
+                "depth": depth,
+                "children": [],
+            }
+            index[taxonomy_id] = node
+            # Rows arrive parents first, so a missing parent means it is not a category.
+            parent = index.get(parent_id)
+            (parent["children"] if parent else roots).append(node)
+
+        options = []
+        stack = [(node, ()) for node in reversed(roots)]
+        while stack:
+            node, trail = stack.pop()
+            if node["label"]:
+                trail = trail + (node["label"],)
+            # Without a path the category cannot be filtered on until rebuild_paths runs.
+            if node["label"] and node["path"]:
+                options.append({"id": node["id"], "label": " › ".join(trail), "depth": node["depth"]})
+            stack.extend((child, trail) for child in reversed(node["children"]))
+
+        return {
+            "roots": roots,
+            "index": index,
+            "options": options,
+            "json": json.dumps(roots, separators=(",", ":"), ensure_ascii=False),
+        }
+
+    @staticmethod
+    def rebuild_paths(fix=False):
+        """Recompute every path and depth from ``parent_id``; report (and fix) drift"""
+        rows = db.session.execute(select(Taxonomy.id, Taxonomy.parent_id, Taxonomy.path, Taxonomy.depth)).all()
+        parents = {taxonomy_id: parent_id for taxonomy_id, parent_id, _, _ in rows}
+        children = {}
+        for taxonomy_id, parent_id in parents.items():
+            # Rows pointing at a missing parent are treated as roots.
+            children.setdefault(parent_id if parent_id in parents else None, []).append(taxonomy_id)
+
+        expected = {}
+        stack = [(root, None, 0) for root in children.get(None, [])]
+        while stack:
+            taxonomy_id, parent_path, depth = stack.pop()
+            path = child_path(parent_path, taxonomy_id)
+            expected[taxonomy_id] = (path, depth)
+            stack.extend((child, path, depth + 1) for child in children.get(taxonomy_id, []))
+
+        cycles = sorted(taxonomy_id for taxonomy_id in parents if taxonomy_id not in expected)
+        changed = [
+            {"t_id": taxonomy_id, "new_path": expected[taxonomy_id][0], "new_depth": expected[taxonomy_id][1]}
+            for taxonomy_id, _, path, depth in rows
+            if taxonomy_id in expected and (path, depth) != expected[taxonomy_id]
+        ]
+        if fix and changed:
+            table = Taxonomy.__table__
+            db.session.execute(
+                update(table)
+                .where(table.c.id == db.bindparam("t_id"))
+                .values(path=db.bindparam("new_path"), depth=db.bindparam("new_depth")),
+                changed,
+            )
+            db.session.commit()
+            taxonomy_cache.invalidate()
+        return {"taxonomies": len(rows), "mismatched": len(changed), "cycles": cycles}
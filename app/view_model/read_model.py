@@ -0,0 +1,28 @@
+from collections import namedtuple
+
+from app.database import db
+
+
+class ReadModel:
+    """Column projection for pages that only render a few fields.
+
+    Selects just ``columns`` and returns each row as a namedtuple, so no ORM
+    instance, identity-map entry or change-tracking state is built and unused
+    Text columns never leave the database. Numeric values stay ``Decimal``;
+    templates format them with the ``money`` filter when they are rendered.
+    """
+
+    def __init__(self, name, *columns, outerjoins=()):
+        self.columns = columns
+        self.outerjoins = tuple(outerjoins)
+        self.row = namedtuple(name, [column.key for column in columns])
+
+    def query(self):
+        query = db.session.query(*self.columns)
+        for target, onclause in self.outerjoins:
+            query = query.outerjoin(target, onclause)
+        return query
+
+    def rows(self, results):
+        make = self.row._make
+        return [make(result) for result in results]
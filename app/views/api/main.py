@@ -0,0 +1,78 @@
+from flask import jsonify, request
+from werkzeug.http import is_resource_modified
+
+from app.view_model.freshness import FreshnessViewModel
+
+
+class ApiView:
+    """JSON resources with conditional GET.
+
+    Validators are computed from row keys and versions before anything is
+    serialized; when the client already holds the current representation
+    the response is an empty 304. Last-Modified has one-second resolution,
+    so clients should revalidate with the ETag (If-None-Match).
+    """
+
+    def __init__(self):
+        self.freshness_view_model = FreshnessViewModel()
+
+    def render_list(self, model, page_loader, state_loader, filters=()):
+        """One page of ``model``; query args named in ``filters`` are passed to both loaders as ``filters``.
+
+        ``state_loader`` takes the same arguments as ``page_loader`` and
+        returns the page's validator state, see ``FreshnessViewModel.page_state``.
+        """
+        options = {"filters": {name: request.args.get(name) for name in filters}} if filters else {}
+        arguments = dict(
+            cursor=request.args.get("cursor"),
+            limit=request.args.get("limit"),
+            sort=request.args.get("sort"),
+            direction=request.args.get("direction"),
+            **options,
+        )
+        try:
+            state, last_modified = state_loader(**arguments)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        params = sorted(request.args.items(multi=True))
+        etag = self.freshness_view_model.etag(model.__tablename__, state, params)
+
+        def build():
+            page = page_loader(**arguments)
+            return {
+                "items": page["items"],
+                "limit": page["limit"],
+                "sort": page["sort"],
+                "direction": page["direction"],
+                "next_cursor": page["next_cursor"],
+                "prev_cursor": page["prev_cursor"],
+            }
+
+        return self._conditional(etag, last_modified, build)
+
+    def render_detail(self, model, object_id, loader):
+        exists, version, last_modified = self.freshness_view_model.row_state(model, object_id)
+        if not exists:
+            return jsonify({"error": "Not found"}), 404
+        etag = self.freshness_view_model.etag(model.__tablename__, object_id, version)
+        return self._conditional(etag, last_modified, lambda: loader(object_id))
+
+    def _conditional(self, etag, last_modified, build):
+        if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            response = self._with_validators(jsonify(), etag, last_modified)
+            response.status_code = 304
+            response.data = b""
+            return response
+        try:
+            body = build()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return self._with_validators(jsonify(body), etag, last_modified)
+
+    @staticmethod
+    def _with_validators(response, etag, last_modified):
+        response.set_etag(etag, weak=True)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        response.cache_control.no_cache = True
+        return response
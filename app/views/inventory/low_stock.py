@@ -0,0 +1,14 @@
+from flask import render_template, request
+from app.view_model.product.stock import StockViewModel
+
+
+class LowStockView:
+    def __init__(self):
+        self.stock_view_model = StockViewModel()
+
+    def render(self):
+        try:
+            products = self.stock_view_model.low_stock(request.args.get("limit"))
+        except ValueError as e:
+            return str(e), 400
+        return render_template("products/low-stock.html", products=products)
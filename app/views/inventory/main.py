@@ -13,6 +13,9 @@ class InventoryView:
 
     def get_product_categories(self):
         return self.product_service.get_categories()
+
+    def get_category_tree_json(self):
+        return self.product_service.get_category_tree_json()
     
     def create_product(self, form_data):
         return self.product_service.create_product(form_data)
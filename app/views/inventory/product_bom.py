@@ -0,0 +1,16 @@
+from flask import jsonify
+from app.view_model.product.bom import BomCycleError, BomViewModel
+
+
+class ProductBomView:
+    def __init__(self):
+        self.bom_view_model = BomViewModel()
+
+    def render(self, product_id):
+        try:
+            bom = self.bom_view_model.resolve(product_id)
+        except BomCycleError as e:
+            return jsonify({"error": str(e), "path": e.path}), 409
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 404
+        return jsonify(bom)
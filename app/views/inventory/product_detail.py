@@ -1,14 +1,23 @@
 from app.models.inventory.product import Product
+from app.view_model.product.bom import BomViewModel
 from app.view_model.product.main import ProductViewModel
+from app.view_model.product.stock import StockViewModel
 from flask import render_template
 
 class ProductDetailView:
     def __init__(self):
         self.product_service = ProductViewModel()
+        self.stock_service = StockViewModel()
+        self.bom_service = BomViewModel()
 
     def render(self, product_id):
         product = self.product_service.get_product_by_id(product_id)
         if product:
-            return render_template("products/product-detail.html", product=product)
+            stock = self.stock_service.get_stock(product_id)
+            try:
+                bom = self.bom_service.resolve(product_id)
+            except ValueError as e:
+                bom = {"kit": True, "error": str(e)}
+            return render_template("products/product-detail.html", product=product, stock=stock, bom=bom)
         else:
             return "Product not found", 404
@@ -0,0 +1,42 @@
+from flask import jsonify, render_template, request
+from app.view_model.job.main import JobViewModel
+from app.view_model.product.importer import ProductImportViewModel
+from app.views.jobs.main import queued_response, with_links
+
+
+class ProductImportView:
+    def __init__(self):
+        self.product_import_view_model = ProductImportViewModel()
+
+    def render(self):
+        if request.method != "POST":
+            return render_template("products/import-products.html")
+
+        wants_json = request.accept_mimetypes.best == "application/json"
+        upload = request.files.get("file")
+        try:
+            if not upload or not upload.filename:
+                raise ValueError("A CSV or JSON lines file is required")
+            file_format = self.product_import_view_model.detect_format(
+                upload.filename, request.form.get("format")
+            )
+            batch_size = request.form.get("batch_size", type=int)
+            if request.form.get("background"):
+                job = JobViewModel.enqueue(
+                    "import-products",
+                    {"format": file_format, "batch_size": batch_size},
+                    upload=upload.stream,
+                )
+                if wants_json:
+                    return queued_response(job)
+                return render_template("products/import-products.html", job=with_links(job)), 202
+            rows = self.product_import_view_model.read_rows(upload.stream, file_format)
+            report = self.product_import_view_model.import_rows(rows, batch_size)
+        except ValueError as e:
+            if wants_json:
+                return jsonify({"error": str(e)}), 400
+            return render_template("products/import-products.html", error=str(e)), 400
+
+        if wants_json:
+            return jsonify(report)
+        return render_template("products/import-products.html", report=report)
@@ -1,4 +1,4 @@
-from flask import render_template
+from flask import render_template, request
 from app.view_model.product.list import ProductListViewModel
 
 
@@ -7,5 +7,19 @@ class ProductListView:
         self.product_list_view_model = ProductListViewModel()
 
     def render(self):
-        products = self.product_list_view_model.get_products_table_data()
-        return render_template("products/list-products.html", products=products)
\ No newline at end of file
+        try:
+            page = self.product_list_view_model.get_products_table_data(
+                cursor=request.args.get("cursor"),
+                limit=request.args.get("limit"),
+                sort=request.args.get("sort"),
+                direction=request.args.get("direction"),
+                category=request.args.get("category") or None,
+            )
+        except ValueError as e:
+            return str(e), 400
+        return render_template(
+            "products/list-products.html",
+            products=page["items"],
+            page=page,
+            categories=self.product_list_view_model.get_categories(),
+        )
\ No newline at end of file
@@ -0,0 +1,15 @@
+from flask import jsonify, request
+from app.view_model.product.search import ProductSearchViewModel
+
+
+class ProductSearchView:
+    def __init__(self):
+        self.product_search_view_model = ProductSearchViewModel()
+
+    def render(self):
+        query = request.args.get("q", "")
+        try:
+            results = self.product_search_view_model.search(query, request.args.get("limit"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"query": query, "results": results})
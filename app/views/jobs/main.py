@@ -0,0 +1,54 @@
+from flask import jsonify, request, send_file, url_for
+from app.view_model.job.main import JobNotReadyError, JobViewModel
+
+
+def queued_response(job):
+    """202 pointing the client at the job's status URL"""
+    job = with_links(job)
+    response = jsonify(job)
+    response.status_code = 202
+    response.headers["Location"] = job["url"]
+    return response
+
+
+def with_links(job):
+    job["url"] = url_for("main.job_status", job_id=job["id"])
+    result = job["result"] if isinstance(job["result"], dict) else {}
+    job["download_url"] = (
+        url_for("main.job_download", job_id=job["id"])
+        if job["status"] == "succeeded" and "file" in result
+        else None
+    )
+    return job
+
+
+class JobView:
+    def __init__(self):
+        self.job_view_model = JobViewModel()
+
+    def render(self, job_id):
+        try:
+            job = self.job_view_model.get_job(job_id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 404
+        return jsonify(with_links(job))
+
+    def render_download(self, job_id):
+        try:
+            path, filename, mimetype = self.job_view_model.get_download(job_id)
+        except JobNotReadyError as e:
+            return jsonify({"error": str(e)}), 409
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 404
+        return send_file(path, mimetype=mimetype, as_attachment=True, download_name=filename)
+
+    def create(self):
+        data = request.get_json(silent=True) or {}
+        payload = data.get("payload") or {}
+        if not isinstance(payload, dict):
+            return jsonify({"error": "payload must be an object"}), 400
+        try:
+            job = self.job_view_model.enqueue((data.get("kind") or "").strip(), payload, public=True)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return queued_response(job)
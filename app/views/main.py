@@ -3,8 +3,7 @@ from flask import render_template
 
 class MainView:
     def __init__(self):
-        pass
-    
+        self.main_view_model = MainViewModel()
+
     def render(self):
-        return render_template("index.html")
-    
\ No newline at end of file
+        return render_template("index.html", dashboard=self.main_view_model.get_dashboard())
@@ -0,0 +1,14 @@
+from flask import jsonify
+from app.view_model.order.ledger import LedgerViewModel
+
+
+class BillAccountBalanceView:
+    def __init__(self):
+        self.ledger_view_model = LedgerViewModel()
+
+    def render(self, bill_account_id):
+        try:
+            balance = self.ledger_view_model.get_balance(bill_account_id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 404
+        return jsonify(balance)
@@ -0,0 +1,16 @@
+from flask import jsonify, request
+from app.view_model.order.checkout import CheckoutViewModel, InsufficientStockError
+
+
+class CheckoutView:
+    def __init__(self):
+        self.checkout_view_model = CheckoutViewModel()
+
+    def render(self):
+        try:
+            order = self.checkout_view_model.checkout(request.get_json(silent=True))
+        except InsufficientStockError as e:
+            return jsonify({"error": str(e), "product_ids": e.product_ids}), 409
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(order), 201
@@ -1,4 +1,4 @@
-from flask import render_template
+from flask import render_template, request
 from app.view_model.contact.list import ContactListViewModel
 
 
@@ -7,5 +7,13 @@ class ContactListView:
         self.contact_list_view_model = ContactListViewModel()
 
     def render(self):
-        contacts = self.contact_list_view_model.get_contacts_table_data()
-        return render_template("contacts/list-contacts.html", contacts=contacts)
+        try:
+            page = self.contact_list_view_model.get_contacts_table_data(
+                cursor=request.args.get("cursor"),
+                limit=request.args.get("limit"),
+                sort=request.args.get("sort"),
+                direction=request.args.get("direction"),
+            )
+        except ValueError as e:
+            return str(e), 400
+        return render_template("contacts/list-contacts.html", contacts=page["items"], page=page)
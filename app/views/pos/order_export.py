@@ -0,0 +1,32 @@
+from flask import Response, request, stream_with_context
+from app.view_model.job.main import JobViewModel
+from app.view_model.order.export import OrderExportViewModel
+from app.views.jobs.main import queued_response
+
+
+class OrderExportView:
+    def __init__(self):
+        self.order_export_view_model = OrderExportViewModel()
+
+    def render_csv(self):
+        return self._stream(self.order_export_view_model.iter_csv, "text/csv", "orders.csv", "csv")
+
+    def render_ndjson(self):
+        return self._stream(
+            self.order_export_view_model.iter_ndjson, "application/x-ndjson", "orders.ndjson", "ndjson"
+        )
+
+    def _stream(self, generator, mimetype, filename, file_format):
+        try:
+            filters = self.order_export_view_model.parse_filters(request.args)
+        except ValueError as e:
+            return str(e), 400
+        if request.args.get("background"):
+            # The worker re-parses the same filters from the job payload.
+            payload = {key: request.args.get(key) for key in ("date_from", "date_to", "status")}
+            return queued_response(JobViewModel.enqueue("export-orders", dict(payload, format=file_format)))
+        return Response(
+            stream_with_context(generator(**filters)),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        )
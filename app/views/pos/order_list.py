@@ -1,4 +1,4 @@
-from flask import render_template
+from flask import render_template, request
 from app.view_model.order.list import OrderListViewModel
 
 
@@ -7,5 +7,13 @@ class OrderListView:
         self.order_list_view_model = OrderListViewModel()
 
     def render(self):
-        orders = self.order_list_view_model.get_orders_table_data()
-        return render_template("orders/list-orders.html", orders=orders)
+        try:
+            page = self.order_list_view_model.get_orders_table_data(
+                cursor=request.args.get("cursor"),
+                limit=request.args.get("limit"),
+                sort=request.args.get("sort"),
+                direction=request.args.get("direction"),
+            )
+        except ValueError as e:
+            return str(e), 400
+        return render_template("orders/list-orders.html", orders=page["items"], page=page)
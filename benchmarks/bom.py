@@ -0,0 +1,110 @@
+"""BOM resolver latency on deep, wide and shared (DAG) component trees.
+
+Builds each tree shape in an in-memory SQLite database and times
+``BomViewModel.resolve`` cold (cache invalidated) for both expansion
+backends, then warm from the cache. Run from the project root::
+
+    python -m benchmarks.bom [--repeat 5]
+"""
+import argparse
+import time
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.database import db
+from app.models import Product, ProductComponent, ProductStock
+from app.view_model.product.bom import BomViewModel
+from app.view_model.product.cache import bom_cache
+
+
+def _chain(depth):
+    """One component per level: kit -> n1 -> n2 ... -> leaf"""
+    nodes = [f"chain-{level}" for level in range(depth + 1)]
+    return nodes, [(nodes[level], nodes[level + 1], 1) for level in range(depth)]
+
+
+def _wide(width):
+    """One kit with ``width`` leaf components"""
+    nodes = ["wide-kit"] + [f"wide-{index}" for index in range(width)]
+    return nodes, [("wide-kit", node, 2) for node in nodes[1:]]
+
+
+def _shared(levels, width):
+    """Every node uses every node of the next level; paths grow as width**levels"""
+    layers = [["dag-kit"]] + [[f"dag-{level}-{index}" for index in range(width)] for level in range(levels)]
+    edges = [
+        (parent, child, 1)
+        for upper, lower in zip(layers, layers[1:])
+        for parent in upper
+        for child in lower
+    ]
+    return [node for layer in layers for node in layer], edges
+
+
+SHAPES = (
+    ("chain depth 200", _chain(200)),
+    ("wide 5000 leaves", _wide(5000)),
+    ("shared 8 levels x 3", _shared(8, 3)),
+)
+
+
+def _load(nodes, edges):
+    db.session.execute(insert(Product.__table__), [{"id": node, "name": node, "cost": 1} for node in nodes])
+    db.session.execute(
+        insert(ProductStock.__table__),
+        [{"product_id": node, "on_hand": 1000, "reorder_level": 0, "low_stock": False} for node in nodes],
+    )
+    db.session.execute(
+        insert(ProductComponent.__table__),
+        [
+            {"id": f"{parent}>{child}", "parent_product_id": parent, "component_product_id": child, "quantity": quantity}
+            for parent, child, quantity in edges
+        ],
+    )
+    db.session.commit()
+
+
+def _time(app, root, backend, repeat, cold):
+    app.config["BOM_RESOLVER_BACKEND"] = backend
+    bom_cache.invalidate()
+    BomViewModel.resolve(root)
+    best = float("inf")
+    for _ in range(repeat):
+        if cold:
+            bom_cache.invalidate()
+        started = time.perf_counter()
+        result = BomViewModel.resolve(root)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(repeat):
+    app = create_app("testing")
+    app.config["SQL_INSTRUMENTATION"] = False
+    with app.app_context():
+        db.create_all()
+        print(f"{'tree':<22} {'edges':>7} {'leaves':>7} {'cte ms':>9} {'memo ms':>9} {'cached ms':>10}")
+        for label, (nodes, edges) in SHAPES:
+            _load(nodes, edges)
+            root = nodes[0]
+            cte, cte_result = _time(app, root, "cte", repeat, cold=True)
+            memo, memo_result = _time(app, root, "memo", repeat, cold=True)
+            cached, _ = _time(app, root, "memo", repeat, cold=False)
+            if cte_result != memo_result:
+                raise SystemExit(f"{label}: backends disagree")
+            print(
+                f"{label:<22} {len(edges):>7} {len(memo_result['components']):>7} "
+                f"{cte * 1000:>9.2f} {memo * 1000:>9.2f} {cached * 1000:>10.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Deterministic benchmark datasets, built on the ``flask seed`` generator."""
+from datetime import datetime
+
+from sqlalchemy import func, inspect, select
+
+from app.commands.seed import DatasetSeeder
+from app.database import db
+from app.models import Order
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+EPOCH = datetime(2025, 1, 1)
+
+
+def is_seeded(rows):
+    if not inspect(db.engine).has_table(Order.__tablename__):
+        return False
+    return db.session.scalar(select(func.count()).select_from(Order.__table__)) == rows
+
+
+def seed(rows, seed=42, batch_size=5000):
+    """Recreate the schema with ``rows`` products, orders and contacts/10"""
+    DatasetSeeder(
+        contacts=max(rows // 10, 100),
+        products=rows,
+        orders=rows,
+        warehouses=1,
+        # One order every 30 seconds, so export windows hold a steady number of rows.
+        start=EPOCH,
+        days=rows * 30 / 86400,
+        # Checkout scenarios must never run out of stock.
+        stock=(1_000_000_000, 1_000_000_000),
+        seed=seed,
+        batch_size=batch_size,
+    ).run(reset=True)
@@ -0,0 +1,99 @@
+"""Per-row memory and render time of list pages: ORM hydration vs projections.
+
+Loads the rows behind ``/products`` and ``/orders`` both ways (full ORM
+instances copied through ``to_dict`` and the ``ReadModel`` column
+projection), then renders the real list template. Run from the project root::
+
+    python -m benchmarks.list_rows --size 10k --rows 200 --rows 5000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from flask import render_template
+
+from app import create_app
+from app.database import db
+from app.models import Order, Product
+from app.view_model.order.main import order_list_rows
+from app.view_model.product.main import product_list_rows
+from benchmarks.dataset import SIZES
+from benchmarks.routes import prepare_database
+
+PAGES = (
+    ("/products", Product, product_list_rows, "products/list-products.html", "products"),
+    ("/orders", Order, order_list_rows, "orders/list-orders.html", "orders"),
+)
+
+
+def _orm(model, read_model, rows):
+    instances = model.query.order_by(model.created_at.desc(), model.id.desc()).limit(rows).all()
+    return [instance.to_dict() for instance in instances]
+
+
+def _projection(model, read_model, rows):
+    query = read_model.query().order_by(model.created_at.desc(), model.id.desc()).limit(rows)
+    return read_model.rows(query)
+
+
+STRATEGIES = (("orm + to_dict", _orm), ("projection", _projection))
+
+
+def measure(load, model, read_model, template, name, rows, repeat):
+    # The session is cleared first so only this load is counted. Peak includes
+    # the ORM instances that ``to_dict`` copies from; retained is what the page keeps.
+    db.session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = load(model, read_model, rows)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained, peak = current - before, peak - before
+    page = {"items": items, "limit": rows, "sort": "created_at", "direction": "desc",
+            "next_cursor": None, "prev_cursor": None}
+
+    load_best = render_best = float("inf")
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        items = load(model, read_model, rows)
+        load_best = min(load_best, time.perf_counter() - started)
+        page["items"] = items
+        started = time.perf_counter()
+        render_template(template, page=page, **{name: items})
+        render_best = min(render_best, time.perf_counter() - started)
+    return len(items), peak, retained, load_best, render_best
+
+
+def run(size, row_counts, repeat, seed_value):
+    app = create_app("benchmark")
+    with app.app_context():
+        prepare_database(size, SIZES[size], seed_value, reseed=False)
+        with app.test_request_context():
+            print(f"{'page':<10} {'rows':>6} {'strategy':<14} {'peak B/row':>11} {'kept B/row':>11} {'load ms':>9} {'render ms':>10}")
+            for path, model, read_model, template, name in PAGES:
+                for rows in row_counts:
+                    for label, load in STRATEGIES:
+                        count, peak, retained, load_s, render_s = measure(
+                            load, model, read_model, template, name, rows, repeat
+                        )
+                        print(
+                            f"{path:<10} {count:>6} {label:<14} {peak / max(count, 1):>11,.0f} {retained / max(count, 1):>11,.0f} "
+                            f"{load_s * 1000:>9.2f} {render_s * 1000:>10.2f}"
+                        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="10k")
+    parser.add_argument("--rows", type=int, action="append", help="Rows per page; repeatable.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    run(args.size, args.rows or [50, 200, 5000], args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
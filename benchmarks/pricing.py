@@ -0,0 +1,57 @@
+"""Throughput of PricingEngine.price_lines for 1, 100 and 10k-line carts.
+
+Run from the project root::
+
+    python -m benchmarks.pricing [--repeat 5]
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from app.view_model.order.pricing import PricingEngine, to_units
+
+CART_SIZES = (1, 100, 10_000)
+
+
+def build_cart(size, rng):
+    catalog = {}
+    lines = []
+    for index in range(size):
+        product_id = f"p{index:06d}"
+        price = Decimal(rng.randint(100, 500_000)).scaleb(-2)
+        tax_rate = rng.choice((Decimal("0"), Decimal("8.00"), Decimal("16.00")))
+        catalog[product_id] = (to_units(price), to_units(tax_rate, 100))
+        line = {"product_id": product_id, "quantity": rng.randint(1, 12)}
+        if rng.random() < 0.1:
+            line["discount"] = "0.50"
+        lines.append(line)
+    return lines, catalog
+
+
+def run(repeat, seed):
+    rng = random.Random(seed)
+    print(f"{'lines':>8} {'best ms':>10} {'lines/s':>14} {'carts/s':>12}")
+    for size in CART_SIZES:
+        lines, catalog = build_cart(size, rng)
+        # Enough carts per sample that small carts are not dominated by timer noise.
+        carts = max(1, 20_000 // size)
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(carts):
+                PricingEngine.price_lines(lines, catalog, discount="1.00")
+            best = min(best, (time.perf_counter() - started) / carts)
+        print(f"{size:>8} {best * 1000:>10.3f} {size / best:>14,.0f} {1 / best:>12,.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
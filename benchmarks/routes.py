@@ -0,0 +1,343 @@
+"""Latency, query count and memory benchmark for every application route.
+
+Seeds a file-backed SQLite database (``create_app('benchmark')``) once per
+dataset size, drives each route through the Flask test client and reports
+p50/p95/p99 latency, queries per request and peak RSS. Results can be saved
+as a JSON baseline and later compared against it::
+
+    python -m benchmarks.routes --size 10k --save-baseline benchmarks/results/10k.json
+    python -m benchmarks.routes --size 10k --compare benchmarks/results/10k.json
+
+Comparison exits with status 1 when a route's p95 regresses by more than
+``--threshold`` (and ``--min-delta-ms``) or it issues more queries. Use
+enough ``--iterations`` for stable tails on noisy machines.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import re
+import resource
+import shutil
+import sys
+import time
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import select
+
+from app import create_app
+from app.assets import build_assets
+from app.database import db
+from app.models import BillAccount, Contact, Order, Product, ProductComponent, Taxonomy, Warehouse
+from app.view_model.job.main import JobViewModel
+from benchmarks.dataset import EPOCH, SIZES, is_seeded, seed
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def _product(ctx):
+    return ctx["rng"].choice(ctx["product_ids"])
+
+
+def _product_form(ctx, name):
+    return {
+        "name": name,
+        "sku": f"BENCH-{ctx['rng'].getrandbits(32)}",
+        "price": "19.90",
+        "cost": "10.00",
+        "tax_rate": "16",
+        "taxonomy_id": ctx["taxonomy_id"],
+    }
+
+
+def _new_product_post(ctx):
+    return "POST", "/product/new/product", {"data": _product_form(ctx, "Producto benchmark")}
+
+
+def _delete_product(ctx):
+    product_id = ctx["created"].pop() if ctx["created"] else _product(ctx)
+    return "POST", f"/product/{product_id}/delete", {}
+
+
+def _import_products(ctx, background=False):
+    rows = "".join(f"Importado {index},IMP-{ctx['rng'].getrandbits(32)},9.5\n" for index in range(20))
+    body = ("name,sku,price\n" + rows).encode("utf-8")
+    data = {"file": (io.BytesIO(body), "catalog.csv")}
+    if background:
+        data["background"] = "1"
+    return "POST", "/products/import", {"data": data, "headers": {"Accept": "application/json"}}
+
+
+def _checkout(ctx):
+    items = [{"product_id": _product(ctx), "quantity": ctx["rng"].randint(1, 3)} for _ in range(3)]
+    payload = {
+        "warehouse_id": ctx["warehouse_id"],
+        "items": items,
+        "payment_status": "paid",
+        "bill_account_id": ctx["bill_account_id"],
+    }
+    return "POST", "/orders/checkout", {"json": payload}
+
+
+def _export_window(ctx):
+    start = EPOCH + timedelta(hours=ctx["rng"].randrange(24 * 30))
+    end = start + timedelta(hours=1)
+    return f"date_from={start.isoformat()}&date_to={end.isoformat()}"
+
+
+# (endpoint, label, request factory); every main/api endpoint must appear here.
+SCENARIOS = [
+    ("main.index", "GET /", lambda ctx: ("GET", "/", {})),
+    ("main.health", "GET /health", lambda ctx: ("GET", "/health", {})),
+    ("main.ready", "GET /ready", lambda ctx: ("GET", "/ready", {})),
+    ("main.cache_metrics", "GET /metrics/cache", lambda ctx: ("GET", "/metrics/cache", {})),
+    ("main.products_list", "GET /products", lambda ctx: ("GET", "/products", {})),
+    ("main.products_list", "GET /products (gzip)", lambda ctx: ("GET", "/products", {"headers": {"Accept-Encoding": "gzip"}})),
+    ("main.products_list", "GET /products?sort=name", lambda ctx: ("GET", "/products?sort=name&direction=asc", {})),
+    ("main.products_search", "GET /products/search (sku)", lambda ctx: ("GET", f"/products/search?q=75{ctx['rng'].randrange(10**6):06d}", {})),
+    ("main.products_search", "GET /products/search (name)", lambda ctx: ("GET", f"/products/search?q=producto {ctx['rng'].randrange(1000)}", {})),
+    ("main.products_list", "GET /products?category=<root>", lambda ctx: ("GET", f"/products?category={ctx['category_id']}", {})),
+    ("main.category_tree", "GET /categories/tree", lambda ctx: ("GET", "/categories/tree", {})),
+    ("static", "GET /static/<fingerprinted js> (gzip)",
+     lambda ctx: ("GET", f"/static/{ctx['asset']}", {"headers": {"Accept-Encoding": "gzip"}})),
+    ("main.products_low_stock", "GET /products/low-stock", lambda ctx: ("GET", "/products/low-stock", {})),
+    ("main.contacts_list", "GET /contacts", lambda ctx: ("GET", "/contacts", {})),
+    ("main.orders_list", "GET /orders", lambda ctx: ("GET", "/orders", {})),
+    ("main.orders_export_csv", "GET /orders/export.csv (1h)", lambda ctx: ("GET", f"/orders/export.csv?{_export_window(ctx)}", {})),
+    ("main.orders_export_ndjson", "GET /orders/export.ndjson (1h)", lambda ctx: ("GET", f"/orders/export.ndjson?{_export_window(ctx)}", {})),
+    ("main.orders_export_csv", "GET /orders/export.csv (background)", lambda ctx: ("GET", f"/orders/export.csv?background=1&{_export_window(ctx)}", {})),
+    ("main.job_create", "POST /jobs (sales-rollup)", lambda ctx: ("POST", "/jobs", {"json": {"kind": "sales-rollup"}})),
+    ("main.job_status", "GET /jobs/<id>", lambda ctx: ("GET", f"/jobs/{ctx['job_id']}", {})),
+    ("main.job_download", "GET /jobs/<id>/download (1h csv)", lambda ctx: ("GET", f"/jobs/{ctx['job_id']}/download", {})),
+    ("main.product_detail", "GET /product/<id>", lambda ctx: ("GET", f"/product/{_product(ctx)}", {})),
+    ("main.product_bom", "GET /product/<kit id>/bom", lambda ctx: ("GET", f"/product/{ctx['kit_id']}/bom", {})),
+    ("main.new_product", "GET /product/new/product", lambda ctx: ("GET", "/product/new/product", {})),
+    ("main.new_product", "POST /product/new/product", _new_product_post),
+    ("main.edit_product", "GET /product/<id>/edit", lambda ctx: ("GET", f"/product/{_product(ctx)}/edit", {})),
+    ("main.edit_product", "POST /product/<id>/edit", lambda ctx: ("POST", f"/product/{_product(ctx)}/edit", {"data": _product_form(ctx, "Producto editado")})),
+    ("main.delete_product", "POST /product/<id>/delete", _delete_product),
+    ("main.import_products", "GET /products/import", lambda ctx: ("GET", "/products/import", {})),
+    ("main.import_products", "POST /products/import (20 rows)", _import_products),
+    ("main.import_products", "POST /products/import (background)", lambda ctx: _import_products(ctx, background=True)),
+    ("main.new_contact", "GET /contact/new", lambda ctx: ("GET", "/contact/new", {})),
+    ("main.new_contact", "POST /contact/new", lambda ctx: ("POST", "/contact/new", {"data": {"name": "Cliente benchmark"}})),
+    ("main.new_order", "GET /order/new", lambda ctx: ("GET", "/order/new", {})),
+    ("main.new_order", "POST /order/new", lambda ctx: ("POST", "/order/new", {"data": {"product_id": _product(ctx), "quantity": "2", "discount": "0"}})),
+    ("main.checkout", "POST /orders/checkout (3 lines)", _checkout),
+    ("main.bill_account_balance", "GET /bill-account/<id>/balance",
+     lambda ctx: ("GET", f"/bill-account/{ctx['bill_account_id']}/balance", {})),
+    ("api.products", "GET /api/v1/products", lambda ctx: ("GET", "/api/v1/products", {})),
+    ("api.product", "GET /api/v1/products/<id>", lambda ctx: ("GET", f"/api/v1/products/{_product(ctx)}", {})),
+    ("api.contacts", "GET /api/v1/contacts", lambda ctx: ("GET", "/api/v1/contacts", {})),
+    ("api.contact", "GET /api/v1/contacts/<id>", lambda ctx: ("GET", f"/api/v1/contacts/{ctx['contact_id']}", {})),
+    ("api.orders", "GET /api/v1/orders", lambda ctx: ("GET", "/api/v1/orders", {})),
+    ("api.orders", "GET /api/v1/orders?channel=delivery", lambda ctx: ("GET", "/api/v1/orders?channel=delivery", {})),
+    ("api.order", "GET /api/v1/orders/<id>", lambda ctx: ("GET", f"/api/v1/orders/{ctx['order_id']}", {})),
+]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def peak_rss_kb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+
+def check_coverage(app):
+    covered = {endpoint for endpoint, _, _ in SCENARIOS}
+    return sorted(
+        rule.endpoint
+        for rule in app.url_map.iter_rules()
+        if rule.endpoint.split(".")[0] in ("main", "api") and rule.endpoint not in covered
+    )
+
+
+def build_context(rng):
+    product_ids = list(db.session.scalars(select(Product.id).limit(5000)))
+    return {
+        "rng": rng,
+        "product_ids": product_ids,
+        "taxonomy_id": db.session.scalar(select(Taxonomy.id).limit(1)),
+        "category_id": db.session.scalar(select(Taxonomy.id).where(Taxonomy.parent_id.is_(None)).limit(1)),
+        "warehouse_id": db.session.scalar(select(Warehouse.id).limit(1)),
+        "contact_id": db.session.scalar(select(Contact.id).limit(1)),
+        "order_id": db.session.scalar(select(Order.id).limit(1)),
+        "bill_account_id": db.session.scalar(select(BillAccount.id).limit(1)),
+        "kit_id": db.session.scalar(select(ProductComponent.parent_product_id).limit(1)),
+        "job_id": _finished_export(rng),
+        "asset": build_assets(current_app)[0]["js/components/products/product-form.js"],
+        "created": [],
+    }
+
+
+def _finished_export(rng):
+    """Run one small export job inline, for the job status and download routes"""
+    start = EPOCH + timedelta(hours=rng.randrange(24 * 30))
+    job = JobViewModel.enqueue("export-orders", {
+        "format": "csv",
+        "date_from": start.isoformat(),
+        "date_to": (start + timedelta(hours=1)).isoformat(),
+    })
+    while JobViewModel.run_next("benchmark"):
+        pass
+    return job["id"]
+
+
+def run_scenario(client, ctx, factory, iterations, warmup):
+    latencies = []
+    queries = []
+    statuses = set()
+    for iteration in range(warmup + iterations):
+        method, url, kwargs = factory(ctx)
+        started = time.perf_counter()
+        response = client.open(url, method=method, **kwargs)
+        response.get_data()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        location = response.headers.get("Location", "")
+        if method == "POST" and url == "/product/new/product" and "/product/" in location:
+            ctx["created"].append(location.rstrip("/").rsplit("/", 1)[-1])
+        if iteration < warmup:
+            continue
+        latencies.append(elapsed_ms)
+        statuses.add(response.status_code)
+        match = _QUERIES.search(response.headers.get("Server-Timing", ""))
+        if match:
+            queries.append(int(match.group(1)))
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "queries": max(queries) if queries else None,
+        "statuses": sorted(statuses),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def prepare_database(size, rows, seed_value, reseed):
+    """Seed once, then restore a pristine copy so every run starts identical.
+
+    Write scenarios change the data, so file-backed SQLite databases are
+    snapshotted right after seeding and copied back before each run. Other
+    databases are reseeded whenever the row counts no longer match.
+    """
+    url = db.engine.url
+    path = url.database if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:") else None
+    pristine = f"{path}.{size}-seed{seed_value}.pristine" if path else None
+
+    if pristine and not reseed and os.path.exists(pristine):
+        db.session.remove()
+        db.engine.dispose()
+        shutil.copyfile(pristine, path)
+        return
+    if not pristine and not reseed and is_seeded(rows):
+        return
+
+    started = time.perf_counter()
+    print(f"Seeding {size} dataset...", file=sys.stderr)
+    seed(rows, seed=seed_value)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    if pristine:
+        db.session.remove()
+        db.engine.dispose()
+        shutil.copyfile(path, pristine)
+
+
+def run(size, iterations, warmup, seed_value, reseed):
+    rows = SIZES[size]
+    app = create_app("benchmark")
+    rng = random.Random(seed_value)
+    with app.app_context():
+        prepare_database(size, rows, seed_value, reseed)
+        ctx = build_context(rng)
+
+    missing = check_coverage(app)
+    if missing:
+        raise SystemExit(f"Routes without a benchmark scenario: {', '.join(missing)}")
+
+    results = {}
+    client = app.test_client()
+    for _, label, factory in SCENARIOS:
+        results[label] = run_scenario(client, ctx, factory, iterations, warmup)
+    return {
+        "meta": {
+            "size": size,
+            "rows": rows,
+            "iterations": iterations,
+            "seed": seed_value,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "routes": results,
+    }
+
+
+def print_report(report):
+    print(f"{'route':<36} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8} {'rss MB':>8}  status")
+    for label, result in report["routes"].items():
+        queries = "-" if result["queries"] is None else result["queries"]
+        print(
+            f"{label:<36} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+            f"{queries:>8} {result['peak_rss_kb'] / 1024:>8.1f}  {','.join(map(str, result['statuses']))}"
+        )
+
+
+def compare(report, baseline, threshold, min_delta_ms):
+    regressions = []
+    for label, base in baseline["routes"].items():
+        current = report["routes"].get(label)
+        if current is None:
+            continue
+        limit = base["p95_ms"] * (1 + threshold)
+        if current["p95_ms"] > limit and current["p95_ms"] - base["p95_ms"] > min_delta_ms:
+            regressions.append(f"{label}: p95 {base['p95_ms']:.2f}ms -> {current['p95_ms']:.2f}ms")
+        if base["queries"] is not None and (current["queries"] or 0) > base["queries"]:
+            regressions.append(f"{label}: queries {base['queries']} -> {current['queries']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="10k")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reseed", action="store_true", help="Rebuild the dataset even if it exists.")
+    parser.add_argument("--output", help="Write the JSON report to this path.")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the JSON report as the new baseline.")
+    parser.add_argument("--compare", metavar="PATH", help="Fail if results regress against this baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p95 growth (0.25 = 25%%).")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore p95 changes smaller than this.")
+    args = parser.parse_args()
+
+    report = run(args.size, args.iterations, args.warmup, args.seed, args.reseed)
+    print_report(report)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            raise SystemExit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
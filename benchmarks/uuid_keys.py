@@ -0,0 +1,128 @@
+"""Insert throughput and index size of order keys: CHAR(36) vs BINARY(16), uuid4 vs uuid7.
+
+Appends orders, each with a few items, to tables shaped like ``orders`` and
+``order_items`` (primary key, ``(created_at, id)`` and ``order_id``
+indexes) and reports rows/s per tenth of the run, so the slowdown of random
+keys as the indexes outgrow the cache shows up, plus the final size of the
+tables. By default each layout gets a fresh SQLite file; ``--database-uri``
+runs against another server (e.g. MySQL) instead. Run from the project
+root::
+
+    python -m benchmarks.uuid_keys [--rows 200000] [--database-uri mysql+pymysql://...]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, Numeric, String, Table, create_engine, insert, text
+
+from app.models.types import BinaryUUID, uuid7
+
+ITEMS_PER_ORDER = 3
+LAYOUTS = {
+    "char36-uuid4": (lambda: String(36), lambda at: str(uuid.uuid4())),
+    "char36-uuid7": (lambda: String(36), uuid7),
+    "binary16-uuid4": (BinaryUUID, lambda at: str(uuid.uuid4())),
+    "binary16-uuid7": (BinaryUUID, uuid7),
+}
+
+
+def build_tables(key_type):
+    metadata = MetaData()
+    orders = Table(
+        "bench_orders",
+        metadata,
+        Column("id", key_type(), primary_key=True),
+        Column("created_at", DateTime, nullable=False),
+        Column("total", Numeric(10, 2), nullable=False),
+        Index("ix_bench_orders_created_at_id", "created_at", "id"),
+    )
+    items = Table(
+        "bench_order_items",
+        metadata,
+        Column("id", key_type(), primary_key=True),
+        Column("order_id", key_type(), nullable=False),
+        Column("quantity", Integer, nullable=False),
+        Index("ix_bench_order_items_order_id", "order_id"),
+    )
+    return metadata, orders, items
+
+
+def table_bytes(engine, path):
+    if engine.dialect.name == "sqlite":
+        return os.path.getsize(path)
+    with engine.connect() as connection:
+        for table in ("bench_orders", "bench_order_items"):
+            connection.execute(text(f"ANALYZE TABLE {table}"))
+        return connection.execute(text(
+            "SELECT SUM(data_length + index_length) FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name IN ('bench_orders', 'bench_order_items')"
+        )).scalar()
+
+
+def run_layout(name, rows, batch_size, database_uri, workdir, seed):
+    key_type, new_id = LAYOUTS[name]
+    path = os.path.join(workdir, f"{name}.db")
+    engine = create_engine(database_uri or f"sqlite:///{path}")
+    metadata, orders, items = build_tables(key_type)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    rng = random.Random(seed)
+    clock = datetime(2026, 1, 1)
+    deciles = []
+    written = 0
+    decile_rows = 0
+    decile_started = started = time.perf_counter()
+    while written < rows:
+        order_rows, item_rows = [], []
+        for _ in range(min(batch_size, rows - written)):
+            clock += timedelta(milliseconds=rng.randint(1, 50))
+            order_id = new_id(clock)
+            order_rows.append({"id": order_id, "created_at": clock, "total": rng.randint(100, 100_000) / 100})
+            item_rows.extend(
+                {"id": new_id(clock), "order_id": order_id, "quantity": rng.randint(1, 5)}
+                for _ in range(ITEMS_PER_ORDER)
+            )
+        with engine.begin() as connection:
+            connection.execute(insert(orders), order_rows)
+            connection.execute(insert(items), item_rows)
+        written += len(order_rows)
+        decile_rows += len(order_rows) + len(item_rows)
+        if written * 10 // rows > len(deciles) or written == rows:
+            now = time.perf_counter()
+            deciles.append(decile_rows / (now - decile_started))
+            decile_rows, decile_started = 0, now
+    elapsed = time.perf_counter() - started
+    size = table_bytes(engine, path)
+    metadata.drop_all(engine)
+    engine.dispose()
+    return rows * (1 + ITEMS_PER_ORDER) / elapsed, deciles, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="Orders per layout.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Orders per transaction.")
+    parser.add_argument("--database-uri", help="Run against this database instead of fresh SQLite files.")
+    parser.add_argument("--layout", action="append", choices=sorted(LAYOUTS), help="Only these layouts.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'layout':<16} {'rows/s':>10} {'first 10%':>10} {'last 10%':>10} {'MiB':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.layout or LAYOUTS:
+            rate, deciles, size = run_layout(name, args.rows, args.batch_size, args.database_uri, workdir, args.seed)
+            print(
+                f"{name:<16} {rate:>10,.0f} {deciles[0]:>10,.0f} {deciles[-1]:>10,.0f} "
+                f"{(size or 0) / 2**20:>8.1f}"
+            )
+            print(f"{'':<16} per tenth: " + " ".join(f"{value:,.0f}" for value in deciles))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Add secondary indexes for list, lookup and join queries
+
+Revision ID: 5b1e0c7d9a42
+Revises: 2774dea07b3b
+Create Date: 2026-10-18 09:12:44.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e0c7d9a42'
+down_revision = '2774dea07b3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_taxonomies_kind_name', 'taxonomies', ['kind', 'name'], unique=False)
+    op.create_index('ix_taxonomies_parent_id', 'taxonomies', ['parent_id'], unique=False)
+    op.create_index('ix_products_created_at_id', 'products', ['created_at', 'id'], unique=False)
+    op.create_index('ix_products_name_id', 'products', ['name', 'id'], unique=False)
+    op.create_index('ix_products_sku', 'products', ['sku'], unique=False)
+    op.create_index('ix_products_taxonomy_id', 'products', ['taxonomy_id'], unique=False)
+    op.create_index('ix_product_taxonomies_product_id', 'product_taxonomies', ['product_id'], unique=False)
+    op.create_index('ix_product_taxonomies_taxonomy_id', 'product_taxonomies', ['taxonomy_id'], unique=False)
+    op.create_index('ix_product_components_parent_product_id', 'product_components', ['parent_product_id'], unique=False)
+    op.create_index('ix_product_components_component_product_id', 'product_components', ['component_product_id'], unique=False)
+    op.create_index('ix_contacts_created_at_id', 'contacts', ['created_at', 'id'], unique=False)
+    op.create_index('ix_contacts_name_id', 'contacts', ['name', 'id'], unique=False)
+    op.create_index('ix_inventories_warehouse_id_product_id', 'inventories', ['warehouse_id', 'product_id'], unique=False)
+    op.create_index('ix_inventories_product_id', 'inventories', ['product_id'], unique=False)
+    op.create_index('ix_orders_created_at_id', 'orders', ['created_at', 'id'], unique=False)
+    op.create_index('ix_orders_total_id', 'orders', ['total', 'id'], unique=False)
+    op.create_index('ix_orders_contact_id', 'orders', ['contact_id'], unique=False)
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'], unique=False)
+    op.create_index('ix_order_items_product_id', 'order_items', ['product_id'], unique=False)
+    op.create_index('ix_order_bill_accounts_order_id', 'order_bill_accounts', ['order_id'], unique=False)
+    op.create_index('ix_order_bill_accounts_bill_account_id', 'order_bill_accounts', ['bill_account_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_order_bill_accounts_bill_account_id', table_name='order_bill_accounts')
+    op.drop_index('ix_order_bill_accounts_order_id', table_name='order_bill_accounts')
+    op.drop_index('ix_order_items_product_id', table_name='order_items')
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_contact_id', table_name='orders')
+    op.drop_index('ix_orders_total_id', table_name='orders')
+    op.drop_index('ix_orders_created_at_id', table_name='orders')
+    op.drop_index('ix_inventories_product_id', table_name='inventories')
+    op.drop_index('ix_inventories_warehouse_id_product_id', table_name='inventories')
+    op.drop_index('ix_contacts_name_id', table_name='contacts')
+    op.drop_index('ix_contacts_created_at_id', table_name='contacts')
+    op.drop_index('ix_product_components_component_product_id', table_name='product_components')
+    op.drop_index('ix_product_components_parent_product_id', table_name='product_components')
+    op.drop_index('ix_product_taxonomies_taxonomy_id', table_name='product_taxonomies')
+    op.drop_index('ix_product_taxonomies_product_id', table_name='product_taxonomies')
+    op.drop_index('ix_products_taxonomy_id', table_name='products')
+    op.drop_index('ix_products_sku', table_name='products')
+    op.drop_index('ix_products_name_id', table_name='products')
+    op.drop_index('ix_products_created_at_id', table_name='products')
+    op.drop_index('ix_taxonomies_parent_id', table_name='taxonomies')
+    op.drop_index('ix_taxonomies_kind_name', table_name='taxonomies')
@@ -0,0 +1,27 @@
+"""Add FULLTEXT index on products.name for till search
+
+Revision ID: 8e3f4a6c2d19
+Revises: 5b1e0c7d9a42
+Create Date: 2026-10-18 11:03:27.540918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e3f4a6c2d19'
+down_revision = '5b1e0c7d9a42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FULLTEXT is MySQL-only; other backends use the in-process search index.
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ft_products_name', 'products', ['name'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ft_products_name', table_name='products')
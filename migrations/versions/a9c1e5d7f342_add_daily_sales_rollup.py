@@ -0,0 +1,46 @@
+"""Add daily sales rollup
+
+Revision ID: a9c1e5d7f342
+Revises: f6a3d9e2c815
+Create Date: 2026-10-18 20:26:03.512447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9c1e5d7f342'
+down_revision = 'f6a3d9e2c815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'daily_sales',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('payment_method', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('orders', sa.Integer(), nullable=False),
+        sa.Column('subtotal', sa.Numeric(precision=18, scale=4), nullable=False),
+        sa.Column('tax', sa.Numeric(precision=18, scale=4), nullable=False),
+        sa.Column('discount', sa.Numeric(precision=18, scale=4), nullable=False),
+        sa.Column('total', sa.Numeric(precision=18, scale=4), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'payment_method', 'status', 'type'),
+    )
+    # One pass over orders; on very large tables run `flask sales-rollup --rebuild`
+    # afterwards instead, which works in chunks.
+    op.execute(
+        "INSERT INTO daily_sales (day, payment_method, status, type, orders, subtotal, tax, discount, total) "
+        "SELECT DATE(created_at), COALESCE(payment_method, ''), COALESCE(status, ''), COALESCE(type, ''), "
+        "COUNT(*), COALESCE(SUM(subtotal), 0), COALESCE(SUM(tax), 0), COALESCE(SUM(discount), 0), "
+        "COALESCE(SUM(total), 0) "
+        "FROM orders WHERE created_at IS NOT NULL "
+        "GROUP BY DATE(created_at), COALESCE(payment_method, ''), COALESCE(status, ''), COALESCE(type, '')"
+    )
+
+
+def downgrade():
+    op.drop_table('daily_sales')
@@ -0,0 +1,33 @@
+"""Add row versions to products, contacts and orders
+
+``version`` is bumped by every UPDATE the application issues, so the API
+validators see edits that leave ``updated_at`` on the same second. On
+MySQL 8 a trailing column with a constant default is added instantly,
+without copying the tables.
+
+Revision ID: b4e8d2f6a1c9
+Revises: e5b1f8c3a2d7
+Create Date: 2026-10-20 10:12:41.530927
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e8d2f6a1c9'
+down_revision = 'e5b1f8c3a2d7'
+branch_labels = None
+depends_on = None
+
+TABLES = ('products', 'contacts', 'orders')
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_column(table, 'version')
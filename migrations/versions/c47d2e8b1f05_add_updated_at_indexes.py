@@ -0,0 +1,28 @@
+"""Add updated_at indexes for API freshness checks
+
+Revision ID: c47d2e8b1f05
+Revises: 8e3f4a6c2d19
+Create Date: 2026-10-18 13:26:51.772340
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47d2e8b1f05'
+down_revision = '8e3f4a6c2d19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_products_updated_at', 'products', ['updated_at'], unique=False)
+    op.create_index('ix_contacts_updated_at', 'contacts', ['updated_at'], unique=False)
+    op.create_index('ix_orders_updated_at', 'orders', ['updated_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_orders_updated_at', table_name='orders')
+    op.drop_index('ix_contacts_updated_at', table_name='contacts')
+    op.drop_index('ix_products_updated_at', table_name='products')
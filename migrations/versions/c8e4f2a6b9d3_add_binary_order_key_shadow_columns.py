@@ -0,0 +1,53 @@
+"""Add binary shadow columns for order keys
+
+Expand step of moving the order keys to BINARY(16). On MySQL every
+converted column gets a ``<name>_bin`` twin, kept in step with new writes by
+triggers; existing rows are filled by ``flask uuid-backfill`` in small
+batches while the application keeps serving, and d2a7c5e9f1b4 swaps the
+columns. Other backends are converted offline by d2a7c5e9f1b4 alone.
+
+Revision ID: c8e4f2a6b9d3
+Revises: b3d8f1a6c7e0
+Create Date: 2026-10-19 09:12:40.361027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e4f2a6b9d3'
+down_revision = 'b3d8f1a6c7e0'
+branch_labels = None
+depends_on = None
+
+CONVERTED = (
+    ('orders', ('id',)),
+    ('order_items', ('id', 'order_id')),
+    ('order_bill_accounts', ('id', 'order_id')),
+)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for table, columns in CONVERTED:
+        # Trailing nullable columns are added with ALGORITHM=INSTANT on MySQL 8.
+        for column in columns:
+            op.add_column(table, sa.Column(f'{column}_bin', sa.BINARY(16), nullable=True))
+        assignments = ', '.join(f'NEW.{column}_bin = UUID_TO_BIN(NEW.{column})' for column in columns)
+        for event in ('INSERT', 'UPDATE'):
+            op.execute(
+                f'CREATE TRIGGER {table}_{event.lower()}_uuid_bin BEFORE {event} ON {table} '
+                f'FOR EACH ROW SET {assignments}'
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for table, columns in CONVERTED:
+        for event in ('INSERT', 'UPDATE'):
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_{event.lower()}_uuid_bin')
+        for column in columns:
+            op.drop_column(table, f'{column}_bin')
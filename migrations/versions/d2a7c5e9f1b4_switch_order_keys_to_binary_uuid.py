@@ -0,0 +1,139 @@
+"""Switch order keys to BINARY(16)
+
+Contract step after c8e4f2a6b9d3 and ``flask uuid-backfill``. On MySQL the
+shadow columns are renamed into place and each table is rebuilt once with
+ALGORITHM=INPLACE, LOCK=NONE, so reads and writes continue during the
+rebuild. Deploy the application version with binary order keys together
+with this revision: the old one writes string keys, which no longer fit.
+SQLite databases are converted in place, offline.
+
+Revision ID: d2a7c5e9f1b4
+Revises: c8e4f2a6b9d3
+Create Date: 2026-10-19 09:48:17.904513
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7c5e9f1b4'
+down_revision = 'c8e4f2a6b9d3'
+branch_labels = None
+depends_on = None
+
+CONVERTED = (
+    ('orders', ('id',)),
+    ('order_items', ('id', 'order_id')),
+    ('order_bill_accounts', ('id', 'order_id')),
+)
+# Secondary indexes over converted columns, rebuilt on the new columns.
+INDEXES = {
+    'orders': (('ix_orders_created_at_id', ('created_at', 'id')), ('ix_orders_total_id', ('total', 'id'))),
+    'order_items': (('ix_order_items_order_id', ('order_id',)),),
+    'order_bill_accounts': (('ix_order_bill_accounts_order_id', ('order_id',)),),
+}
+FOREIGN_KEYS = (
+    ('fk_order_items_order', 'order_items'),
+    ('fk_order_ba_order', 'order_bill_accounts'),
+)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        _convert_offline(_to_bytes, sa.String(length=36), sa.LargeBinary(length=16))
+        return
+
+    bind = op.get_bind()
+    for table, columns in CONVERTED:
+        missing = bind.execute(sa.text(
+            f'SELECT COUNT(*) FROM {table} WHERE '
+            + ' OR '.join(f'({column} IS NOT NULL AND {column}_bin IS NULL)' for column in columns)
+        )).scalar()
+        if missing:
+            raise RuntimeError(f'{missing} {table} rows have no binary key yet; run `flask uuid-backfill` first')
+
+    for name, table in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+    for table, columns in CONVERTED:
+        for event in ('INSERT', 'UPDATE'):
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_{event.lower()}_uuid_bin')
+        # Metadata-only renames: from here on the binary columns are the live ones.
+        op.execute(f'ALTER TABLE {table} ' + ', '.join(
+            f'RENAME COLUMN {column} TO {column}_str, RENAME COLUMN {column}_bin TO {column}' for column in columns
+        ))
+        # Rows written between dropping the triggers and the renames.
+        op.execute(
+            f'UPDATE {table} SET '
+            + ', '.join(f'{column} = COALESCE({column}, UUID_TO_BIN({column}_str))' for column in columns)
+            + ' WHERE ' + ' OR '.join(f'({column} IS NULL AND {column}_str IS NOT NULL)' for column in columns)
+        )
+        _rebuild(table, 'BINARY(16)', [f'DROP COLUMN {column}_str' for column in columns])
+    _create_foreign_keys()
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        _convert_offline(_to_string, sa.LargeBinary(length=16), sa.String(length=36))
+        return
+
+    # Back to the state after c8e4f2a6b9d3: string keys with triggered binary twins.
+    for name, table in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+    for table, columns in CONVERTED:
+        op.execute(f'ALTER TABLE {table} ' + ', '.join(
+            f'RENAME COLUMN {column} TO {column}_bin' for column in columns
+        ))
+        op.execute(f'ALTER TABLE {table} ' + ', '.join(
+            f'ADD COLUMN {column} VARCHAR(36) NULL' for column in columns
+        ))
+        op.execute(f'UPDATE {table} SET ' + ', '.join(f'{column} = BIN_TO_UUID({column}_bin)' for column in columns))
+        _rebuild(table, 'VARCHAR(36)', ['MODIFY id_bin BINARY(16) NULL'])
+        assignments = ', '.join(f'NEW.{column}_bin = UUID_TO_BIN(NEW.{column})' for column in columns)
+        for event in ('INSERT', 'UPDATE'):
+            op.execute(
+                f'CREATE TRIGGER {table}_{event.lower()}_uuid_bin BEFORE {event} ON {table} '
+                f'FOR EACH ROW SET {assignments}'
+            )
+    _create_foreign_keys()
+
+
+def _rebuild(table, key_type, extra_clauses):
+    """Move the primary key and indexes to the current ``id`` columns in one in-place rebuild"""
+    clauses = [f'MODIFY id {key_type} NOT NULL', 'DROP PRIMARY KEY', 'ADD PRIMARY KEY (id)']
+    for name, columns in INDEXES[table]:
+        clauses += [f'DROP INDEX {name}', f'ADD INDEX {name} ({", ".join(columns)})']
+    op.execute(f'ALTER TABLE {table} {", ".join(clauses + extra_clauses)}, ALGORITHM=INPLACE, LOCK=NONE')
+
+
+def _create_foreign_keys():
+    # Every key was just copied from a consistent table; skipping the check
+    # lets MySQL add the constraints in place instead of copying the tables.
+    op.execute('SET foreign_key_checks = 0')
+    for name, table in FOREIGN_KEYS:
+        op.create_foreign_key(name, table, 'orders', ['order_id'], ['id'])
+    op.execute('SET foreign_key_checks = 1')
+
+
+def _to_bytes(value):
+    return uuid.UUID(value).bytes if isinstance(value, str) else value
+
+
+def _to_string(value):
+    return str(uuid.UUID(bytes=bytes(value))) if isinstance(value, bytes) else value
+
+
+def _convert_offline(convert, existing_type, type_):
+    connection = op.get_bind().connection.driver_connection
+    connection.create_function('convert_uuid', 1, convert, deterministic=True)
+    for table, columns in CONVERTED:
+        # Values first: the table copy below CASTs every value to the new
+        # column type, which only leaves values already of that type intact.
+        op.execute(f'UPDATE {table} SET ' + ', '.join(f'{column} = convert_uuid({column})' for column in columns))
+        with op.batch_alter_table(table, recreate='always') as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column, type_=type_, existing_type=existing_type, existing_nullable=column != 'id'
+                )
@@ -0,0 +1,54 @@
+"""Add per-product stock summary
+
+Revision ID: d5a91c3e7b24
+Revises: c47d2e8b1f05
+Create Date: 2026-10-18 15:02:37.418922
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a91c3e7b24'
+down_revision = 'c47d2e8b1f05'
+branch_labels = None
+depends_on = None
+
+# Matches the LOW_STOCK_THRESHOLD default; adjust per product afterwards.
+REORDER_LEVEL = 5
+
+
+def upgrade():
+    op.create_table(
+        'product_stock',
+        sa.Column('product_id', sa.String(length=36), nullable=False),
+        sa.Column('on_hand', sa.Numeric(precision=18, scale=4), nullable=False),
+        sa.Column('reorder_level', sa.Numeric(precision=18, scale=4), nullable=False),
+        sa.Column('low_stock', sa.Boolean(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    op.create_index(
+        'ix_product_stock_low_stock_on_hand',
+        'product_stock',
+        ['low_stock', 'on_hand', 'product_id'],
+        unique=False,
+    )
+    # Backfill one row per product from the current inventories.
+    op.execute(
+        sa.text(
+            "INSERT INTO product_stock (product_id, on_hand, reorder_level, low_stock) "
+            "SELECT p.id, COALESCE(s.total, 0), :level, "
+            "CASE WHEN COALESCE(s.total, 0) <= :level THEN 1 ELSE 0 END "
+            "FROM products p LEFT JOIN ("
+            "SELECT product_id, SUM(quantity) AS total FROM inventories GROUP BY product_id"
+            ") s ON s.product_id = p.id"
+        ).bindparams(level=REORDER_LEVEL)
+    )
+
+
+def downgrade():
+    op.drop_index('ix_product_stock_low_stock_on_hand', table_name='product_stock')
+    op.drop_table('product_stock')
@@ -0,0 +1,60 @@
+"""Add materialized path to taxonomies
+
+Revision ID: e2b8c4f61a37
+Revises: d5a91c3e7b24
+Create Date: 2026-10-18 17:41:09.203554
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b8c4f61a37'
+down_revision = 'd5a91c3e7b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('taxonomies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('path', sa.String(length=760), nullable=True))
+        batch_op.add_column(sa.Column('depth', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_taxonomies_path', ['path'], unique=False)
+
+    # Backfill from parent_id, walking down from the roots.
+    bind = op.get_bind()
+    taxonomies = sa.table(
+        'taxonomies',
+        sa.column('id', sa.String),
+        sa.column('parent_id', sa.String),
+        sa.column('path', sa.String),
+        sa.column('depth', sa.Integer),
+    )
+    rows = bind.execute(sa.select(taxonomies.c.id, taxonomies.c.parent_id)).all()
+    ids = {taxonomy_id for taxonomy_id, _ in rows}
+    children = {}
+    for taxonomy_id, parent_id in rows:
+        children.setdefault(parent_id if parent_id in ids else None, []).append(taxonomy_id)
+
+    updates = []
+    stack = [(root, '/', 0) for root in children.get(None, [])]
+    while stack:
+        taxonomy_id, parent_path, depth = stack.pop()
+        path = f"{parent_path}{taxonomy_id}/"
+        updates.append({'t_id': taxonomy_id, 'new_path': path, 'new_depth': depth})
+        stack.extend((child, path, depth + 1) for child in children.get(taxonomy_id, []))
+    if updates:
+        bind.execute(
+            taxonomies.update()
+            .where(taxonomies.c.id == sa.bindparam('t_id'))
+            .values(path=sa.bindparam('new_path'), depth=sa.bindparam('new_depth')),
+            updates,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('taxonomies', schema=None) as batch_op:
+        batch_op.drop_index('ix_taxonomies_path')
+        batch_op.drop_column('depth')
+        batch_op.drop_column('path')
@@ -0,0 +1,83 @@
+"""Store order extra_fields as JSON with indexed declared keys
+
+Existing values that are not JSON objects are kept as ``{"note": <text>}``.
+On MySQL the column becomes ``JSON``; changing its type copies the table,
+which blocks writes to ``orders`` while it runs. SQLite keeps the TEXT
+declaration, since its JSON functions read JSON text as is. The declared
+keys get VIRTUAL generated columns, which only take index space.
+
+Revision ID: e5b1f8c3a2d7
+Revises: d2a7c5e9f1b4
+Create Date: 2026-10-19 14:06:52.118340
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b1f8c3a2d7'
+down_revision = 'd2a7c5e9f1b4'
+branch_labels = None
+depends_on = None
+
+# Declared key -> generated column length, as on the Order model.
+DECLARED = (('channel', 50), ('table_number', 20), ('delivery_slot', 50))
+
+
+def _extract(dialect, key):
+    path = f"'$.\"{key}\"'"
+    if dialect == 'mysql':
+        return (
+            f'CASE JSON_EXTRACT(extra_fields, {path}) WHEN \'null\' THEN NULL '
+            f'ELSE JSON_UNQUOTE(JSON_EXTRACT(extra_fields, {path})) END'
+        )
+    return f'JSON_EXTRACT(extra_fields, {path})'
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    op.execute("UPDATE orders SET extra_fields = NULL WHERE TRIM(extra_fields) = ''")
+    op.execute(
+        "UPDATE orders SET extra_fields = JSON_OBJECT('note', extra_fields) "
+        "WHERE extra_fields IS NOT NULL AND "
+        "CASE WHEN JSON_VALID(extra_fields) THEN UPPER(JSON_TYPE(extra_fields)) <> 'OBJECT' ELSE 1 END"
+    )
+    bind = op.get_bind()
+    char_length = 'CHAR_LENGTH' if dialect == 'mysql' else 'LENGTH'
+    for key, length in DECLARED:
+        too_long = bind.execute(sa.text(
+            f'SELECT COUNT(*) FROM orders WHERE {char_length}({_extract(dialect, key)}) > {length}'
+        )).scalar()
+        if too_long:
+            raise RuntimeError(
+                f"{too_long} orders have an extra_fields '{key}' longer than {length} characters; shorten them first"
+            )
+
+    columns = [
+        f'extra_{key} VARCHAR({length}) GENERATED ALWAYS AS ({_extract(dialect, key)}) VIRTUAL'
+        for key, length in DECLARED
+    ]
+    if dialect == 'mysql':
+        # One ALTER, so the table is copied once for all the changes.
+        clauses = ['MODIFY extra_fields JSON NULL']
+        clauses += [f'ADD COLUMN {column}' for column in columns]
+        clauses += [f'ADD INDEX ix_orders_extra_{key} (extra_{key}, created_at, id)' for key, _ in DECLARED]
+        op.execute(f'ALTER TABLE orders {", ".join(clauses)}')
+        return
+    for column in columns:
+        op.execute(f'ALTER TABLE orders ADD COLUMN {column}')
+    for key, _ in DECLARED:
+        op.create_index(f'ix_orders_extra_{key}', 'orders', [f'extra_{key}', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        clauses = [f'DROP INDEX ix_orders_extra_{key}' for key, _ in DECLARED]
+        clauses += [f'DROP COLUMN extra_{key}' for key, _ in DECLARED]
+        clauses.append('MODIFY extra_fields TEXT NULL')
+        op.execute(f'ALTER TABLE orders {", ".join(clauses)}')
+        return
+    for key, _ in DECLARED:
+        op.drop_index(f'ix_orders_extra_{key}', table_name='orders')
+        op.execute(f'ALTER TABLE orders DROP COLUMN extra_{key}')
@@ -0,0 +1,115 @@
+"""Add bill account balance snapshots over the movement ledger
+
+Revision ID: f6a3d9e2c815
+Revises: e2b8c4f61a37
+Create Date: 2026-10-18 19:12:54.630118
+
+"""
+from decimal import Decimal
+from uuid import uuid4
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a3d9e2c815'
+down_revision = 'e2b8c4f61a37'
+branch_labels = None
+depends_on = None
+
+MONEY = Decimal('0.0001')
+
+
+def upgrade():
+    op.create_table(
+        'bill_account_snapshots',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('bill_account_id', sa.String(length=36), nullable=False),
+        sa.Column('sequence', sa.Integer(), nullable=False),
+        sa.Column('balance', sa.Numeric(precision=18, scale=4), nullable=False),
+        sa.Column('delta', sa.Numeric(precision=18, scale=4), nullable=False),
+        sa.Column('movements', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['bill_account_id'], ['bill_accounts.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ux_bill_account_snapshots_account_sequence',
+        'bill_account_snapshots',
+        ['bill_account_id', 'sequence'],
+        unique=True,
+    )
+    with op.batch_alter_table('order_bill_accounts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('snapshot_id', sa.String(length=36), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_order_bill_accounts_snapshot_id', 'bill_account_snapshots', ['snapshot_id'], ['id']
+        )
+        batch_op.create_index(
+            'ix_order_bill_accounts_account_snapshot', ['bill_account_id', 'snapshot_id', 'amount'], unique=False
+        )
+        batch_op.create_index('ix_order_bill_accounts_snapshot_id', ['snapshot_id'], unique=False)
+        # The composite index leads with bill_account_id and replaces this one.
+        batch_op.drop_index('ix_order_bill_accounts_bill_account_id')
+
+    # Open every account with a snapshot of its whole ledger. A stored balance
+    # that disagrees with the ledger is kept by posting the difference as an
+    # adjustment movement, so ledger and balance agree from here on.
+    bind = op.get_bind()
+    accounts = sa.table('bill_accounts', sa.column('id', sa.String), sa.column('balance', sa.Numeric))
+    ledger = sa.table(
+        'order_bill_accounts',
+        sa.column('id', sa.String),
+        sa.column('bill_account_id', sa.String),
+        sa.column('amount', sa.Numeric),
+        sa.column('movement_type', sa.String),
+        sa.column('snapshot_id', sa.String),
+    )
+    snapshots = sa.table(
+        'bill_account_snapshots',
+        sa.column('id', sa.String),
+        sa.column('bill_account_id', sa.String),
+        sa.column('sequence', sa.Integer),
+        sa.column('balance', sa.Numeric),
+        sa.column('delta', sa.Numeric),
+        sa.column('movements', sa.Integer),
+    )
+    totals = {
+        account_id: (total, count)
+        for account_id, total, count in bind.execute(
+            sa.select(ledger.c.bill_account_id, sa.func.sum(ledger.c.amount), sa.func.count())
+            .group_by(ledger.c.bill_account_id)
+        )
+    }
+    for account_id, balance in bind.execute(sa.select(accounts.c.id, accounts.c.balance)).all():
+        total, count = totals.get(account_id, (0, 0))
+        balance = Decimal(str(balance or 0)).quantize(MONEY)
+        snapshot_id = str(uuid4())
+        bind.execute(snapshots.insert().values(
+            id=snapshot_id, bill_account_id=account_id, sequence=1, balance=balance, delta=balance, movements=count,
+        ))
+        bind.execute(
+            ledger.update().where(ledger.c.bill_account_id == account_id).values(snapshot_id=snapshot_id)
+        )
+        difference = balance - Decimal(str(total or 0)).quantize(MONEY)
+        if difference:
+            bind.execute(ledger.insert().values(
+                id=str(uuid4()),
+                bill_account_id=account_id,
+                amount=difference,
+                movement_type='adjustment',
+                snapshot_id=snapshot_id,
+            ))
+            bind.execute(snapshots.update().where(snapshots.c.id == snapshot_id).values(movements=count + 1))
+        bind.execute(accounts.update().where(accounts.c.id == account_id).values(balance=balance))
+
+
+def downgrade():
+    with op.batch_alter_table('order_bill_accounts', schema=None) as batch_op:
+        batch_op.create_index('ix_order_bill_accounts_bill_account_id', ['bill_account_id'], unique=False)
+        batch_op.drop_index('ix_order_bill_accounts_snapshot_id')
+        batch_op.drop_index('ix_order_bill_accounts_account_snapshot')
+        batch_op.drop_constraint('fk_order_bill_accounts_snapshot_id', type_='foreignkey')
+        batch_op.drop_column('snapshot_id')
+    op.drop_index('ux_bill_account_snapshots_account_sequence', table_name='bill_account_snapshots')
+    op.drop_table('bill_account_snapshots')
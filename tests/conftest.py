@@ -0,0 +1,20 @@
+import pytest
+
+from app import create_app
+from app.database import db
+
+
+@pytest.fixture
+def app():
+    """The testing app inside an app context, over a fresh in-memory schema"""
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import update
+
+from app.database import db
+from app.models.inventory.product import Product
+
+
+def revalidate(client, url, response):
+    return client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+
+
+@pytest.mark.parametrize("url", ["/api/v1/products", "/api/v1/products/{id}"])
+def test_same_second_edits_change_the_etag(client, url):
+    product = Product(name="Espresso")
+    db.session.add(product)
+    db.session.commit()
+    url = url.format(id=product.id)
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert revalidate(client, url, first).status_code == 304
+
+    # Both land within the second the row was created in.
+    product.name = "Ristretto"
+    db.session.commit()
+    renamed = revalidate(client, url, first)
+    assert renamed.status_code == 200
+    assert "Ristretto" in renamed.get_data(as_text=True)
+
+    db.session.execute(update(Product).where(Product.id == product.id).values(price=3))
+    db.session.commit()
+    assert revalidate(client, url, renamed).status_code == 200
+
+
+def test_list_etag_follows_inserts_and_deletes(client):
+    db.session.add_all([Product(name="Espresso"), Product(name="Latte")])
+    db.session.commit()
+    first = client.get("/api/v1/products")
+
+    extra = Product(name="Mocha")
+    db.session.add(extra)
+    db.session.commit()
+    second = revalidate(client, "/api/v1/products", first)
+    assert second.status_code == 200
+
+    db.session.delete(extra)
+    db.session.commit()
+    assert revalidate(client, "/api/v1/products", second).status_code == 200
+
+
+def test_invalid_cursor_is_rejected_before_validating(client):
+    response = client.get("/api/v1/products?cursor=not-a-cursor")
+    assert response.status_code == 400
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import StatementError
+
+from app.database import db
+from app.models.pos import Order, OrderItem
+from app.models.types import uuid7
+
+
+def test_ids_round_trip_as_strings_and_are_stored_as_16_bytes(app):
+    order_id = uuid7()
+    db.session.add(Order(id=order_id, total=1))
+    db.session.commit()
+
+    assert db.session.scalar(select(Order.id)) == order_id
+    assert db.session.scalar(select(Order.id).where(Order.id.in_([order_id.upper(), "nope"]))) == order_id
+    assert db.session.scalar(text("SELECT length(id) FROM orders")) == 16
+
+
+@pytest.mark.parametrize("row", [{"id": "not-a-uuid"}, {"id": uuid7(), "order_id": "not-a-uuid"}])
+def test_writing_a_non_uuid_raises(app, row):
+    with pytest.raises(StatementError) as raised:
+        db.session.execute(insert(OrderItem.__table__), [row])
+    assert isinstance(raised.value.orig, ValueError)
+    db.session.rollback()
+    assert db.session.scalar(select(OrderItem.id)) is None
+
+
+def test_keyset_pages_tie_break_on_binary_ids(client):
+    # One total for every order: the id alone orders the pages.
+    ids = sorted(uuid7() for _ in range(7))
+    db.session.execute(insert(Order.__table__), [{"id": order_id, "total": 5} for order_id in ids])
+    db.session.commit()
+
+    seen = []
+    url = "/api/v1/orders?limit=3&sort=total&direction=asc"
+    while url:
+        body = client.get(url).get_json()
+        seen += [item["id"] for item in body["items"]]
+        url = body["next_cursor"] and f"/api/v1/orders?limit=3&sort=total&direction=asc&cursor={body['next_cursor']}"
+    assert seen == ids
+
+
+def test_non_uuid_order_ids_are_not_found(client):
+    assert client.get("/api/v1/orders/not-a-uuid").status_code == 404
@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import db
+from app.models.inventory.product import Product
+from app.models.pos import (
+    BillAccount, DailySales, Inventory, Order, OrderBillAccount, OrderItem, ProductStock, Warehouse,
+)
+
+
+@pytest.fixture(autouse=True)
+def stock(app):
+    db.session.add_all([
+        Warehouse(id="w", name="Main"),
+        BillAccount(id="acct", name="Tab"),
+        Product(id="p1", name="Espresso", price=10, tax_rate=16),
+        Product(id="p2", name="Latte", price=20, tax_rate=16),
+        Inventory(id="i1", warehouse_id="w", product_id="p1", quantity=5),
+        Inventory(id="i2", warehouse_id="w", product_id="p2", quantity=3),
+        ProductStock(product_id="p1", on_hand=5, reorder_level=0, low_stock=False),
+        ProductStock(product_id="p2", on_hand=3, reorder_level=0, low_stock=False),
+    ])
+    db.session.commit()
+
+
+def rows(model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+
+def on_hand():
+    return {
+        "inventories": dict(db.session.execute(select(Inventory.product_id, Inventory.quantity)).all()),
+        "summary": {key: float(value) for key, value in db.session.execute(
+            select(ProductStock.product_id, ProductStock.on_hand)
+        )},
+    }
+
+
+def checkout(client, *items, **fields):
+    return client.post("/orders/checkout", json={
+        "warehouse_id": "w",
+        "items": [{"product_id": product_id, "quantity": quantity} for product_id, quantity in items],
+        **fields,
+    })
+
+
+def test_overselling_is_refused_without_writing_anything(client):
+    before = on_hand()
+
+    response = checkout(client, ("p1", 2), ("p2", 4), payment_status="paid", bill_account_id="acct")
+
+    assert response.status_code == 409
+    assert response.get_json()["product_ids"] == ["p2"]
+    assert on_hand() == before
+    assert [rows(model) for model in (Order, OrderItem, DailySales, OrderBillAccount)] == [0, 0, 0, 0]
+
+
+def test_paid_checkout_on_a_bill_account_posts_one_movement(client):
+    response = checkout(client, ("p1", 2), ("p2", 3), status="paid", payment_status="paid", bill_account_id="acct")
+
+    assert response.status_code == 201
+    order = response.get_json()
+    assert order["total"] == 92.8
+    assert on_hand() == {"inventories": {"p1": 3, "p2": 0}, "summary": {"p1": 3.0, "p2": 0.0}}
+    assert (rows(Order), rows(OrderItem)) == (1, 2)
+    assert db.session.execute(select(DailySales.orders, DailySales.total)).one() == (1, Decimal("92.8"))
+    movements = db.session.execute(select(OrderBillAccount.order_id, OrderBillAccount.amount)).all()
+    assert [(order_id, float(amount)) for order_id, amount in movements] == [(order["id"], 92.8)]
@@ -0,0 +1,51 @@
+import pytest
+
+from app.database import db
+from app.models.pos import Order
+from app.view_model.order.extra_fields import filter_by_extra_fields, parse_extra_fields
+
+
+@pytest.mark.parametrize("value", ["[1, 2]", "12", '"text"', "{not json", [1], 12])
+def test_non_objects_are_rejected(app, value):
+    with pytest.raises(ValueError, match="must be a JSON object"):
+        parse_extra_fields(value)
+
+
+def test_declared_values_must_fit_their_column(app):
+    assert parse_extra_fields({"table_number": "x" * 20}) == {"table_number": "x" * 20}
+    with pytest.raises(ValueError, match="'table_number' must be 1 to 20 characters long"):
+        parse_extra_fields({"table_number": "x" * 21})
+    with pytest.raises(ValueError, match="'channel' must be text or a whole number"):
+        parse_extra_fields({"channel": 1.5})
+    # Undeclared keys are stored as given.
+    assert parse_extra_fields({"note": "x" * 100}) == {"note": "x" * 100}
+
+
+def test_total_size_is_capped(app):
+    app.config["ORDER_EXTRA_FIELDS_MAX_BYTES"] = 64
+    assert parse_extra_fields({"note": "x" * 40})
+    with pytest.raises(ValueError, match="at most 64 bytes"):
+        parse_extra_fields({"note": "x" * 60})
+
+
+def test_null_drops_a_key_and_blank_input_stores_nothing(app):
+    assert parse_extra_fields('{"channel": null, "table_number": " 7 "}') == {"table_number": "7"}
+    assert parse_extra_fields({"channel": None}) is None
+    assert parse_extra_fields("  ") is None
+
+
+def test_numbers_and_text_match_the_same_filter(client):
+    db.session.add_all([
+        Order(total=1, extra_fields={"table_number": 12, "channel": "dine-in"}),
+        Order(total=2, extra_fields={"table_number": "12"}),
+        Order(total=3, extra_fields={"table_number": 120}),
+        Order(total=4),
+    ])
+    db.session.commit()
+
+    matched = filter_by_extra_fields(Order.query, {"table_number": "12", "channel": ""}).all()
+    assert sorted(float(order.total) for order in matched) == [1, 2]
+    body = client.get("/api/v1/orders?table_number=12&sort=total&direction=asc").get_json()
+    assert [item["total"] for item in body["items"]] == [1, 2]
+    with pytest.raises(ValueError, match="Cannot filter by 'note'"):
+        filter_by_extra_fields(Order.query, {"note": "x"})
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import func, select, update
+
+from app.database import db
+from app.models.pos import BillAccount, BillAccountSnapshot
+from app.view_model.order.ledger import LedgerViewModel
+
+
+@pytest.fixture(autouse=True)
+def accounts(app):
+    db.session.add_all([BillAccount(id="a", name="Ana"), BillAccount(id="b", name="Bea")])
+    db.session.commit()
+
+
+def post(bill_account_id, *amounts):
+    LedgerViewModel.post_movements({"bill_account_id": bill_account_id, "amount": amount} for amount in amounts)
+    db.session.commit()
+
+
+def test_balance_is_the_same_before_and_after_a_snapshot():
+    post("a", 100, "-30.25", 5)
+    before = LedgerViewModel.get_balance("a")
+    assert (before["balance"], before["snapshot_balance"], before["pending_movements"]) == (74.75, 0, 3)
+
+    snapshot = LedgerViewModel.snapshot("a")
+    assert (snapshot["sequence"], snapshot["delta"], snapshot["movements"]) == (1, 74.75, 3)
+
+    after = LedgerViewModel.get_balance("a")
+    assert (after["balance"], after["snapshot_balance"], after["pending"]) == (74.75, 74.75, 0)
+    assert after["snapshot_sequence"] == 1
+
+    post("a", 10)
+    assert LedgerViewModel.get_balance("a")["balance"] == 84.75
+
+
+def test_snapshot_without_pending_movements_writes_nothing():
+    assert LedgerViewModel.snapshot("a") is None
+    assert db.session.scalar(select(func.count()).select_from(BillAccountSnapshot)) == 0
+    with pytest.raises(ValueError, match="Bill account not found"):
+        LedgerViewModel.snapshot("missing")
+
+
+def test_snapshots_are_numbered_without_gaps():
+    for amount in (10, 20, 30):
+        post("a", amount)
+        LedgerViewModel.snapshot("a")
+    post("b", 1, 2)
+
+    taken = LedgerViewModel.snapshot_all(min_movements=2)
+    assert [(snapshot["bill_account_id"], snapshot["sequence"]) for snapshot in taken] == [("b", 1)]
+    sequences = db.session.scalars(
+        select(BillAccountSnapshot.sequence).where(BillAccountSnapshot.bill_account_id == "a")
+        .order_by(BillAccountSnapshot.sequence)
+    ).all()
+    assert sequences == [1, 2, 3]
+    assert LedgerViewModel.get_balance("a")["snapshot_balance"] == 60
+
+    report = LedgerViewModel.reconcile(batch_size=1)
+    assert (report["accounts"], report["snapshots"], report["movements"], report["issues"]) == (2, 4, 5, [])
+
+
+def test_reconcile_flags_tampered_snapshots_and_balances():
+    post("a", 10, 20)
+    LedgerViewModel.snapshot("a")
+    post("b", 5)
+    LedgerViewModel.snapshot("b")
+    db.session.execute(update(BillAccountSnapshot).where(BillAccountSnapshot.bill_account_id == "a").values(delta=99))
+    db.session.execute(update(BillAccount).where(BillAccount.id == "b").values(balance=7))
+    db.session.commit()
+
+    issues = {
+        (issue["bill_account_id"], issue["problem"]): (issue["expected"], issue["found"])
+        for issue in LedgerViewModel.reconcile()["issues"]
+    }
+    assert issues == {("a", "delta"): (30.0, 99.0), ("b", "account balance"): (5.0, 7.0)}
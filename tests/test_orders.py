@@ -0,0 +1,37 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.database import db
+from app.models.inventory.product import Product
+from app.models.pos import Order, OrderItem
+
+
+@pytest.fixture(autouse=True)
+def product(app):
+    db.session.add(Product(id="p", name="Espresso", price=10, tax_rate=16))
+    db.session.commit()
+
+
+def test_new_order_is_priced_from_the_catalog(client):
+    response = client.post("/order/new", data={
+        "product_id": ["p", ""],
+        "quantity": ["3", ""],
+        "discount": "5",
+        "subtotal": "1",
+        "tax": "0",
+    })
+    assert response.status_code == 302
+
+    order = db.session.execute(select(Order.subtotal, Order.discount, Order.tax, Order.total)).one()
+    assert tuple(order) == (Decimal("30"), Decimal("5"), Decimal("4"), Decimal("29"))
+    item = db.session.execute(select(OrderItem.product_id, OrderItem.quantity, OrderItem.price)).one()
+    assert tuple(item) == ("p", 3, Decimal("10"))
+
+
+def test_new_order_without_lines_is_rejected(client):
+    response = client.post("/order/new", data={"subtotal": "100", "tax": "16"})
+    assert response.status_code == 200
+    assert "Order must contain at least one product" in response.get_data(as_text=True)
+    assert db.session.scalar(select(Order.id)) is None
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from app.database import db
+from app.models.pos import Contact, Order
+
+
+def walk(client, url, step="next_cursor"):
+    """Follow ``step`` cursors from ``url`` and return the ids of every page"""
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        body = response.get_json()
+        pages.append([item["id"] for item in body["items"]])
+        cursor = body[step]
+        url = f"{url.split('&cursor=')[0]}&cursor={cursor}" if cursor else None
+        assert len(pages) <= 20, "pagination does not advance"
+    return pages
+
+
+@pytest.mark.parametrize("direction", ["desc", "asc"])
+def test_walks_rows_sharing_a_server_default_timestamp(client, direction):
+    # Orders created in one statement share CURRENT_TIMESTAMP's second, stored
+    # without the fraction SQLAlchemy adds to bound datetimes.
+    db.session.execute(insert(Order.__table__), [{"total": index} for index in range(5)])
+    db.session.execute(insert(Order.__table__), [{"total": 9, "created_at": datetime(2026, 1, 1, 12)}])
+    db.session.commit()
+
+    pages = walk(client, f"/api/v1/orders?limit=2&direction={direction}")
+    ids = [order_id for page in pages for order_id in page]
+    assert len(ids) == 6
+    assert len(set(ids)) == 6
+    assert [len(page) for page in pages] == [2, 2, 2]
+
+
+@pytest.mark.parametrize("direction", ["desc", "asc"])
+def test_walks_null_sort_values_both_ways(client, direction):
+    names = [None, "Ana", None, "Bea", None, "Ana", None]
+    db.session.execute(insert(Contact.__table__), [{"name": name} for name in names])
+    db.session.commit()
+
+    pages = walk(client, f"/api/v1/contacts?limit=2&sort=name&direction={direction}")
+    ids = [contact_id for page in pages for contact_id in page]
+    assert len(ids) == len(names)
+    assert len(set(ids)) == len(names)
+
+    # And back again from the last page.
+    last = client.get(f"/api/v1/contacts?limit=2&sort=name&direction={direction}").get_json()
+    while last["next_cursor"]:
+        last = client.get(
+            f"/api/v1/contacts?limit=2&sort=name&direction={direction}&cursor={last['next_cursor']}"
+        ).get_json()
+    back = walk(client, f"/api/v1/contacts?limit=2&sort=name&direction={direction}&cursor={last['prev_cursor']}",
+                step="prev_cursor")
+    seen = [contact_id for page in back for contact_id in page] + [item["id"] for item in last["items"]]
+    assert sorted(seen) == sorted(ids)
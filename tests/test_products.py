@@ -0,0 +1,49 @@
+import pytest
+
+from app.commands.import_products import import_products
+from app.database import db
+from app.models.inventory.product import Product, Taxonomy
+from app.view_model.product.importer import ProductImportViewModel
+from app.view_model.product.main import ProductViewModel
+
+
+@pytest.fixture(autouse=True)
+def taxonomy(app):
+    db.session.add(Taxonomy(id="t", name="Bebidas", kind="category"))
+    db.session.commit()
+
+
+def test_create_and_update_reject_unknown_taxonomies(app):
+    with pytest.raises(ValueError, match="Taxonomy not found"):
+        ProductViewModel.create_product({"name": "Espresso", "taxonomy_id": "missing"})
+
+    product = ProductViewModel.create_product({"name": "Espresso", "taxonomy_id": "t"})
+    assert product["category"] == "Bebidas"
+
+    with pytest.raises(ValueError, match="Taxonomy not found"):
+        ProductViewModel.update_product(product["id"], {"name": "Ristretto", "taxonomy_id": "missing"})
+    assert ProductViewModel.get_product_by_id(product["id"])["name"] == "Espresso"
+
+
+@pytest.mark.parametrize("batch_size", [0, -5])
+def test_import_rejects_empty_batches(app, batch_size):
+    with pytest.raises(ValueError, match="batch_size must be at least 1"):
+        ProductImportViewModel.import_rows([(2, {"name": "Espresso"})], batch_size)
+
+
+def test_import_command_reports_undecodable_files(app, tmp_path):
+    path = tmp_path / "products.csv"
+    # Far past the reader's first buffer, so some rows are read before the bad byte.
+    rows = "".join(f"Espresso {number},Bebidas\n" for number in range(2000))
+    path.write_bytes(f"name,category\n{rows}Té,Café\n".encode("latin-1"))
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(import_products, [str(path)])
+    assert result.exit_code == 1
+    assert "Could not read" in result.output
+    assert 1 < int(result.output.split("after row ")[1].split(":")[0]) <= 2001
+    assert Product.query.count() == 0
+
+    result = runner.invoke(import_products, [str(path), "--batch-size", "0"])
+    assert result.exit_code == 2
+    assert "--batch-size" in result.output
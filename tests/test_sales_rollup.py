@@ -0,0 +1,19 @@
+from sqlalchemy import insert, select
+
+from app.database import db
+from app.models.pos import DailySales, Order
+from app.view_model.order.rollup import SalesRollupViewModel
+
+
+def test_rebuild_reads_every_order_of_a_shared_second(app):
+    # Server-default timestamps: all five orders share one second.
+    db.session.execute(insert(Order.__table__), [{"total": 10, "status": "paid"} for _ in range(5)])
+    SalesRollupViewModel.add_orders(list(db.session.scalars(select(Order.id))))
+    db.session.commit()
+
+    report = SalesRollupViewModel.rebuild(batch_size=2, fix=True)
+
+    assert report["orders"] == 5
+    assert report["mismatched"] == 0
+    day = db.session.execute(select(DailySales.orders, DailySales.total)).one()
+    assert (day.orders, day.total) == (5, 50)
@@ -0,0 +1,36 @@
+import pytest
+
+from app.database import db
+from app.models.inventory.product import Product
+from app.view_model.product.search import ProductSearchViewModel, product_search_index
+
+
+@pytest.fixture(autouse=True)
+def products(app):
+    db.session.add_all([
+        Product(name="Espresso", sku="7501001"),
+        Product(name="Espresso doble", sku="7501002"),
+        Product(name="Café con leche", sku="7502001"),
+        Product(name="Pressure cooker", sku="8800001"),
+        Product(name="Té 100_por_ciento", sku="8800002"),
+    ])
+    db.session.commit()
+    product_search_index.invalidate()
+
+
+def search(app, backend, query):
+    app.config["PRODUCT_SEARCH_BACKEND"] = backend
+    return [(row["name"], row["score"]) for row in ProductSearchViewModel.search(query)]
+
+
+@pytest.mark.parametrize("query", ["presso", "esp", "espresso", "es do", "caf le", "750", "press", "_por"])
+def test_like_fallback_scores_like_the_in_process_index(app, query):
+    # Every term under the FULLTEXT minimum: the MySQL path runs only its
+    # SKU and LIKE passes, which SQLite can execute.
+    app.config["PRODUCT_SEARCH_FULLTEXT_MIN_TOKEN"] = 100
+    assert search(app, "fulltext", query) == search(app, "memory", query)
+
+
+def test_partial_words_are_found(app):
+    app.config["PRODUCT_SEARCH_FULLTEXT_MIN_TOKEN"] = 100
+    assert [name for name, _ in search(app, "fulltext", "presso")] == ["Espresso", "Espresso doble"]
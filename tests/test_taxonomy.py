@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import insert, update
+
+from app.database import db
+from app.models.inventory.product import Product, Taxonomy
+from app.view_model.product.main import ProductViewModel
+from app.view_model.product.taxonomy import TaxonomyViewModel
+
+
+@pytest.fixture
+def tree(app):
+    """drinks > coffee > espresso, plus food; one product in each of the last three"""
+    ids = {}
+    for name, parent in (("drinks", None), ("coffee", "drinks"), ("espresso", "coffee"), ("food", None)):
+        ids[name] = TaxonomyViewModel.create_taxonomy({"name": name, "parent_id": ids.get(parent)})["id"]
+    for name in ("coffee", "espresso", "food"):
+        db.session.add(Product(name=f"{name} product", taxonomy_id=ids[name], category=name))
+    db.session.commit()
+    return ids
+
+
+def count(taxonomy_id):
+    return ProductViewModel.count_products_in_category(taxonomy_id)
+
+
+def test_orm_inserts_without_a_path_get_one(app):
+    db.session.add_all([Taxonomy(id="root", name="Root", kind="category"),
+                        Taxonomy(id="leaf", name="Leaf", kind="category", parent_id="root")])
+    db.session.commit()
+    db.session.add(Taxonomy(id="deep", name="Deep", kind="category", parent_id="leaf"))
+    db.session.commit()
+
+    paths = dict(db.session.query(Taxonomy.id, Taxonomy.path))
+    assert paths == {"root": "/root/", "leaf": "/root/leaf/", "deep": "/root/leaf/deep/"}
+    assert db.session.get(Taxonomy, "deep").depth == 2
+
+
+def test_path_less_categories_are_not_offered_and_filter_as_400(client):
+    db.session.execute(insert(Taxonomy), [{"id": "bare", "name": "Bare", "kind": "category", "path": None}])
+    db.session.commit()
+
+    assert "bare" not in [option["id"] for option in ProductViewModel.get_categories()]
+    assert client.get("/products?category=bare").status_code == 400
+
+
+def test_move_carries_the_subtree_and_its_products(tree):
+    assert (count(tree["drinks"]), count(tree["food"])) == (2, 1)
+
+    moved = TaxonomyViewModel.move_taxonomy(tree["coffee"], tree["food"])
+
+    assert moved["path"] == f"/{tree['food']}/{tree['coffee']}/"
+    espresso = db.session.get(Taxonomy, tree["espresso"])
+    assert (espresso.path, espresso.depth) == (f"/{tree['food']}/{tree['coffee']}/{tree['espresso']}/", 2)
+    assert (count(tree["drinks"]), count(tree["food"]), count(tree["coffee"])) == (0, 3, 2)
+    assert TaxonomyViewModel.rebuild_paths()["mismatched"] == 0
+
+
+def test_move_under_own_descendant_is_refused(tree):
+    with pytest.raises(ValueError, match="under itself or its descendants"):
+        TaxonomyViewModel.move_taxonomy(tree["drinks"], tree["espresso"])
+    with pytest.raises(ValueError, match="under itself or its descendants"):
+        TaxonomyViewModel.move_taxonomy(tree["coffee"], tree["coffee"])
+    assert TaxonomyViewModel.rebuild_paths()["mismatched"] == 0
+
+
+def test_delete_lifts_children_and_products_to_the_parent(tree):
+    TaxonomyViewModel.delete_taxonomy(tree["coffee"])
+    db.session.expire_all()
+
+    espresso = db.session.get(Taxonomy, tree["espresso"])
+    assert (espresso.parent_id, espresso.path, espresso.depth) == (
+        tree["drinks"], f"/{tree['drinks']}/{tree['espresso']}/", 1
+    )
+    lifted = Product.query.filter_by(name="coffee product").one()
+    assert (lifted.taxonomy_id, lifted.category) == (tree["drinks"], "drinks")
+    assert count(tree["drinks"]) == 2
+    assert TaxonomyViewModel.rebuild_paths()["mismatched"] == 0
+
+
+def test_rebuild_paths_reports_and_repairs_drift(tree):
+    # Written around TaxonomyViewModel: coffee re-parented, paths left behind.
+    db.session.execute(update(Taxonomy).where(Taxonomy.id == tree["coffee"]).values(parent_id=tree["food"]))
+    db.session.commit()
+
+    assert TaxonomyViewModel.rebuild_paths() == {"taxonomies": 4, "mismatched": 2, "cycles": []}
+    assert count(tree["food"]) == 1
+
+    assert TaxonomyViewModel.rebuild_paths(fix=True)["mismatched"] == 2
+    assert TaxonomyViewModel.rebuild_paths()["mismatched"] == 0
+    assert count(tree["food"]) == 3